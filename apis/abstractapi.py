@@ -1,23 +1,15 @@
 # AbstractAPI Integration
-import requests
-from colorama import Fore
+from apis.providers import get_provider_registry
 
 class AbstractAPI:
-    def __init__(self, api_key):
-        self.api_key = efd9c38411b1492ab17c244c0305c286
-        self.base_url = "https://phonevalidation.abstractapi.com/v1/"
+    def __init__(self, api_key, registry=None):
+        self.api_key = api_key
+        self.registry = registry or get_provider_registry()
+        self.base_url = self.registry.get("abstractapi").url
     
     def validate_number(self, number):
         try:
-            params = {
-                'api_key': self.api_key,
-                'phone': number
-            }
-            
-            response = requests.get(self.base_url, params=params, timeout=10)
-            data = response.json()
-            
-            return data
+            return self.registry.query("abstractapi", number, self.api_key)
             
         except Exception as e:
-            return {'error': str(e)}
\ No newline at end of file
+            return {'error': str(e)}
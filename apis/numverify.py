@@ -1,24 +1,16 @@
 # NumVerify API Integration
-import requests
-import json
-from colorama import Fore, Style
+from apis.providers import get_provider_registry
 
 class NumVerifyAPI:
-    def __init__(self, api_key):
+    def __init__(self, api_key, registry=None):
         self.api_key = api_key
-        self.base_url = "http://apilayer.net/api/validate"
+        self.registry = registry or get_provider_registry()
+        self.base_url = self.registry.get("numverify").url
     
     def validate_number(self, number):
         """Validate phone number using NumVerify API"""
         try:
-            params = {
-                'access_key': self.api_key,
-                'number': number,
-                'format': 1
-            }
-            
-            response = requests.get(self.base_url, params=params, timeout=10)
-            data = response.json()
+            data = self.registry.query("numverify", number, self.api_key)
             
             if data.get('valid'):
                 return {
@@ -34,4 +26,4 @@ class NumVerifyAPI:
                 return {'valid': False, 'error': 'Invalid number'}
                 
         except Exception as e:
-            return {'valid': False, 'error': str(e)}
\ No newline at end of file
+            return {'valid': False, 'error': str(e)}
@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+Phone Provider Registry
+Description: Declarative phone lookup providers with latency/error tracking and fastest-healthy routing
+Version: 4.0.0
+"""
+
+import atexit
+import copy
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.cache import ResponseCache, get_cache, POSITIVE, NEGATIVE
+from utils.config import load_config
+from utils.transport import HTTPTransport, get_transport
+
+DEFAULT_STATE_PATH = os.path.join("data", "cache", "provider_stats.json")
+
+# Weight of the newest observation in the latency / error moving averages
+EWMA_ALPHA = 0.3
+
+# Providers whose recent error rate exceeds this are routed around...
+MAX_ERROR_RATE = 0.5
+# ...once this many calls have been observed
+MIN_SAMPLES = 3
+
+# An unhealthy provider gets one probe call after this many seconds
+RETRY_UNHEALTHY_AFTER = 600
+
+PLACEHOLDER_KEYS = ("", "YOUR_API_KEY_HERE")
+
+# Statistics are written at most this often (seconds) and once more at exit
+SAVE_INTERVAL = 30.0
+
+# Per-provider settings the "apis" config section may override
+CONFIGURABLE = ("cost", "quota", "quota_period")
+
+
+def cache_key(value):
+    """Normalise a phone number or email into a cache key"""
+    return "".join(str(value).split()).lower()
+
+
+def classify_numverify(data):
+    """Cache class of a NumVerify response (None = do not cache)"""
+    if not isinstance(data, dict) or "error" in data or data.get("success") is False:
+        return None
+    return POSITIVE if data.get("valid") else NEGATIVE
+
+
+def classify_abstractapi(data):
+    """Cache class of an AbstractAPI response (None = do not cache)"""
+    if not isinstance(data, dict) or "error" in data or "valid" not in data:
+        return None
+    return POSITIVE if data.get("valid") else NEGATIVE
+
+
+def classify_numspy(data):
+    """Cache class of a Numspy response (None = do not cache)"""
+    if not isinstance(data, dict) or "error" in data:
+        return None
+    return POSITIVE if data.get("valid", True) else NEGATIVE
+
+
+def parse_numspy(data: Dict) -> Dict[str, Any]:
+    return {
+        "Name": data.get("name", "Not found"),
+        "Carrier": data.get("carrier", "Not found"),
+        "Location": data.get("location", "Not found"),
+        "Timezone": data.get("timezone", "Not found"),
+        "Valid": data.get("valid", "Unknown"),
+    }
+
+
+def parse_numverify(data: Dict) -> Dict[str, Any]:
+    return {
+        "Valid": data.get("valid", "Unknown"),
+        "Number": data.get("international_format", "Not found"),
+        "Country": data.get("country_name", "Not found"),
+        "Location": data.get("location", "Not found"),
+        "Carrier": data.get("carrier", "Not found"),
+        "Line Type": data.get("line_type", "Not found"),
+    }
+
+
+def parse_abstractapi(data: Dict) -> Dict[str, Any]:
+    return {
+        "Valid": data.get("valid", "Unknown"),
+        "Number": (data.get("format") or {}).get("international", "Not found"),
+        "Country": (data.get("country") or {}).get("name", "Not found"),
+        "Location": data.get("location", "Not found"),
+        "Carrier": data.get("carrier", "Not found"),
+        "Type": data.get("type", "Not found"),
+    }
+
+
+class PhoneProvider:
+    """
+    Everything the registry needs to know about one lookup API
+
+    Providers are declarations, not clients: the registry owns the transport,
+    cache, API keys and health statistics.
+    """
+
+    def __init__(self, name: str, label: str, url: str, number_param: str,
+                 parser: Callable[[Dict], Dict[str, Any]],
+                 classify: Callable[[Any], Optional[str]],
+                 key_param: Optional[str] = None, params: Optional[Dict[str, Any]] = None,
+                 cost: float = 0.0, quota: Optional[int] = None, quota_period: float = 30 * 86400,
+                 digits_only: bool = False):
+        """
+        Args:
+            name: Registry / cache / config key (e.g. 'numverify')
+            label: Display name
+            url: Endpoint
+            number_param: Query parameter carrying the number
+            parser: Maps a raw response to the standard display fields
+            classify: Maps a raw response to POSITIVE, NEGATIVE or None (error, not cached)
+            key_param: Query parameter carrying the API key (None = keyless)
+            params: Extra fixed query parameters
+            cost: Price of one call in the provider's billing unit (tie-breaker between equally fast providers)
+            quota: Calls allowed per quota_period (None = unlimited)
+            quota_period: Quota window in seconds
+            digits_only: Send the number without '+' and separators
+        """
+        self.name = name
+        self.label = label
+        self.url = url
+        self.number_param = number_param
+        self.parser = parser
+        self.classify = classify
+        self.key_param = key_param
+        self.params = dict(params or {})
+        self.cost = cost
+        self.quota = quota
+        self.quota_period = quota_period
+        self.digits_only = digits_only
+
+    @property
+    def needs_key(self) -> bool:
+        return self.key_param is not None
+
+    def query_params(self, number: str, api_key: Optional[str] = None) -> Dict[str, Any]:
+        """Request parameters for one lookup"""
+        if self.digits_only:
+            number = "".join(ch for ch in str(number) if ch.isdigit())
+        params = {self.number_param: number}
+        params.update(self.params)
+        if self.key_param:
+            params[self.key_param] = api_key
+        return params
+
+    def display_url(self, number: str) -> str:
+        """Request URL without the API key, for reports"""
+        params = self.query_params(number)
+        params.pop(self.key_param, None)
+        return f"{self.url}?" + "&".join(f"{key}={value}" for key, value in params.items())
+
+    def parse(self, data: Dict) -> Dict[str, Any]:
+        """Standard display fields of a response"""
+        try:
+            return self.parser(data)
+        except Exception as e:
+            return {"Error": f"Parse error: {str(e)}"}
+
+
+DEFAULT_PROVIDERS = [
+    PhoneProvider("numspy", "Numspy API", "https://api.numspy.io/v1/lookup", "number",
+                  parse_numspy, classify_numspy, digits_only=True),
+    PhoneProvider("numverify", "NumVerify", "http://apilayer.net/api/validate", "number",
+                  parse_numverify, classify_numverify, key_param="access_key", params={"format": 1},
+                  cost=1.0, quota=100),
+    PhoneProvider("abstractapi", "AbstractAPI", "https://phonevalidation.abstractapi.com/v1/", "phone",
+                  parse_abstractapi, classify_abstractapi, key_param="api_key",
+                  cost=1.0, quota=250),
+]
+
+
+def configured(provider: PhoneProvider, options: Optional[Dict[str, Any]]) -> PhoneProvider:
+    """
+    Copy of a provider with the settings of its "apis" config entry applied
+
+    Args:
+        provider: Declared provider
+        options: e.g. {"quota": 1000, "cost": 0.5, "quota_period": 2592000}; a null
+                 quota means unlimited, quota_period is in seconds
+
+    Returns:
+        The provider itself when nothing is overridden
+    """
+    overrides = {}
+    for name in CONFIGURABLE:
+        if not isinstance(options, dict) or name not in options:
+            continue
+        value = options[name]
+        if name == "quota" and value is None:
+            overrides[name] = None
+            continue
+        try:
+            value = int(value) if name == "quota" else float(value)
+        except (TypeError, ValueError):
+            continue  # Keep the declared value rather than fail on a config typo
+        if value >= 0:
+            overrides[name] = value
+    if not overrides:
+        return provider
+    provider = copy.copy(provider)
+    for name, value in overrides.items():
+        setattr(provider, name, value)
+    return provider
+
+
+class ProviderStats:
+    """Observed behaviour of one provider (moving averages plus a quota window)"""
+
+    __slots__ = ('calls', 'errors', 'latency', 'error_rate', 'last_error', 'window_start', 'window_calls')
+
+    def __init__(self, state: Optional[Dict[str, Any]] = None):
+        state = state or {}
+        self.calls = int(state.get('calls', 0))
+        self.errors = int(state.get('errors', 0))
+        self.latency = state.get('latency')  # Seconds (EWMA), None until the first call
+        self.error_rate = float(state.get('error_rate', 0.0))
+        self.last_error = state.get('last_error')
+        self.window_start = state.get('window_start')
+        self.window_calls = int(state.get('window_calls', 0))
+
+    def record(self, latency: float, error: bool, now: float, quota_period: float) -> None:
+        self.calls += 1
+        if error:
+            self.errors += 1
+            self.last_error = now
+        else:
+            self.latency = latency if self.latency is None else (
+                EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.latency)
+        self.error_rate = EWMA_ALPHA * float(error) + (1 - EWMA_ALPHA) * self.error_rate
+        if self.window_start is None or now - self.window_start >= quota_period:
+            self.window_start = now
+            self.window_calls = 0
+        self.window_calls += 1
+
+    def healthy(self, now: float) -> bool:
+        if self.calls < MIN_SAMPLES or self.error_rate <= MAX_ERROR_RATE:
+            return True
+        # Let one call through now and then so a recovered provider is noticed
+        return self.last_error is None or now - self.last_error >= RETRY_UNHEALTHY_AFTER
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ProviderRegistry:
+    def __init__(self, providers: Optional[List[PhoneProvider]] = None,
+                 api_keys: Optional[Dict[str, str]] = None, transport: Optional[HTTPTransport] = None,
+                 cache: Optional[ResponseCache] = None, state_path: Optional[str] = DEFAULT_STATE_PATH,
+                 timeout: float = 10.0):
+        """
+        Args:
+            providers: Providers in preference order (default: DEFAULT_PROVIDERS, with the
+                       cost / quota / quota_period overrides of the "apis" config section)
+            api_keys: Provider name -> API key (default: "api_keys" section of config.json)
+            transport: HTTP transport (default: the shared one)
+            cache: Response cache (default: the shared one)
+            state_path: JSON file persisting latency/error/quota statistics (None = memory only)
+            timeout: Per-request timeout in seconds
+        """
+        self.api_keys = api_keys if api_keys is not None else (load_config().get("api_keys") or {})
+        self.transport = transport or get_transport()
+        self.cache = cache or get_cache()
+        self.state_path = state_path
+        self.timeout = timeout
+        self._providers = {}  # type: Dict[str, PhoneProvider]
+        self._stats = {}  # type: Dict[str, ProviderStats]
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+        if providers is None:
+            options = load_config().get("apis") or {}
+            providers = [configured(provider, options.get(provider.name)) for provider in DEFAULT_PROVIDERS]
+        state = self._load_state()
+        for provider in providers:
+            self.register(provider, state.get(provider.name))
+        if self.state_path:
+            atexit.register(self.flush)
+
+    # ------------------------------------------------------------ registration
+
+    def register(self, provider: PhoneProvider, state: Optional[Dict[str, Any]] = None) -> None:
+        """Add (or replace) a provider"""
+        with self._lock:
+            self._providers[provider.name] = provider
+            self._stats.setdefault(provider.name, ProviderStats(state))
+
+    def get(self, name: str) -> Optional[PhoneProvider]:
+        """Provider by name or display label"""
+        provider = self._providers.get(name)
+        if provider is None:
+            provider = next((p for p in self._providers.values() if p.label == name), None)
+        return provider
+
+    @property
+    def providers(self) -> List[PhoneProvider]:
+        return list(self._providers.values())
+
+    def api_key(self, provider: PhoneProvider) -> Optional[str]:
+        key = self.api_keys.get(provider.name, "")
+        return None if key in PLACEHOLDER_KEYS else key
+
+    # ---------------------------------------------------------------- routing
+
+    def unavailable_reason(self, provider: PhoneProvider, now: Optional[float] = None,
+                           api_key: Optional[str] = None) -> Optional[str]:
+        """Why a provider cannot be used right now (None = usable)"""
+        now = time.time() if now is None else now
+        if provider.needs_key and not (api_key or self.api_key(provider)):
+            return f"{provider.label} API key not configured"
+        stats = self._stats[provider.name]
+        if (provider.quota is not None and stats.window_start is not None
+                and now - stats.window_start < provider.quota_period and stats.window_calls >= provider.quota):
+            return f"{provider.label} quota exhausted"
+        return None
+
+    def ranked(self, include_unavailable: bool = False) -> List[PhoneProvider]:
+        """
+        Providers ordered fastest healthy first
+
+        Untried providers rank first so every provider gets measured; ties
+        fall back to the cheaper provider, then registration order.
+        """
+        now = time.time()
+        with self._lock:
+            candidates = []
+            for order, provider in enumerate(self._providers.values()):
+                if not include_unavailable and self.unavailable_reason(provider, now):
+                    continue
+                stats = self._stats[provider.name]
+                candidates.append(((not stats.healthy(now), stats.latency or 0.0, provider.cost, order), provider))
+        return [provider for _, provider in sorted(candidates, key=lambda item: item[0])]
+
+    # ---------------------------------------------------------------- lookups
+
+    def healthy(self, name: str) -> bool:
+        """Whether a provider's recent error rate allows routing to it"""
+        with self._lock:
+            return self._stats[name].healthy(time.time())
+
+    def query(self, name: str, number: str, api_key: Optional[str] = None,
+              cancel: Optional[threading.Event] = None,
+              headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Raw response of one provider, served from the response cache when fresh
+
+        Args:
+            name: Provider name or label
+            number: Phone number
+            api_key: Overrides the configured key (placeholder keys are ignored)
+            cancel: Once set, a response still in flight is dropped without reading its body
+            headers: Extra request headers (e.g. the calling module's User-Agent)
+
+        Returns:
+            Provider response, or {"error": ...}
+        """
+        provider = self.get(name)
+        if provider is None:
+            return {"error": f"Unknown provider: {name}"}
+        if api_key is None or api_key in PLACEHOLDER_KEYS:
+            api_key = self.api_key(provider)
+        if provider.needs_key and not api_key:
+            return {"error": f"{provider.label} API key not configured"}
+
+        def request():
+            reason = self.unavailable_reason(provider, api_key=api_key)
+            if reason:
+                return {"error": reason}
+            if cancel is not None and cancel.is_set():
+                return {"error": "Cancelled"}
+            started = time.perf_counter()
+            error = True
+            try:
+                response = self.transport.get(provider.url, params=provider.query_params(number, api_key),
+                                              headers=headers, timeout=self.timeout, stream=True)
+                with response:
+                    if cancel is not None and cancel.is_set():
+                        # The call was made (and counts against the quota); only its body is skipped
+                        data = {"error": "Cancelled"}
+                        error = False
+                    else:
+                        data = response.json()
+                        error = provider.classify(data) is None
+            except Exception as e:
+                data = {"error": str(e)}
+            self.record(provider.name, time.perf_counter() - started, error)
+            return data
+
+        return self.cache.fetch(provider.name, cache_key(number), request, provider.classify)
+
+    def lookup(self, number: str, providers: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Look a number up on the fastest healthy provider, falling back down the ranking
+
+        Args:
+            number: Phone number
+            providers: Restrict to these provider names
+
+        Returns:
+            {'provider', 'data', 'parsed'} from the first usable answer,
+            or {'error', 'attempts'} when every provider failed
+        """
+        attempts = {}
+        for provider in self.ranked():
+            if providers is not None and provider.name not in providers:
+                continue
+            data = self.query(provider.name, number)
+            if provider.classify(data) is not None:
+                return {'provider': provider.name, 'data': data, 'parsed': provider.parse(data)}
+            attempts[provider.name] = data.get("error") if isinstance(data, dict) else str(data)
+        return {'error': "No provider returned an answer", 'attempts': attempts}
+
+    # ------------------------------------------------------------- statistics
+
+    def record(self, name: str, latency: float, error: bool) -> None:
+        """Feed one observed network call into the provider's statistics"""
+        provider = self._providers[name]
+        with self._lock:
+            self._stats[name].record(latency, error, time.time(), provider.quota_period)
+            self._dirty = True
+            due = time.monotonic() - self._saved_at >= SAVE_INTERVAL
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the statistics to state_path now, if they changed since the last write"""
+        if not self.state_path:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                snapshot = {name: stats.to_dict() for name, stats in self._stats.items()}
+                self._dirty = False
+                self._saved_at = time.monotonic()
+            self._save_state(snapshot)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-provider statistics plus current health and availability"""
+        now = time.time()
+        with self._lock:
+            snapshot = {}
+            for name, provider in self._providers.items():
+                entry = self._stats[name].to_dict()
+                entry['healthy'] = self._stats[name].healthy(now)
+                entry['unavailable'] = self.unavailable_reason(provider, now)
+                snapshot[name] = entry
+            return snapshot
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        if not self.state_path:
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, snapshot: Dict[str, Dict[str, Any]]) -> None:
+        """Atomically persist a statistics snapshot"""
+        try:
+            directory = os.path.dirname(os.path.abspath(self.state_path))
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".providers.", suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f)
+            os.replace(temp_path, self.state_path)
+        except OSError:
+            pass  # Statistics are an optimisation; never fail a lookup over them
+
+
+_shared_registry = None
+_shared_lock = threading.Lock()
+
+
+def get_provider_registry() -> ProviderRegistry:
+    """Process-wide provider registry, created on first use"""
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = ProviderRegistry()
+        return _shared_registry
@@ -5,16 +5,27 @@ Description: Safe API integrations with config management
 Version: 3.1.0
 """
 
-import requests
 import json
 import os
-from colorama import Fore, Style
+from utils.transport import get_transport
+from utils.cache import get_cache, POSITIVE, NEGATIVE
+from apis.providers import PLACEHOLDER_KEYS, cache_key, get_provider_registry
+
+
+def classify_hibp(data):
+    """Cache class of a hibp_check result (None = do not cache)"""
+    if not isinstance(data, dict) or "error" in data:
+        return None
+    return POSITIVE if data.get("count") else NEGATIVE
+
 
 class SecureAPI:
-    def __init__(self, config_file="config.json"):
+    def __init__(self, config_file="config.json", transport=None, cache=None):
         self.config_file = config_file
         self.config = self.load_config()
-        self.session = requests.Session()
+        self.transport = transport or get_transport()
+        self.session = self.transport.client()
+        self.cache = cache or get_cache()
         
     def load_config(self):
         """Safely load configuration"""
@@ -44,50 +55,29 @@ class SecureAPI:
     def test_connection(self):
         """Test internet connection"""
         try:
-            response = requests.get("https://www.google.com", timeout=5)
+            response = self.session.get("https://www.google.com", timeout=5)
             return True
         except:
             return False
 
 class PhoneAPI(SecureAPI):
-    """Phone number API services"""
+    """Phone number API services (routed through the shared provider registry)"""
+    
+    def __init__(self, config_file="config.json", transport=None, cache=None, registry=None):
+        super().__init__(config_file, transport, cache)
+        self.registry = registry or get_provider_registry()
     
     def numverify_lookup(self, number):
         """NumVerify API lookup"""
-        api_key = self.get_api_key("numverify")
-        if not api_key or api_key == "YOUR_API_KEY_HERE":
-            return {"error": "NumVerify API key not configured"}
-            
-        try:
-            url = "http://apilayer.net/api/validate"
-            params = {
-                'access_key': api_key,
-                'number': number,
-                'format': 1
-            }
-            
-            response = self.session.get(url, params=params, timeout=10)
-            return response.json()
-        except Exception as e:
-            return {"error": str(e)}
+        return self.registry.query("numverify", number, self.get_api_key("numverify"))
             
     def abstractapi_lookup(self, number):
         """AbstractAPI phone validation"""
-        api_key = self.get_api_key("abstractapi")
-        if not api_key or api_key == "YOUR_API_KEY_HERE":
-            return {"error": "AbstractAPI key not configured"}
-            
-        try:
-            url = "https://phonevalidation.abstractapi.com/v1/"
-            params = {
-                'api_key': api_key,
-                'phone': number
-            }
-            
-            response = self.session.get(url, params=params, timeout=10)
-            return response.json()
-        except Exception as e:
-            return {"error": str(e)}
+        return self.registry.query("abstractapi", number, self.get_api_key("abstractapi"))
+    
+    def lookup(self, number):
+        """Lookup on the fastest healthy provider, falling back to the next one"""
+        return self.registry.lookup(number)
 
 class EmailAPI(SecureAPI):
     """Email API services"""
@@ -96,19 +86,22 @@ class EmailAPI(SecureAPI):
         """Have I Been Pwned API check"""
         api_key = self.get_api_key("hibp")
         
-        try:
-            headers = {}
-            if api_key and api_key != "YOUR_API_KEY_HERE":
-                headers['hibp-api-key'] = api_key
+        def request():
+            try:
+                headers = {}
+                if api_key not in PLACEHOLDER_KEYS:
+                    headers['hibp-api-key'] = api_key
+                    
+                url = f"https://haveibeenpwned.com/api/v3/breachedaccount/{email}"
+                response = self.session.get(url, headers=headers, timeout=10, params={'truncateResponse': False})
                 
-            url = f"https://haveibeenpwned.com/api/v3/breachedaccount/{email}"
-            response = self.session.get(url, headers=headers, timeout=10, params={'truncateResponse': False})
-            
-            if response.status_code == 200:
-                return {"breaches": response.json(), "count": len(response.json())}
-            elif response.status_code == 404:
-                return {"breaches": [], "count": 0}
-            else:
-                return {"error": f"HTTP {response.status_code}"}
-        except Exception as e:
-            return {"error": str(e)}
\ No newline at end of file
+                if response.status_code == 200:
+                    return {"breaches": response.json(), "count": len(response.json())}
+                elif response.status_code == 404:
+                    return {"breaches": [], "count": 0}
+                else:
+                    return {"error": f"HTTP {response.status_code}"}
+            except Exception as e:
+                return {"error": str(e)}
+                
+        return self.cache.fetch("hibp", cache_key(email), request, classify_hibp)
\ No newline at end of file
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Hot Paths Benchmark
+Description: Microbenchmarks for the CPU-side hot paths, with a regression check against a saved baseline
+Version: 4.0.0
+
+Usage:
+    python benchmarks/hot_paths_benchmark.py --json baseline.json
+    python benchmarks/hot_paths_benchmark.py --sizes 10 100 1000 --cases dorks spam
+    python benchmarks/hot_paths_benchmark.py --compare baseline.json --threshold 0.10
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from modules.google_dorking import AdvancedDorkGenerator  # noqa: E402
+from modules.renderers import Renderer  # noqa: E402
+from modules.spam_check import AdvancedSpamChecker  # noqa: E402
+from modules.telegram_check import AdvancedTelegramLookup  # noqa: E402
+from modules.whois_lookup import AdvancedWHOISLookup  # noqa: E402
+from numintense_pro import NumIntensePro  # noqa: E402
+from utils.number_profile import _cached_profile, number_profile  # noqa: E402
+from utils.report_sink import ReportSink  # noqa: E402
+from utils.url_builder import quote_query  # noqa: E402
+from utils.whois_cache import WhoisData  # noqa: E402
+
+DEFAULT_SIZES = [10, 100, 1000]
+DEFAULT_THRESHOLD = 0.10
+
+# (prefix, random national digits) per region, all valid numbering ranges
+NUMBER_SHAPES = [
+    ("+91", lambda rng: f"{rng.randint(6, 9)}{rng.randint(0, 999999999):09d}"),
+    ("+1", lambda rng: f"{rng.randint(201, 989)}{rng.randint(2000000, 9999999)}"),
+    ("+44", lambda rng: f"7{rng.randint(400000000, 999999999)}"),
+    ("+49", lambda rng: f"15{rng.randint(10000000, 99999999)}"),
+]
+PATTERNED_SHARE = 0.1
+REGISTRARS = ["MarkMonitor Inc.", "GoDaddy.com, LLC", "NameCheap, Inc.", "Gandi SAS", "Tucows Domains Inc."]
+TLDS = ["com", "net", "org", "in", "co.uk", "de"]
+
+
+class NullRenderer(Renderer):
+    """Discards records, so get_basic_info is timed without terminal output"""
+
+    def emit(self, record) -> None:
+        pass
+
+
+def generate_numbers(count: int, seed: int = 42) -> List[str]:
+    """
+    Build a reproducible mix of international and deliberately patterned numbers
+
+    Args:
+        count: Number of phone numbers
+        seed: Random seed
+
+    Returns:
+        List of E.164 strings
+    """
+    rng = random.Random(seed)
+    numbers = []
+    for _ in range(count):
+        if rng.random() < PATTERNED_SHARE:
+            numbers.append("+1" + str(rng.randint(201, 989)) + str(rng.randint(2, 9)) * 7)
+        else:
+            prefix, national = rng.choice(NUMBER_SHAPES)
+            numbers.append(prefix + national(rng))
+    return numbers
+
+
+def generate_whois_entries(count: int, seed: int = 42) -> List[Tuple[str, WhoisData]]:
+    """
+    Build reproducible raw WHOIS answers shaped like python-whois entries
+
+    Args:
+        count: Number of domains
+        seed: Random seed
+
+    Returns:
+        List of (domain, WhoisData) pairs
+    """
+    rng = random.Random(seed)
+    entries = []
+    for index in range(count):
+        domain = f"example{index}.{rng.choice(TLDS)}"
+        created = datetime(2000, 1, 1) + timedelta(days=rng.randint(0, 9000), seconds=rng.randint(0, 86399))
+        entries.append((domain, WhoisData(
+            domain_name=[domain.upper(), domain],
+            registrar=rng.choice(REGISTRARS),
+            whois_server=f"whois.{domain.rsplit('.', 1)[-1]}",
+            creation_date=[created, created + timedelta(seconds=1)] if rng.random() < 0.3 else created,
+            expiration_date=created + timedelta(days=365 * rng.randint(1, 30)),
+            updated_date=created + timedelta(days=rng.randint(0, 3000)),
+            name=None,
+            org=f"Example Org {index}",
+            country=rng.choice(["US", "IN", "GB", "DE"]),
+            emails=[f"abuse@{domain}", f"hostmaster@{domain}"],
+            name_servers=[f"ns{n}.{domain}" for n in range(1, rng.randint(2, 5))],
+            status=["clientTransferProhibited", "clientDeleteProhibited"],
+            dnssec="unsigned",
+        )))
+    return entries
+
+
+def clear_memo_caches() -> None:
+    """Drop the parse and quoting memos so every repetition does the full work"""
+    _cached_profile.cache_clear()
+    quote_query.cache_clear()
+
+
+# ------------------------------------------------------------------ cases
+#
+# A case takes (size, seed) and returns (workload, reset): workload() processes
+# `size` synthetic inputs once, reset() runs untimed before every call.
+
+def case_validate_number(size: int, seed: int):
+    tool = NumIntensePro(renderer=NullRenderer())
+    numbers = generate_numbers(size, seed)
+
+    def reset():
+        clear_memo_caches()
+        tool.metadata_cache.clear()
+
+    return lambda: [tool.validate_number(number, quiet=True) for number in numbers], reset
+
+
+def case_get_basic_info(size: int, seed: int):
+    tool = NumIntensePro(renderer=NullRenderer())
+    profiles = [number_profile(number) for number in generate_numbers(size, seed)]
+
+    def workload():
+        for profile in profiles:
+            tool.results['raw_number'] = profile.e164
+            tool.results['profile'] = profile
+            tool.get_basic_info(profile.parsed)
+
+    return workload, tool.metadata_cache.clear
+
+
+def case_generate_all_dorks(size: int, seed: int):
+    generator = AdvancedDorkGenerator()
+    numbers = generate_numbers(size, seed)
+    return lambda: [generator.generate_all_dorks(number) for number in numbers], clear_memo_caches
+
+
+def case_generate_search_urls(size: int, seed: int):
+    generator = AdvancedDorkGenerator()
+    dork_sets = [generator.generate_all_dorks(number) for number in generate_numbers(size, seed)]
+    return lambda: [generator.generate_search_urls(dorks) for dorks in dork_sets], clear_memo_caches
+
+
+def case_check_local_spam_patterns(size: int, seed: int):
+    checker = AdvancedSpamChecker(verbose=False)
+    numbers = generate_numbers(size, seed)
+    return lambda: [checker.check_local_spam_patterns(number) for number in numbers], clear_memo_caches
+
+
+def case_generate_spam_sources(size: int, seed: int):
+    checker = AdvancedSpamChecker(verbose=False)
+    numbers = generate_numbers(size, seed)
+    return lambda: [checker.generate_spam_sources(number) for number in numbers], clear_memo_caches
+
+
+def case_username_variations(size: int, seed: int):
+    lookup = AdvancedTelegramLookup()
+    numbers = generate_numbers(size, seed)
+    return lambda: [lookup.generate_username_variations(number) for number in numbers], clear_memo_caches
+
+
+def case_format_whois_data(size: int, seed: int):
+    whois = AdvancedWHOISLookup(verbose=False)
+    entries = generate_whois_entries(size, seed)
+    return lambda: [whois.format_whois_data(data) for _, data in entries], None
+
+
+def case_calculate_domain_age(size: int, seed: int):
+    whois = AdvancedWHOISLookup(verbose=False)
+    rng = random.Random(seed)
+    # The string layouts format_whois_data and the registries produce
+    layouts = ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%d-%b-%Y"]
+    dates = [(datetime(2000, 1, 1) + timedelta(days=rng.randint(0, 9000))).strftime(rng.choice(layouts))
+             for _ in range(size)]
+    return lambda: [whois.calculate_domain_age(date) for date in dates], None
+
+
+def _report_writer_case(output_format: str):
+    def case(size: int, seed: int):
+        whois = AdvancedWHOISLookup(verbose=False)
+        reports = [(domain, whois.format_whois_data(data)) for domain, data in generate_whois_entries(size, seed)]
+        directory = tempfile.mkdtemp(prefix="numintense_bench_")
+        path = os.path.join(directory, f"whois.{'txt' if output_format == 'text' else output_format}")
+
+        def workload():
+            with ReportSink(path, output_format) as sink:
+                for domain, info in reports:
+                    whois.save_whois_report(domain, info, sink=sink)
+
+        workload.cleanup = lambda: shutil.rmtree(directory, ignore_errors=True)
+        return workload, None
+    return case
+
+
+CASES = {
+    "validate_number": case_validate_number,
+    "get_basic_info": case_get_basic_info,
+    "dorks.generate_all_dorks": case_generate_all_dorks,
+    "dorks.generate_search_urls": case_generate_search_urls,
+    "spam.check_local_spam_patterns": case_check_local_spam_patterns,
+    "spam.generate_spam_sources": case_generate_spam_sources,
+    "telegram.generate_username_variations": case_username_variations,
+    "whois.format_whois_data": case_format_whois_data,
+    "whois.calculate_domain_age": case_calculate_domain_age,
+    "whois.report_text": _report_writer_case("text"),
+    "whois.report_jsonl": _report_writer_case("jsonl"),
+    "whois.report_csv": _report_writer_case("csv"),
+}
+
+
+# ---------------------------------------------------------------- timing
+
+def time_workload(workload: Callable, reset: Optional[Callable], repeat: int, min_time: float) -> Dict:
+    """
+    Time a workload, looping short ones until a repetition lasts at least min_time
+
+    Args:
+        workload: Zero-argument callable
+        reset: Untimed callable run before every call (or None)
+        repeat: Number of repetitions
+        min_time: Minimum seconds per repetition
+
+    Returns:
+        Best and median seconds per call, and calls per repetition
+    """
+    def timed_call() -> float:
+        if reset is not None:
+            reset()
+        start = time.perf_counter()
+        workload()
+        return time.perf_counter() - start
+
+    timed_call()  # Warm up imports, compiled rules and phonenumbers metadata
+
+    loops, elapsed = 1, timed_call()
+    while elapsed < min_time:
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9)) + 1)
+        elapsed = sum(timed_call() for _ in range(loops))
+
+    samples = [sum(timed_call() for _ in range(loops)) / loops for _ in range(repeat)]
+    return {"best": min(samples), "median": statistics.median(samples), "loops": loops}
+
+
+def select_cases(patterns: Optional[List[str]]) -> List[str]:
+    """Case names containing any of the patterns (all cases without patterns)"""
+    if not patterns:
+        return list(CASES)
+    return [name for name in CASES if any(pattern in name for pattern in patterns)]
+
+
+def run(cases: List[str], sizes: List[int], repeat: int, min_time: float, seed: int = 42) -> Dict:
+    """
+    Time every case at every input size
+
+    Args:
+        cases: Case names from CASES
+        sizes: Synthetic input sizes
+        repeat: Repetitions per measurement
+        min_time: Minimum seconds per repetition
+        seed: Random seed for the synthetic inputs
+
+    Returns:
+        Benchmark results
+    """
+    results = {}
+    for name in cases:
+        results[name] = {}
+        for size in sizes:
+            workload, reset = CASES[name](size, seed)
+            try:
+                timing = time_workload(workload, reset, repeat, min_time)
+            finally:
+                getattr(workload, "cleanup", lambda: None)()
+            results[name][str(size)] = {
+                "items": size,
+                "seconds": timing["best"],
+                "median_seconds": timing["median"],
+                "loops": timing["loops"],
+                "us_per_item": timing["best"] / size * 1e6,
+                "items_per_sec": size / timing["best"] if timing["best"] else 0.0,
+            }
+    return {
+        "meta": {
+            "generated": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "sizes": sizes,
+            "repeat": repeat,
+            "min_time": min_time,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[Dict]:
+    """
+    Compare per-item time of every case and size against a baseline run
+
+    Args:
+        current: Results of run()
+        baseline: Results of an earlier run() (e.g. loaded from --json output)
+        threshold: Relative slowdown counted as a regression (0.10 = 10%)
+
+    Returns:
+        One row per measurement with the relative change and a verdict
+    """
+    rows = []
+    for name, sizes in current["results"].items():
+        for size, entry in sizes.items():
+            previous = baseline.get("results", {}).get(name, {}).get(size)
+            row = {"case": name, "size": int(size), "us_per_item": entry["us_per_item"],
+                   "baseline_us_per_item": None, "change": None, "verdict": "new"}
+            if previous and previous.get("us_per_item"):
+                change = entry["us_per_item"] / previous["us_per_item"] - 1
+                row.update(baseline_us_per_item=previous["us_per_item"], change=change,
+                           verdict="REGRESSION" if change > threshold
+                           else "improved" if change < -threshold else "ok")
+            rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumIntense hot path microbenchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Synthetic input sizes")
+    parser.add_argument("--cases", nargs="+", metavar="PATTERN", help="Only cases whose name contains a pattern")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per measurement")
+    parser.add_argument("--min-time", type=float, default=0.05, help="Minimum seconds per repetition")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic inputs")
+    parser.add_argument("--list", action="store_true", help="List the cases and exit")
+    parser.add_argument("--json", metavar="FILE", help="Also write results as JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="Flag regressions against a saved --json file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown counted as a regression (default: 0.10 = 10%%)")
+    args = parser.parse_args()
+
+    cases = select_cases(args.cases)
+    if args.list or not cases:
+        print("\n".join(cases or CASES))
+        return 0 if cases else 1
+
+    results = run(cases, args.sizes, args.repeat, args.min_time, args.seed)
+
+    print(f"{'case':<40} {'size':>6} {'us/item':>12} {'items/sec':>14}")
+    for name, sizes in results["results"].items():
+        for entry in sizes.values():
+            print(f"{name:<40} {entry['items']:>6} {entry['us_per_item']:>12.2f} {entry['items_per_sec']:>14,.0f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+    if not args.compare:
+        return 0
+
+    with open(args.compare, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline, args.threshold)
+    print(f"\nCompared with {args.compare} (threshold {args.threshold:.0%})")
+    print(f"{'case':<40} {'size':>6} {'baseline':>12} {'current':>12} {'change':>8}  verdict")
+    for row in rows:
+        before = "-" if row["baseline_us_per_item"] is None else f"{row['baseline_us_per_item']:.2f}"
+        change = "-" if row["change"] is None else f"{row['change']:+.1%}"
+        print(f"{row['case']:<40} {row['size']:>6} {before:>12} {row['us_per_item']:>12.2f} {change:>8}  "
+              f"{row['verdict']}")
+
+    regressions = [row for row in rows if row["verdict"] == "REGRESSION"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Description: Track NumIntense cold-start latency using python -X importtime
+Version: 4.0.0
+
+Usage:
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --runs 10 --top 15 --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINT = os.path.join(ROOT, "numintense_pro.py")
+
+# Scripted scenarios that should never need the network stack
+SCENARIOS = {
+    "help": ["--help"],
+    "phone_basic": ["+919876543210", "--quiet"],
+}
+
+# Subsystems that an offline run should not pay for
+HEAVY_MODULES = ["requests", "whois", "bs4", "urllib3", "charset_normalizer"]
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    Parse `python -X importtime` output
+
+    Args:
+        stderr: Captured stderr of the child process
+
+    Returns:
+        List of (module, self_us, cumulative_us) tuples
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            _, fields = line.split(":", 1)
+            self_us, cumulative_us, module = fields.split("|", 2)
+            # Drop the single separator space; remaining indent marks nesting depth
+            entries.append((module[1:].rstrip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return entries
+
+
+def run_scenario(args: List[str], runs: int) -> Dict:
+    """
+    Run one CLI scenario repeatedly in fresh interpreters
+
+    Args:
+        args: CLI arguments for numintense_pro.py
+        runs: Number of cold starts to time
+
+    Returns:
+        Timing and import statistics for the scenario
+    """
+    wall_times = []
+    imports = []
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", ENTRY_POINT] + args,
+            cwd=ROOT, capture_output=True, text=True,
+        )
+        wall_times.append((time.perf_counter() - start) * 1000)
+        imports = parse_importtime(proc.stderr)
+
+    imported = {module.strip() for module, _, _ in imports}
+    top_level = [(module.strip(), cumulative) for module, _, cumulative in imports
+                 if not module.startswith(" ")]
+
+    return {
+        "args": args,
+        "runs": runs,
+        "wall_ms_min": min(wall_times),
+        "wall_ms_median": statistics.median(wall_times),
+        "import_ms_total": sum(self_us for _, self_us, _ in imports) / 1000,
+        "modules_imported": len(imported),
+        "heavy_modules_loaded": [m for m in HEAVY_MODULES if m in imported],
+        "top_imports": sorted(top_level, key=lambda item: item[1], reverse=True),
+    }
+
+
+def print_report(results: Dict[str, Dict], top: int) -> None:
+    """Print a human-readable summary of all scenarios"""
+    for name, result in results.items():
+        print(f"\n== {name}: numintense_pro.py {' '.join(result['args'])}")
+        print(f"   wall time   : {result['wall_ms_min']:.1f} ms min / "
+              f"{result['wall_ms_median']:.1f} ms median over {result['runs']} runs")
+        print(f"   import time : {result['import_ms_total']:.1f} ms "
+              f"({result['modules_imported']} modules)")
+        heavy = ", ".join(result["heavy_modules_loaded"]) or "none"
+        print(f"   heavy deps  : {heavy}")
+        print(f"   top {top} top-level imports (cumulative):")
+        for module, cumulative in result["top_imports"][:top]:
+            print(f"     {cumulative / 1000:8.1f} ms  {module}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumIntense cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts per scenario")
+    parser.add_argument("--top", type=int, default=10, help="Number of top imports to show")
+    parser.add_argument("--json", metavar="FILE", help="Also write results as JSON")
+    args = parser.parse_args()
+
+    results = {name: run_scenario(cli_args, args.runs) for name, cli_args in SCENARIOS.items()}
+    print_report(results, args.top)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -145,7 +145,8 @@ class NumIntenseInstaller:
             "phonenumbers": "Phone number processing",
             "requests": "HTTP requests", 
             "colorama": "Terminal colors",
-            "whois": "Domain lookup"
+            "whois": "Domain lookup",
+            "numpy": "Batch spam scoring"
         }
         
         for pkg, desc in packages.items():
@@ -5,19 +5,16 @@ Description: Generate comprehensive Google dorks for OSINT
 Version: 3.1.0
 """
 
-import urllib.parse
 from colorama import Fore, Style, init
+from utils.url_builder import URLBuilder
+from utils.report_sink import report_sink
 
 init(autoreset=True)
 
 class DorkGenerator:
     def __init__(self):
-        self.search_engines = {
-            "Google": "https://www.google.com/search?q={}",
-            "Bing": "https://www.bing.com/search?q={}",
-            "DuckDuckGo": "https://duckduckgo.com/html/?q={}",
-            "Yandex": "https://yandex.com/search/?text={}",
-        }
+        self.url_builder = URLBuilder(["Google", "Bing", "DuckDuckGo", "Yandex"])
+        self.search_engines = self.url_builder.search_engines
 
     def generate_phone_dorks(self, number):
         """Generate phone number specific dorks"""
@@ -68,12 +65,11 @@ class DorkGenerator:
         print(Fore.YELLOW + f"Query Type: {query_type}")
         print(Fore.YELLOW + f"Total Dorks: {len(dorks)}")
         
-        for engine_name, base_url in self.search_engines.items():
+        for engine_name in self.search_engines:
             print(f"\n{Fore.MAGENTA}🔍 {engine_name}:")
             
             for dork_name, dork_query in list(dorks.items())[:3]:  # Show first 3 per engine
-                encoded = urllib.parse.quote(dork_query)
-                url = base_url.format(encoded)
+                url = self.url_builder.url(engine_name, dork_query)
                 print(f"    {Fore.GREEN}• {dork_name}")
                 print(f"        {Fore.CYAN}{url}")
             
@@ -94,28 +90,37 @@ class DorkGenerator:
         self.display_dorks(query, dorks, query_type)
         return dorks
 
-    def save_dorks(self, query, dorks, filename=None):
-        """Save dorks to file"""
+    def save_dorks(self, query, dorks, filename=None, sink=None):
+        """Save dorks to file, or add them to a shared report sink"""
         if filename is None:
             filename = f"dorks_{query.replace('@', '_').replace('.', '_')}.txt"
             
-        try:
-            with open(filename, 'w') as f:
-                f.write(f"Dork Generation Report\n")
-                f.write(f"Query: {query}\n")
-                f.write("=" * 50 + "\n\n")
+        report = {
+            'report': 'dorks',
+            'target': query,
+            'dorks': dorks,
+            'search_urls': {name: dict(self.url_builder.urls(dork_query)) for name, dork_query in dorks.items()},
+        }
+        
+        def write_text(f):
+            f.write(f"Dork Generation Report\n")
+            f.write(f"Query: {query}\n")
+            f.write("=" * 50 + "\n\n")
+            
+            for dork_name, dork_query in dorks.items():
+                f.write(f"{dork_name}:\n")
+                f.write(f"  {dork_query}\n\n")
                 
-                for dork_name, dork_query in dorks.items():
-                    f.write(f"{dork_name}:\n")
-                    f.write(f"  {dork_query}\n\n")
-                    
-                    for engine_name, base_url in self.search_engines.items():
-                        encoded = urllib.parse.quote(dork_query)
-                        url = base_url.format(encoded)
-                        f.write(f"  {engine_name}: {url}\n")
-                    f.write("\n")
+                for engine_name, url in self.url_builder.urls(dork_query):
+                    f.write(f"  {engine_name}: {url}\n")
+                f.write("\n")
+        
+        try:
+            with report_sink(sink, filename) as out:
+                out.write(report, write_text)
                     
-            print(Fore.GREEN + f"[💾] Dorks saved to: {filename}")
+            if sink is None:
+                print(Fore.GREEN + f"[💾] Dorks saved to: {filename}")
         except Exception as e:
             print(Fore.RED + f"[❌] Error saving dorks: {e}")
 
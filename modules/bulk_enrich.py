@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Bulk Phone Enrichment Module
+Description: Streaming CSV enrichment built on NumIntensePro number validation
+Version: 4.0.0
+"""
+
+import csv
+import json
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from utils.lazy_import import LazyModule, LazyAttribute
+
+# Colour support is only loaded when progress is logged to a terminal
+colorama = LazyModule('colorama', on_load=lambda module: module.init(autoreset=True))
+Fore = LazyAttribute(colorama, 'Fore')
+
+# Columns appended to every input row
+ENRICHED_FIELDS = ['e164', 'region', 'carrier', 'timezone', 'number_type', 'valid']
+
+
+class BulkPhoneEnricher:
+    def __init__(self, tool, phone_column: str = "phone", progress_every: int = 10000):
+        """
+        Args:
+            tool: NumIntensePro instance providing validate_number/extract_basic_info
+            phone_column: Name of the CSV column holding the phone number
+            progress_every: Report throughput every N rows (0 disables)
+        """
+        self.tool = tool
+        self.phone_column = phone_column
+        self.progress_every = progress_every
+
+    def enrich_row(self, row: Dict[str, str]) -> Dict[str, str]:
+        """
+        Enrich a single CSV row with normalized number metadata
+
+        Args:
+            row: Input row as read by csv.DictReader
+
+        Returns:
+            The same row with ENRICHED_FIELDS added (run() refuses inputs that already have them)
+        """
+        raw = (row.get(self.phone_column) or "").strip()
+        parsed = self.tool.validate_number(raw, quiet=True) if raw else None
+
+        if parsed is None:
+            row.update({field: "" for field in ENRICHED_FIELDS})
+            row['valid'] = "false"
+            return row
+
+        # validate_number leaves the parsed profile on the tool; reuse its formats
+        info = self.tool.extract_basic_info(self.tool.results.get('profile') or parsed)
+        row.update({
+            'e164': info['e164'],
+            'region': info['region'] or "",
+            'carrier': info['carrier'],
+            'timezone': "|".join(info['timezones']),
+            'number_type': info['number_type_name'],
+            'valid': "true" if info['valid'] else "false",
+        })
+        return row
+
+    def iter_enriched(self, rows: Iterable[Dict[str, str]]) -> Iterator[Dict[str, str]]:
+        """
+        Lazily enrich a stream of rows (one row in memory at a time)
+
+        Args:
+            rows: Iterable of input rows
+
+        Returns:
+            Iterator of enriched rows
+        """
+        for row in rows:
+            yield self.enrich_row(row)
+
+    def run(self, input_path: str, output_path: str = "-", output_format: Optional[str] = None) -> Optional[Dict[str, float]]:
+        """
+        Stream an input CSV into an enriched CSV/JSONL file
+
+        Args:
+            input_path: Source CSV file ('-' for stdin)
+            output_path: Destination file ('-' for stdout)
+            output_format: 'csv' or 'jsonl' (inferred from output_path if None)
+
+        Returns:
+            Run statistics or None if the input could not be processed
+        """
+        if output_format is None:
+            output_format = "jsonl" if output_path.endswith(('.jsonl', '.ndjson')) else "csv"
+
+        # Keep stdout clean for data when streaming to it
+        log = sys.stderr if output_path == "-" else sys.stdout
+
+        src = sys.stdin if input_path == "-" else open(input_path, 'r', newline='', encoding='utf-8')
+        dst = sys.stdout if output_path == "-" else open(output_path, 'w', newline='', encoding='utf-8')
+
+        stats = {'rows': 0, 'valid': 0, 'invalid': 0}
+        start = time.perf_counter()
+
+        try:
+            reader = csv.DictReader(src)
+            fieldnames = reader.fieldnames or []
+
+            if self.phone_column not in fieldnames:
+                self._log(log, 'RED', f"[❌] Column '{self.phone_column}' not found in {input_path} "
+                          f"(available: {', '.join(fieldnames)})")
+                return None
+
+            # Enriched values would silently replace the caller's own data
+            conflicts = [field for field in ENRICHED_FIELDS if field in fieldnames]
+            if conflicts:
+                self._log(log, 'RED', f"[❌] {input_path} already has column(s) {', '.join(conflicts)}; "
+                          f"rename them before enriching")
+                return None
+
+            out_fields = fieldnames + ENRICHED_FIELDS
+            writer = self._make_writer(dst, output_format, out_fields)
+
+            for row in self.iter_enriched(reader):
+                writer(row)
+                stats['rows'] += 1
+                stats['valid' if row['valid'] == "true" else 'invalid'] += 1
+
+                if self.progress_every and stats['rows'] % self.progress_every == 0:
+                    elapsed = time.perf_counter() - start
+                    self._log(log, 'CYAN', f"[🔄] {stats['rows']} rows | "
+                              f"{stats['rows'] / elapsed:,.0f} rows/sec")
+        finally:
+            if src is not sys.stdin:
+                src.close()
+            if dst is not sys.stdout:
+                dst.close()
+
+        elapsed = time.perf_counter() - start
+        stats['seconds'] = elapsed
+        stats['rows_per_sec'] = stats['rows'] / elapsed if elapsed > 0 else 0.0
+
+        self._log(log, 'GREEN', f"[✅] Enriched {stats['rows']} rows "
+                  f"({stats['valid']} valid, {stats['invalid']} invalid) in {elapsed:.2f}s "
+                  f"- {stats['rows_per_sec']:,.0f} rows/sec")
+
+        cache = getattr(self.tool, 'metadata_cache', None)
+        if cache is not None:
+            cache_stats = cache.stats()
+            stats['metadata_cache_hit_ratio'] = cache_stats['hit_ratio']
+            self._log(log, 'CYAN', f"[📊] Metadata cache: {cache_stats['hits']} hits / "
+                      f"{cache_stats['misses']} misses ({cache_stats['hit_ratio']:.1%})")
+        return stats
+
+    @staticmethod
+    def _log(log, colour: str, message: str) -> None:
+        """Print a log line, coloured only when the log stream is a terminal"""
+        isatty = getattr(log, 'isatty', None)
+        if isatty is not None and isatty():
+            message = getattr(Fore, colour) + message
+        print(message, file=log)
+
+    def _make_writer(self, dst, output_format: str, fieldnames: List[str]):
+        """Return a per-row write callable for the requested format"""
+        if output_format == "jsonl":
+            def write_jsonl(row):
+                dst.write(json.dumps(row, ensure_ascii=False) + "\n")
+            return write_jsonl
+
+        writer = csv.DictWriter(dst, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        return writer.writerow
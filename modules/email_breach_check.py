@@ -7,14 +7,15 @@ Version: 3.1.0
 
 import requests
 import re
+from utils.transport import get_transport
 from colorama import Fore, Style, init
 
 init(autoreset=True)
 
 class EmailIntelligence:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+    def __init__(self, transport=None):
+        self.transport = transport or get_transport()
+        self.session = self.transport.client(headers={
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
         })
 
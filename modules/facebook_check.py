@@ -1,21 +1,27 @@
 # Enhanced Facebook OSINT Module
-import urllib.parse
 from colorama import Fore, Style, init
-from typing import List, Dict, Tuple
-import requests
+from typing import List, Dict, Tuple, Optional, Union
 import time
 import re
+from utils.transport import HTTPTransport, get_transport
+from utils.number_profile import NumberProfile, number_profile
+from utils.report_sink import ReportSink, report_sink
+from utils.url_builder import URLBuilder, quote_query
 
 init(autoreset=True)
 
+SEARCH_URLS = URLBuilder(["Google", "DuckDuckGo", "Bing", "Yandex", "Startpage"])
+
 class AdvancedFacebookOSINT:
-    def __init__(self, user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"):
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': user_agent})
-        self.rate_limit_delay = 2
+    def __init__(self, user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+                 transport: Optional[HTTPTransport] = None):
+        self.transport = transport or get_transport()
+        self.session = self.transport.client(headers={'User-Agent': user_agent})
 
-    def generate_facebook_dorks(self, number: str) -> List[Dict[str, str]]:
-        clean_number = number.replace(' ', '').replace('-', '').replace('(', '').replace(')', '').replace('+', '')
+    def generate_facebook_dorks(self, number: Union[str, NumberProfile]) -> List[Dict[str, str]]:
+        profile = number_profile(number)
+        number = profile.raw
+        clean_number = profile.digits
         
         dorks = [
             {"name": "Basic Phone Search", "query": f'intext:"{number}" site:facebook.com'},
@@ -29,38 +35,31 @@ class AdvancedFacebookOSINT:
             without_plus = number[1:]
             dorks.append({"name": "International without +", "query": f'intext:"{without_plus}" site:facebook.com'})
         
+        # Local forms (national number, trunk-prefixed) for every region
+        for form in profile.local_forms:
+            dorks.append({"name": f"National format {form}", "query": f'intext:"{form}" site:facebook.com'})
+        
         return dorks
 
     def generate_search_links(self, dorks: List[Dict[str, str]]) -> Dict[str, List[str]]:
-        search_engines = {
-            "Google": "https://www.google.com/search?q={}",
-            "DuckDuckGo": "https://duckduckgo.com/html/?q={}",
-            "Bing": "https://www.bing.com/search?q={}",
-            "Yandex": "https://yandex.com/search/?text={}",
-            "Startpage": "https://www.startpage.com/sp/search?query={}"
-        }
+        links = {engine: [] for engine in SEARCH_URLS.search_engines}
         
-        links = {}
-        
-        for engine, base_url in search_engines.items():
-            engine_links = []
-            for dork in dorks:
-                encoded_query = urllib.parse.quote(dork["query"])
-                url = base_url.format(encoded_query)
-                engine_links.append({"name": dork["name"], "url": url})
-            links[engine] = engine_links
+        for dork in dorks:
+            for engine, url in SEARCH_URLS.urls(dork["query"]):
+                links[engine].append({"name": dork["name"], "url": url})
             
         return links
 
-    def facebook_direct_search(self, number: str) -> List[str]:
-        clean_number = number.replace(' ', '').replace('-', '').replace('(', '').replace(')', '')
+    def facebook_direct_search(self, number: Union[str, NumberProfile]) -> List[str]:
+        clean_number = number_profile(number).e164
         
+        encoded = quote_query(clean_number)
         direct_urls = [
-            f"https://www.facebook.com/search/top/?q={urllib.parse.quote(clean_number)}",
-            f"https://www.facebook.com/search/people/?q={urllib.parse.quote(clean_number)}",
-            f"https://www.facebook.com/search/pages/?q={urllib.parse.quote(clean_number)}",
-            f"https://www.facebook.com/search/groups/?q={urllib.parse.quote(clean_number)}",
-            f"https://www.facebook.com/search/places/?q={urllib.parse.quote(clean_number)}"
+            f"https://www.facebook.com/search/top/?q={encoded}",
+            f"https://www.facebook.com/search/people/?q={encoded}",
+            f"https://www.facebook.com/search/pages/?q={encoded}",
+            f"https://www.facebook.com/search/groups/?q={encoded}",
+            f"https://www.facebook.com/search/places/?q={encoded}"
         ]
         
         return direct_urls
@@ -85,41 +84,56 @@ class AdvancedFacebookOSINT:
             else:
                 print(Fore.YELLOW + "  └─" + "─" * 50)
 
-    def facebook_check(self, number: str, save_output: bool = False, advanced: bool = False) -> None:
+    def facebook_check(self, number: Union[str, NumberProfile], save_output: bool = False, advanced: bool = False,
+                       sink: Optional[ReportSink] = None) -> None:
+        profile = number_profile(number)
+        number = profile.raw
         print(Fore.CYAN + f"\n[🔍] Starting Facebook OSINT check for: {number}")
         
-        dorks = self.generate_facebook_dorks(number)
+        dorks = self.generate_facebook_dorks(profile)
         search_links = self.generate_search_links(dorks)
-        direct_urls = self.facebook_direct_search(number)
+        direct_urls = self.facebook_direct_search(profile)
         
         self.display_results(number, search_links, direct_urls)
         
-        if save_output:
-            self.save_results(number, search_links, direct_urls)
+        if save_output or sink is not None:
+            self.save_results(number, search_links, direct_urls, sink=sink)
         
         print(Fore.RED + "\n" + "="*70)
         print(Fore.RED + "[!] LEGAL DISCLAIMER: For educational and authorized research only.")
 
-    def save_results(self, number: str, search_links: Dict, direct_urls: List[str], filename: str = None) -> None:
+    def save_results(self, number: str, search_links: Dict, direct_urls: List[str], filename: str = None,
+                     sink: Optional[ReportSink] = None) -> None:
         if filename is None:
             filename = f"facebook_osint_{number.replace('+', '')}.txt"
             
+        report = {
+            'report': 'facebook',
+            'target': number,
+            'direct_urls': direct_urls,
+            'search_links': search_links,
+        }
+        
+        def write_text(f):
+            f.write(f"Facebook OSINT Report for: {number}\n")
+            f.write("=" * 50 + "\n\n")
+            
+            f.write("DIRECT FACEBOOK SEARCHES:\n")
+            for url in direct_urls:
+                f.write(f"{url}\n")
+            
+            f.write("\nSEARCH ENGINE DORKS:\n")
+            for engine, dorks in search_links.items():
+                f.write(f"\n{engine}:\n")
+                for dork_info in dorks:
+                    f.write(f"  {dork_info['name']}: {dork_info['url']}\n")
+        
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(f"Facebook OSINT Report for: {number}\n")
-                f.write("=" * 50 + "\n\n")
-                
-                f.write("DIRECT FACEBOOK SEARCHES:\n")
-                for url in direct_urls:
-                    f.write(f"{url}\n")
-                
-                f.write("\nSEARCH ENGINE DORKS:\n")
-                for engine, dorks in search_links.items():
-                    f.write(f"\n{engine}:\n")
-                    for dork_info in dorks:
-                        f.write(f"  {dork_info['name']}: {dork_info['url']}\n")
+            with report_sink(sink, filename) as out:
+                out.write(report, write_text)
             
-            print(Fore.GREEN + f"[💾] Results saved to: {filename}")
+            if sink is None:
+                print(Fore.GREEN + f"[💾] Results saved to: {filename}")
         except Exception as e:
             print(Fore.RED + f"\n[❌] Error saving results: {e}")
 
@@ -1,357 +1,308 @@
-import urllib.parse
+import itertools
 from colorama import Fore, Style, init
-from typing import List, Dict, Tuple
-import re
+from typing import List, Dict, Tuple, Iterable, Iterator, Optional, Union
+from utils.number_profile import NumberProfile, number_profile
+from utils.report_sink import ReportSink, report_sink
+from utils.url_builder import URLBuilder
 
 # Initialize colorama
 init(autoreset=True)
 
+SOCIAL_PLATFORMS = [
+    ("Facebook", "site:facebook.com"),
+    ("Instagram", "site:instagram.com"),
+    ("Twitter", "site:twitter.com"),
+    ("LinkedIn", "site:linkedin.com"),
+    ("Pinterest", "site:pinterest.com"),
+    ("Reddit", "site:reddit.com"),
+    ("Telegram", "site:t.me OR site:telegram.me"),
+    ("WhatsApp", "site:whatsapp.com OR site:wa.me"),
+    ("Signal", "site:signal.org"),
+    ("Viber", "site:viber.com"),
+    ("WeChat", "site:wechat.com"),
+    ("Snapchat", "site:snapchat.com"),
+    ("TikTok", "site:tiktok.com"),
+    ("YouTube", "site:youtube.com"),
+    ("Discord", "site:discord.com"),
+    ("Skype", "site:skype.com"),
+    ("Line", "site:line.me"),
+    ("Kik", "site:kik.com"),
+    ("Clubhouse", "site:clubhouse.com")
+]
+
+FILE_TYPES = [
+    ("PDF Documents", "ext:pdf"),
+    ("Word Documents", "ext:doc OR ext:docx"),
+    ("Excel Files", "ext:xls OR ext:xlsx"),
+    ("Text Files", "ext:txt"),
+    ("CSV Files", "ext:csv"),
+    ("Presentations", "ext:ppt OR ext:pptx"),
+    ("Images", "ext:jpg OR ext:jpeg OR ext:png OR ext:gif"),
+    ("Archives", "ext:zip OR ext:rar OR ext:7z"),
+    ("Database Files", "ext:sql OR ext:db OR ext:mdb")
+]
+
+PASTE_SITES = [
+    ("Pastebin", "site:pastebin.com"),
+    ("GitHub", "site:github.com"),
+    ("GitLab", "site:gitlab.com"),
+    ("Bitbucket", "site:bitbucket.org"),
+    ("SourceForge", "site:sourceforge.net"),
+    ("CodePen", "site:codepen.io"),
+    ("JSFiddle", "site:jsfiddle.net"),
+    ("Paste.org", "site:paste.org"),
+    ("Paste.org.ru", "site:paste.org.ru"),
+    ("Rentry", "site:rentry.co"),
+    ("PrivateBin", "site:privatebin.net"),
+    ("Hastebin", "site:hastebin.com"),
+    ("Ghostbin", "site:ghostbin.com")
+]
+
+FORUM_PLATFORMS = [
+    ("phpBB Forums", "site:*.phpbb.com OR inurl:phpbb"),
+    ("vBulletin Forums", "site:*.vbulletin.net OR inurl:vbulletin"),
+    ("XenForo Forums", "site:*.xenforo.com OR inurl:xenforo"),
+    ("Discourse Forums", "site:*.discourse.group"),
+    ("Flarum Forums", "site:*.flarum.cloud"),
+    ("Simple Machines", "site:*.simplemachines.org"),
+    ("Quora", "site:quora.com"),
+    ("Stack Overflow", "site:stackoverflow.com"),
+    ("Reddit Threads", "site:reddit.com")
+]
+
+BUSINESS_SITES = [
+    ("Yellow Pages", "site:yellowpages.com OR site:yellowpages.ca"),
+    ("White Pages", "site:whitepages.com OR site:whitepages.ca"),
+    ("TrueCaller", "site:truecaller.com"),
+    ("SpyDialer", "site:spydialer.com"),
+    ("411", "site:411.com"),
+    ("AnyWho", "site:anywho.com"),
+    ("LinkedIn Profiles", "site:linkedin.com/in/ OR site:linkedin.com/pub/"),
+    ("AngelList", "site:angel.co"),
+    ("Crunchbase", "site:crunchbase.com"),
+    ("Glassdoor", "site:glassdoor.com"),
+    ("Indeed", "site:indeed.com"),
+    ("Monster", "site:monster.com"),
+    ("CareerBuilder", "site:careerbuilder.com")
+]
+
+# (label, query template) per number variation
+ADVANCED_TEMPLATES = [
+    ("Contact Pages", 'inurl:contact "{number}"'),
+    ("About Pages", 'inurl:about "{number}"'),
+    ("Profile Pages", 'inurl:profile "{number}"'),
+    ("Phone Directory", 'inurl:phone "{number}" OR inurl:telephone "{number}"'),
+    ("User Profiles", 'inurl:user "{number}" OR inurl:users "{number}"'),
+    ("Member Directory", 'inurl:members "{number}" OR inurl:directory "{number}"'),
+    ("Excel/CSV Files", '"{number}" (ext:xls OR ext:xlsx OR ext:csv)'),
+    ("Database Dumps", '"{number}" (ext:sql OR ext:db OR ext:bak)'),
+    ("Config Files", '"{number}" (ext:config OR ext:conf OR ext:ini)'),
+    ("Log Files", '"{number}" (ext:log OR ext:txt)')
+]
+
+
 class AdvancedDorkGenerator:
     def __init__(self):
-        self.search_engines = {
-            "Google": "https://www.google.com/search?q={}",
-            "DuckDuckGo": "https://duckduckgo.com/html/?q={}",
-            "Bing": "https://www.bing.com/search?q={}",
-            "Yandex": "https://yandex.com/search/?text={}",
-            "Startpage": "https://www.startpage.com/sp/search?query={}",
-            "Brave": "https://search.brave.com/search?q={}",
-            "Qwant": "https://www.qwant.com/?q={}",
-            "Ecosia": "https://www.ecosia.org/search?q={}"
+        self.url_builder = URLBuilder()
+        self.search_engines = self.url_builder.search_engines
+
+        # Category name -> lazy generator method, in report order
+        self.categories = {
+            "Social Media": "iter_social_media_dorks",
+            "Documents": "iter_document_dorks",
+            "Paste Sites": "iter_pastebin_dorks",
+            "Forums": "iter_forum_dorks",
+            "Business": "iter_business_dorks",
+            "Advanced": "iter_advanced_dorks"
         }
 
-    def clean_number_variations(self, number: str) -> List[str]:
+    def clean_number_variations(self, number: Union[str, NumberProfile]) -> List[str]:
         """
         Generate multiple variations of the phone number
         
         Args:
-            number: Original phone number
+            number: Original phone number or its NumberProfile
             
         Returns:
-            List of number variations
+            List of number variations (E.164, digits, national, trunk-prefixed, formatted), most specific first
         """
-        variations = []
-        
-        # Original number
-        variations.append(number)
-        
-        # Clean different formats
-        clean_variations = [
-            number.replace(' ', '').replace('-', '').replace('(', '').replace(')', ''),
-            number.replace(' ', '-'),
-            number.replace(' ', ''),
-            number.replace('+', ''),
-            re.sub(r'[^\d+]', '', number)
-        ]
-        
-        variations.extend(clean_variations)
-        
-        # Country code specific variations
-        if number.startswith('+91'):  # India
-            variations.extend([
-                number[3:],  # Without country code
-                '0' + number[3:],  # With leading zero
-                number.replace('+91', '91')  # Without plus
-            ])
-        elif number.startswith('+1'):  # US/Canada
-            variations.extend([
-                number[2:],  # Without country code
-                number.replace('+1', '1')  # Without plus
-            ])
-        elif number.startswith('+44'):  # UK
-            variations.extend([
-                number[3:],  # Without country code
-                '0' + number[3:],  # With leading zero
-                number.replace('+44', '44')  # Without plus
-            ])
-        
-        # Remove duplicates and empty strings
-        variations = list(set([v for v in variations if v.strip()]))
-        return variations
+        return list(number_profile(number).variations)
+
+    def _iter_site_dorks(self, sites: List[Tuple[str, str]], number_variations: List[str],
+                         per_site: int, template: str) -> Iterator[Tuple[str, str]]:
+        """Yield (label, query) for each site filter x the first `per_site` variations"""
+        for label, site_filter in sites:
+            for num_var in number_variations[:per_site]:
+                yield (
+                    f"{label} - {num_var}",
+                    template.format(number=num_var, filter=site_filter)
+                )
+
+    def iter_social_media_dorks(self, number_variations: List[str]) -> Iterator[Tuple[str, str]]:
+        """Lazily yield social media dorks (see generate_social_media_dorks)"""
+        return self._iter_site_dorks(SOCIAL_PLATFORMS, number_variations, 3, 'intext:"{number}" {filter}')
+
+    def iter_document_dorks(self, number_variations: List[str]) -> Iterator[Tuple[str, str]]:
+        """Lazily yield document dorks (see generate_document_dorks)"""
+        return self._iter_site_dorks(FILE_TYPES, number_variations, 2, '"{number}" {filter}')
+
+    def iter_pastebin_dorks(self, number_variations: List[str]) -> Iterator[Tuple[str, str]]:
+        """Lazily yield paste site dorks (see generate_pastebin_dorks)"""
+        return self._iter_site_dorks(PASTE_SITES, number_variations, 3, '"{number}" {filter}')
+
+    def iter_forum_dorks(self, number_variations: List[str]) -> Iterator[Tuple[str, str]]:
+        """Lazily yield forum dorks (see generate_forum_dorks)"""
+        return self._iter_site_dorks(FORUM_PLATFORMS, number_variations, 2, '"{number}" {filter}')
+
+    def iter_business_dorks(self, number_variations: List[str]) -> Iterator[Tuple[str, str]]:
+        """Lazily yield business dorks (see generate_business_dorks)"""
+        return self._iter_site_dorks(BUSINESS_SITES, number_variations, 2, '"{number}" {filter}')
+
+    def iter_advanced_dorks(self, number_variations: List[str]) -> Iterator[Tuple[str, str]]:
+        """Lazily yield advanced dorks (see generate_advanced_dorks)"""
+        for num_var in number_variations[:3]:
+            for label, template in ADVANCED_TEMPLATES:
+                yield f"{label} - {num_var}", template.format(number=num_var)
 
     def generate_social_media_dorks(self, number_variations: List[str]) -> List[Tuple[str, str]]:
         """
         Generate social media specific dorks
-        
+
         Args:
             number_variations: List of number formats
-            
+
         Returns:
             List of (platform, dork_query) tuples
         """
-        social_platforms = [
-            ("Facebook", "site:facebook.com"),
-            ("Instagram", "site:instagram.com"),
-            ("Twitter", "site:twitter.com"),
-            ("LinkedIn", "site:linkedin.com"),
-            ("Pinterest", "site:pinterest.com"),
-            ("Reddit", "site:reddit.com"),
-            ("Telegram", "site:t.me OR site:telegram.me"),
-            ("WhatsApp", "site:whatsapp.com OR site:wa.me"),
-            ("Signal", "site:signal.org"),
-            ("Viber", "site:viber.com"),
-            ("WeChat", "site:wechat.com"),
-            ("Snapchat", "site:snapchat.com"),
-            ("TikTok", "site:tiktok.com"),
-            ("YouTube", "site:youtube.com"),
-            ("Discord", "site:discord.com"),
-            ("Skype", "site:skype.com"),
-            ("Line", "site:line.me"),
-            ("Kik", "site:kik.com"),
-            ("Clubhouse", "site:clubhouse.com")
-        ]
-        
-        dorks = []
-        for platform, site_filter in social_platforms:
-            for num_var in number_variations[:3]:  # Use first 3 variations
-                dorks.append((
-                    f"{platform} - {num_var}",
-                    f'intext:"{num_var}" {site_filter}'
-                ))
-        
-        return dorks
+        return list(self.iter_social_media_dorks(number_variations))
 
     def generate_document_dorks(self, number_variations: List[str]) -> List[Tuple[str, str]]:
         """
         Generate document and file type dorks
-        
+
         Args:
             number_variations: List of number formats
-            
+
         Returns:
             List of (file_type, dork_query) tuples
         """
-        file_types = [
-            ("PDF Documents", "ext:pdf"),
-            ("Word Documents", "ext:doc OR ext:docx"),
-            ("Excel Files", "ext:xls OR ext:xlsx"),
-            ("Text Files", "ext:txt"),
-            ("CSV Files", "ext:csv"),
-            ("Presentations", "ext:ppt OR ext:pptx"),
-            ("Images", "ext:jpg OR ext:jpeg OR ext:png OR ext:gif"),
-            ("Archives", "ext:zip OR ext:rar OR ext:7z"),
-            ("Database Files", "ext:sql OR ext:db OR ext:mdb")
-        ]
-        
-        dorks = []
-        for file_type, ext_filter in file_types:
-            for num_var in number_variations[:2]:  # Use first 2 variations
-                dorks.append((
-                    f"{file_type} - {num_var}",
-                    f'"{num_var}" {ext_filter}'
-                ))
-        
-        return dorks
+        return list(self.iter_document_dorks(number_variations))
 
     def generate_pastebin_dorks(self, number_variations: List[str]) -> List[Tuple[str, str]]:
         """
         Generate pastebin and code sharing site dorks
-        
+
         Args:
             number_variations: List of number formats
-            
+
         Returns:
             List of (site, dork_query) tuples
         """
-        paste_sites = [
-            ("Pastebin", "site:pastebin.com"),
-            ("GitHub", "site:github.com"),
-            ("GitLab", "site:gitlab.com"),
-            ("Bitbucket", "site:bitbucket.org"),
-            ("SourceForge", "site:sourceforge.net"),
-            ("CodePen", "site:codepen.io"),
-            ("JSFiddle", "site:jsfiddle.net"),
-            ("Paste.org", "site:paste.org"),
-            ("Paste.org.ru", "site:paste.org.ru"),
-            ("Rentry", "site:rentry.co"),
-            ("PrivateBin", "site:privatebin.net"),
-            ("Hastebin", "site:hastebin.com"),
-            ("Ghostbin", "site:ghostbin.com")
-        ]
-        
-        dorks = []
-        for site_name, site_filter in paste_sites:
-            for num_var in number_variations[:3]:
-                dorks.append((
-                    f"{site_name} - {num_var}",
-                    f'"{num_var}" {site_filter}'
-                ))
-        
-        return dorks
+        return list(self.iter_pastebin_dorks(number_variations))
 
     def generate_forum_dorks(self, number_variations: List[str]) -> List[Tuple[str, str]]:
         """
         Generate forum and discussion board dorks
-        
+
         Args:
             number_variations: List of number formats
-            
+
         Returns:
             List of (forum_type, dork_query) tuples
         """
-        forum_platforms = [
-            ("phpBB Forums", "site:*.phpbb.com OR inurl:phpbb"),
-            ("vBulletin Forums", "site:*.vbulletin.net OR inurl:vbulletin"),
-            ("XenForo Forums", "site:*.xenforo.com OR inurl:xenforo"),
-            ("Discourse Forums", "site:*.discourse.group"),
-            ("Flarum Forums", "site:*.flarum.cloud"),
-            ("Simple Machines", "site:*.simplemachines.org"),
-            ("Quora", "site:quora.com"),
-            ("Stack Overflow", "site:stackoverflow.com"),
-            ("Reddit Threads", "site:reddit.com")
-        ]
-        
-        dorks = []
-        for forum_type, site_filter in forum_platforms:
-            for num_var in number_variations[:2]:
-                dorks.append((
-                    f"{forum_type} - {num_var}",
-                    f'"{num_var}" {site_filter}'
-                ))
-        
-        return dorks
+        return list(self.iter_forum_dorks(number_variations))
 
     def generate_business_dorks(self, number_variations: List[str]) -> List[Tuple[str, str]]:
         """
         Generate business and professional dorks
-        
+
         Args:
             number_variations: List of number formats
-            
+
         Returns:
             List of (business_type, dork_query) tuples
         """
-        business_sites = [
-            ("Yellow Pages", "site:yellowpages.com OR site:yellowpages.ca"),
-            ("White Pages", "site:whitepages.com OR site:whitepages.ca"),
-            ("TrueCaller", "site:truecaller.com"),
-            ("SpyDialer", "site:spydialer.com"),
-            ("411", "site:411.com"),
-            ("AnyWho", "site:anywho.com"),
-            ("LinkedIn Profiles", "site:linkedin.com/in/ OR site:linkedin.com/pub/"),
-            ("AngelList", "site:angel.co"),
-            ("Crunchbase", "site:crunchbase.com"),
-            ("Glassdoor", "site:glassdoor.com"),
-            ("Indeed", "site:indeed.com"),
-            ("Monster", "site:monster.com"),
-            ("CareerBuilder", "site:careerbuilder.com")
-        ]
-        
-        dorks = []
-        for business_type, site_filter in business_sites:
-            for num_var in number_variations[:2]:
-                dorks.append((
-                    f"{business_type} - {num_var}",
-                    f'"{num_var}" {site_filter}'
-                ))
-        
-        return dorks
+        return list(self.iter_business_dorks(number_variations))
 
     def generate_advanced_dorks(self, number_variations: List[str]) -> List[Tuple[str, str]]:
         """
         Generate advanced and combination dorks
-        
+
         Args:
             number_variations: List of number formats
-            
+
         Returns:
             List of (dork_type, dork_query) tuples
         """
-        advanced_dorks = []
-        
-        for num_var in number_variations[:3]:
-            advanced_dorks.extend([
-                (
-                    f"Contact Pages - {num_var}",
-                    f'inurl:contact "{num_var}"'
-                ),
-                (
-                    f"About Pages - {num_var}",
-                    f'inurl:about "{num_var}"'
-                ),
-                (
-                    f"Profile Pages - {num_var}",
-                    f'inurl:profile "{num_var}"'
-                ),
-                (
-                    f"Phone Directory - {num_var}",
-                    f'inurl:phone "{num_var}" OR inurl:telephone "{num_var}"'
-                ),
-                (
-                    f"User Profiles - {num_var}",
-                    f'inurl:user "{num_var}" OR inurl:users "{num_var}"'
-                ),
-                (
-                    f"Member Directory - {num_var}",
-                    f'inurl:members "{num_var}" OR inurl:directory "{num_var}"'
-                ),
-                (
-                    f"Excel/CSV Files - {num_var}",
-                    f'"{num_var}" (ext:xls OR ext:xlsx OR ext:csv)'
-                ),
-                (
-                    f"Database Dumps - {num_var}",
-                    f'"{num_var}" (ext:sql OR ext:db OR ext:bak)'
-                ),
-                (
-                    f"Config Files - {num_var}",
-                    f'"{num_var}" (ext:config OR ext:conf OR ext:ini)'
-                ),
-                (
-                    f"Log Files - {num_var}",
-                    f'"{num_var}" (ext:log OR ext:txt)'
-                )
-            ])
-        
-        return advanced_dorks
+        return list(self.iter_advanced_dorks(number_variations))
+
+    def iter_dorks(self, number: Union[str, NumberProfile], max_dorks_per_category: Optional[int] = None,
+                   categories: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, Iterator[Tuple[str, str]]]]:
+        """
+        Lazily stream dork categories; nothing is built until a category is consumed
+
+        Args:
+            number: Phone number (or NumberProfile) to generate dorks for
+            max_dorks_per_category: Stop each category after this many dorks (None = all)
+            categories: Category names to include, in order (default: all)
 
-    def generate_all_dorks(self, number: str) -> Dict[str, List[Tuple[str, str]]]:
+        Returns:
+            Iterator of (category, iterator of (name, query)) pairs
+        """
+        number_variations = self.clean_number_variations(number)
+        for category in (categories or self.categories):
+            dorks = getattr(self, self.categories[category])(number_variations)
+            if max_dorks_per_category:
+                dorks = itertools.islice(dorks, max_dorks_per_category)
+            yield category, dorks
+
+    def generate_all_dorks(self, number: Union[str, NumberProfile], max_dorks_per_category: Optional[int] = None) -> Dict[str, List[Tuple[str, str]]]:
         """
         Generate all types of dorks for a phone number
-        
+
         Args:
             number: Phone number to generate dorks for
-            
+            max_dorks_per_category: Limit dorks per category (applied while generating)
+
         Returns:
             Dictionary of dork categories with lists of (name, query) tuples
         """
-        number_variations = self.clean_number_variations(number)
-        
-        return {
-            "Social Media": self.generate_social_media_dorks(number_variations),
-            "Documents": self.generate_document_dorks(number_variations),
-            "Paste Sites": self.generate_pastebin_dorks(number_variations),
-            "Forums": self.generate_forum_dorks(number_variations),
-            "Business": self.generate_business_dorks(number_variations),
-            "Advanced": self.generate_advanced_dorks(number_variations)
-        }
+        return {category: list(dorks) for category, dorks in self.iter_dorks(number, max_dorks_per_category)}
+
+    def iter_search_urls(self, dorks: Union[Dict[str, Iterable[Tuple[str, str]]], Iterable[Tuple[str, Iterable[Tuple[str, str]]]]],
+                         engines: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, str, str, str]]:
+        """
+        Lazily stream search URLs, quoting each dork once for every engine
+
+        Args:
+            dorks: Dictionary of dork categories, or the iter_dorks stream
+            engines: Search engine names to include (default: all)
+
+        Returns:
+            Iterator of (engine, category, name, url), dork by dork
+        """
+        engines = list(engines) if engines else None
+        pairs = dorks.items() if isinstance(dorks, dict) else dorks
+        for category, dork_list in pairs:
+            for dork_name, dork_query in dork_list:
+                for engine, url in self.url_builder.urls(dork_query, engines):
+                    yield engine, category, dork_name, url
 
     def generate_search_urls(self, dorks: Dict[str, List[Tuple[str, str]]]) -> Dict[str, Dict[str, List[Tuple[str, str]]]]:
         """
         Generate search URLs for all dorks across all search engines
-        
+
         Args:
             dorks: Dictionary of dork categories
-            
+
         Returns:
             Nested dictionary: engine -> category -> list of (name, url)
         """
-        search_results = {}
-        
-        for engine, base_url in self.search_engines.items():
-            engine_results = {}
-            
-            for category, dork_list in dorks.items():
-                category_urls = []
-                
-                for dork_name, dork_query in dork_list:
-                    encoded_query = urllib.parse.quote(dork_query)
-                    url = base_url.format(encoded_query)
-                    category_urls.append((dork_name, url))
-                
-                engine_results[category] = category_urls
-            
-            search_results[engine] = engine_results
-        
+        search_results = {engine: {category: [] for category in dorks} for engine in self.search_engines}
+
+        for engine, category, dork_name, url in self.iter_search_urls(dorks):
+            search_results[engine][category].append((dork_name, url))
+
         return search_results
 
     def display_dorks(self, number: str, search_urls: Dict[str, Dict[str, List[Tuple[str, str]]]]) -> None:
@@ -385,61 +336,72 @@ class AdvancedDorkGenerator:
             
             print(Fore.YELLOW + "└─" + "─" * 50)
 
-    def save_dorks_to_file(self, number: str, search_urls: Dict, filename: str = None) -> None:
+    def save_dorks_to_file(self, number: str, search_urls: Dict, filename: str = None,
+                           sink: Optional[ReportSink] = None) -> None:
         """
         Save all generated dorks to a text file
         
         Args:
             number: Phone number searched
             search_urls: Generated search URLs
-            filename: Output filename
+            filename: Output filename (.jsonl/.csv pick a machine format, .gz compresses)
+            sink: Shared report sink of a batch run (filename is then ignored)
         """
         if filename is None:
             filename = f"dorks_{number.replace('+', '')}.txt"
             
-        try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(f"Advanced Dork Generation Report\n")
-                f.write(f"Phone Number: {number}\n")
-                f.write("=" * 60 + "\n\n")
+        report = {
+            'report': 'dorks',
+            'target': number,
+            'search_urls': search_urls,
+        }
+        
+        def write_text(f):
+            f.write(f"Advanced Dork Generation Report\n")
+            f.write(f"Phone Number: {number}\n")
+            f.write("=" * 60 + "\n\n")
+            
+            for engine, categories in search_urls.items():
+                f.write(f"{engine} SEARCH ENGINE:\n")
+                f.write("-" * 40 + "\n")
                 
-                for engine, categories in search_urls.items():
-                    f.write(f"{engine} SEARCH ENGINE:\n")
-                    f.write("-" * 40 + "\n")
-                    
-                    for category, dorks in categories.items():
-                        f.write(f"\n{category}:\n")
-                        for dork_name, url in dorks:
-                            f.write(f"  • {dork_name}\n")
-                            f.write(f"    {url}\n")
-                            f.write(f"\n")
-                    f.write("\n" + "="*60 + "\n\n")
+                for category, dorks in categories.items():
+                    f.write(f"\n{category}:\n")
+                    for dork_name, url in dorks:
+                        f.write(f"  • {dork_name}\n")
+                        f.write(f"    {url}\n")
+                        f.write(f"\n")
+                f.write("\n" + "="*60 + "\n\n")
+        
+        try:
+            with report_sink(sink, filename) as out:
+                out.write(report, write_text)
             
-            print(Fore.GREEN + f"[💾] Dorks saved to: {filename}")
+            if sink is None:
+                print(Fore.GREEN + f"[💾] Dorks saved to: {filename}")
         except Exception as e:
             print(Fore.RED + f"[❌] Error saving dorks: {e}")
 
-    def generate_dorks(self, number: str, save_output: bool = False, max_dorks_per_category: int = 5) -> Dict:
+    def generate_dorks(self, number: Union[str, NumberProfile], save_output: bool = False, max_dorks_per_category: int = 5,
+                       sink: Optional[ReportSink] = None) -> Dict:
         """
         Main function to generate comprehensive dorks
         
         Args:
-            number: Phone number to investigate
+            number: Phone number (or NumberProfile) to investigate
             save_output: Whether to save results to file
             max_dorks_per_category: Limit dorks per category
+            sink: Shared report sink; when given the dorks are always written to it
             
         Returns:
             Dictionary with generated search URLs
         """
+        profile = number_profile(number)
+        number = profile.raw
         print(Fore.CYAN + f"\n[🎯] Generating advanced dorks for: {number}")
         
-        # Generate all dork types
-        all_dorks = self.generate_all_dorks(number)
-        
-        # Limit dorks per category if specified
-        if max_dorks_per_category:
-            for category in all_dorks:
-                all_dorks[category] = all_dorks[category][:max_dorks_per_category]
+        # Generate dork types, stopping each category at the limit
+        all_dorks = self.generate_all_dorks(profile, max_dorks_per_category)
         
         # Generate search URLs
         search_urls = self.generate_search_urls(all_dorks)
@@ -448,8 +410,8 @@ class AdvancedDorkGenerator:
         self.display_dorks(number, search_urls)
         
         # Save to file if requested
-        if save_output:
-            self.save_dorks_to_file(number, search_urls)
+        if save_output or sink is not None:
+            self.save_dorks_to_file(number, search_urls, sink=sink)
         
         print(Fore.RED + "\n[!] LEGAL DISCLAIMER: Use these dorks responsibly and ethically.")
         print(Fore.RED + "    Respect robots.txt, terms of service, and applicable laws.")
@@ -480,7 +442,7 @@ def generate_dorks(number: str) -> List[str]:
         f'"{number}"'
     ]
     
-    return [f"https://www.google.com/search?q={urllib.parse.quote(dork)}" for dork in basic_dorks]
+    return [generator.url_builder.url("Google", dork) for dork in basic_dorks]
 
 
 # Example usage and testing
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Result Records
+Description: Typed, slot-based result records returned by every scan stage
+Version: 4.0.0
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List
+
+
+def _plain(value: Any) -> Any:
+    """Convert a field value into JSON/CSV friendly data"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, set)):
+        return [_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _plain(item) for key, item in value.items()}
+    return value
+
+
+class Record:
+    """
+    Base class for scan results.
+
+    Subclasses declare their fields in __slots__; unset fields default to None.
+    Records also support read-only mapping access (record['field']) so callers
+    that used the old dictionary results keep working.
+    """
+    __slots__ = ()
+    kind = "record"
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.pop(name, None))
+        if fields:
+            raise TypeError(f"{type(self).__name__} got unexpected fields: {', '.join(fields)}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the record as plain data, tagged with its record type"""
+        data = {'record': self.kind}
+        for name in self.__slots__:
+            data[name] = _plain(getattr(self, name))
+        return data
+
+    # Mapping-style access for backward compatibility with dict results
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def keys(self) -> List[str]:
+        return list(self.__slots__)
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in self.__slots__]
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self.items() == other.items()
+
+    # Records are mutable, like the dicts they replaced, so they are not hashable
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class PhoneIntel(Record):
+    """Basic phone number intelligence (formats, location, carrier, type)"""
+    __slots__ = ('target', 'e164', 'international', 'national', 'country', 'region',
+                 'carrier', 'timezones', 'valid', 'possible', 'number_type')
+    kind = "phone_intel"
+
+
+class SpamResult(Record):
+    """Reputation status reported by one spam database"""
+    __slots__ = ('target', 'source', 'status')
+    kind = "spam_result"
+
+
+class SocialResult(Record):
+    """Profile probe result for one social platform"""
+    __slots__ = ('target', 'platform', 'url', 'status')
+    kind = "social_result"
+
+
+class ProbeError(Record):
+    """A network probe that raised instead of returning its result record"""
+    __slots__ = ('target', 'probe', 'error')
+    kind = "probe_error"
+
+
+class BreachResult(Record):
+    """Breach check outcome for an email address"""
+    __slots__ = ('target', 'status', 'count', 'breaches')
+    kind = "breach_result"
+
+
+class WhoisRecord(Record):
+    """Structured WHOIS data for a domain"""
+    __slots__ = ('domain', 'domain_name', 'registrar', 'whois_server',
+                 'creation_date', 'expiration_date', 'updated_date',
+                 'registrant_name', 'registrant_organization', 'registrant_country',
+                 'registrant_email', 'name_servers', 'status', 'dnssec',
+                 'age_days', 'expires_in_days', 'raw_data', 'lookup_timestamp', 'error')
+    kind = "whois"
+
+    @classmethod
+    def from_whois_info(cls, domain: str, whois_info: Dict[str, Any]) -> "WhoisRecord":
+        """
+        Build a record from AdvancedWHOISLookup.format_whois_data output
+
+        Args:
+            domain: Looked-up domain
+            whois_info: Formatted WHOIS dictionary
+
+        Returns:
+            WhoisRecord instance
+        """
+        fields = {name: whois_info.get(name) for name in cls.__slots__ if name in whois_info}
+        fields['domain'] = domain
+        return cls(**fields)
+
+
+class SpamCheckReport(Record):
+    """Full output of AdvancedSpamChecker.spam_check"""
+    __slots__ = ('number', 'sources', 'patterns', 'search_terms')
+    kind = "spam_check"
+
+
+class TruecallerReport(Record):
+    """Full output of AdvancedTruecallerLookup.truecaller_lookup"""
+    __slots__ = ('number', 'truecaller_links', 'api_results', 'search_dorks', 'alternative_sites')
+    kind = "truecaller"
+
+
+class ScanSummary(Record):
+    """Closing summary of a scan"""
+    __slots__ = ('case_id', 'target', 'target_type', 'analysis', 'status')
+    kind = "scan_summary"
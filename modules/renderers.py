@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Result Renderers
+Description: Terminal and machine-readable (JSON/JSONL/CSV) output for scan records
+Version: 4.0.0
+"""
+
+import csv
+import json
+import sys
+from itertools import groupby
+from typing import Iterable, List, Optional, Union
+
+from modules.records import Record
+from utils.lazy_import import LazyModule, LazyAttribute
+
+# Colour support is only loaded when terminal output is actually rendered
+colorama = LazyModule('colorama', on_load=lambda module: module.init(autoreset=True))
+Fore = LazyAttribute(colorama, 'Fore')
+Style = LazyAttribute(colorama, 'Style')
+
+OUTPUT_FORMATS = ["text", "json", "jsonl", "csv"]
+
+
+class Renderer:
+    """Base renderer: receives status messages and result records"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def status(self, module: str, message: str, status: str = "INFO") -> None:
+        """Report progress; machine formats only surface problems, on stderr"""
+        if status in ("ERROR", "WARNING"):
+            print(f"[{status}] [{module}] {message}", file=sys.stderr)
+
+    def render(self, records: Union[Record, Iterable[Record]]) -> None:
+        """Render a record or a list of records"""
+        if isinstance(records, Record):
+            records = [records]
+        for record in records:
+            self.emit(record)
+
+    def emit(self, record: Record) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Flush any buffered output"""
+        self.stream.flush()
+
+
+class TerminalRenderer(Renderer):
+    """Coloured, human-oriented output (the classic NumIntense look)"""
+
+    STATUS_COLORS = {
+        "SUCCESS": "GREEN",
+        "ERROR": "RED",
+        "WARNING": "YELLOW",
+        "INFO": "CYAN",
+        "PROCESSING": "BLUE"
+    }
+
+    STATUS_ICONS = {
+        "SUCCESS": "✅",
+        "ERROR": "❌",
+        "WARNING": "⚠️",
+        "INFO": "🔹",
+        "PROCESSING": "🔄"
+    }
+
+    NUMBER_TYPE_LABELS = {
+        "MOBILE": "📱 Mobile",
+        "FIXED_LINE": "🏠 Fixed Line",
+        "FIXED_LINE_OR_MOBILE": "📞 Fixed Line or Mobile",
+        "TOLL_FREE": "🆓 Toll Free",
+        "PREMIUM_RATE": "💎 Premium Rate",
+        "VOIP": "🌐 VOIP",
+        "UNKNOWN": "❓ Unknown"
+    }
+
+    SOCIAL_ICONS = {
+        "Facebook": "📘",
+        "Telegram": "📱"
+    }
+
+    def status(self, module: str, message: str, status: str = "INFO") -> None:
+        color = getattr(Fore, self.STATUS_COLORS.get(status, "WHITE"))
+        icon = self.STATUS_ICONS.get(status, "🔹")
+        print(f"{color}{icon} [{module}] {message}", file=self.stream)
+
+    def render(self, records: Union[Record, Iterable[Record]]) -> None:
+        if isinstance(records, Record):
+            records = [records]
+        # Consecutive records of one kind share a section header
+        for kind, group in groupby(records, key=lambda record: record.kind):
+            handler = getattr(self, f"_render_{kind}", None)
+            group = list(group)
+            if handler is None:
+                for record in group:
+                    self._render_generic(record)
+            else:
+                handler(group)
+
+    def emit(self, record: Record) -> None:
+        self.render([record])
+
+    def _print(self, text: str = "") -> None:
+        print(text, file=self.stream)
+
+    def _render_generic(self, record: Record) -> None:
+        self._print(Fore.CYAN + f"\n    [{record.kind}]")
+        for name, value in record.items():
+            if value is not None:
+                self._print(f"    {Fore.WHITE}{name}: {Fore.CYAN}{value}")
+
+    def _render_phone_intel(self, records: List[Record]) -> None:
+        for intel in records:
+            self._print(Fore.CYAN + Style.BRIGHT + "\n    📊 BASIC INTELLIGENCE REPORT")
+            self._print(Fore.CYAN + "    " + "─" * 50)
+
+            self._print(f"    📱 {Fore.WHITE}Number: {Fore.GREEN}{intel.international}")
+            self._print(f"    🔢 {Fore.WHITE}E164 Format: {Fore.YELLOW}{intel.e164}")
+            self._print(f"    🏠 {Fore.WHITE}National Format: {Fore.YELLOW}{intel.national}")
+
+            self._print(f"    🌍 {Fore.WHITE}Country: {Fore.CYAN}{intel.country} ({intel.region})")
+            self._print(f"    🏢 {Fore.WHITE}Carrier: {Fore.CYAN}{intel.carrier}")
+
+            if intel.timezones:
+                self._print(f"    🕐 {Fore.WHITE}Timezone(s): {Fore.CYAN}{', '.join(intel.timezones)}")
+
+            valid_status = "✅ Valid" if intel.valid else "❌ Invalid"
+            possible_status = "✅ Possible" if intel.possible else "❌ Not Possible"
+
+            self._print(f"    ✅ {Fore.WHITE}Validation: {Fore.GREEN if intel.valid else Fore.RED}{valid_status}")
+            self._print(f"    🔍 {Fore.WHITE}Possibility: {Fore.GREEN if intel.possible else Fore.RED}{possible_status}")
+
+            number_type_str = self.NUMBER_TYPE_LABELS.get(intel.number_type, "❓ Unknown")
+            self._print(f"    🔧 {Fore.WHITE}Number Type: {Fore.CYAN}{number_type_str}")
+
+    def _render_spam_result(self, records: List[Record]) -> None:
+        self._print(f"\n    🚫 {Fore.WHITE}Spam Database Results:")
+        for result in records:
+            if "Available" in result.status:
+                self._print(f"       {Fore.GREEN}✅ {result.source}: {result.status}")
+            elif "No Data" in result.status:
+                self._print(f"       {Fore.YELLOW}⚠️  {result.source}: {result.status}")
+            else:
+                self._print(f"       {Fore.RED}❌ {result.source}: {result.status}")
+
+    def _render_social_result(self, records: List[Record]) -> None:
+        for result in records:
+            icon = self.SOCIAL_ICONS.get(result.platform, "🔗")
+            if result.status == "Possible Profile Found":
+                color = Fore.GREEN
+            elif result.status == "No Direct Profile":
+                color = Fore.YELLOW
+            else:
+                color = Fore.RED
+            self._print(f"    {icon} {Fore.WHITE}{result.platform}: {color}{result.status}")
+
+    def _render_probe_error(self, records: List[Record]) -> None:
+        for result in records:
+            self._print(f"    {Fore.RED}❌ {result.probe}: {result.error}")
+
+    def _render_breach_result(self, records: List[Record]) -> None:
+        for result in records:
+            if result.status == "breached":
+                self._print(f"    🔥 {Fore.WHITE}Breaches Found: {Fore.RED}{result.count}")
+                for breach in (result.breaches or [])[:3]:  # Show first 3 breaches
+                    self._print(f"       {Fore.YELLOW}• {breach.get('Name', 'Unknown')} - {breach.get('BreachDate', 'Unknown')}")
+            elif result.status == "clean":
+                self._print(f"    ✅ {Fore.WHITE}Breaches: {Fore.GREEN}No breaches found")
+            elif result.status == "unknown":
+                self._print(f"    ℹ️  {Fore.WHITE}Breaches: {Fore.YELLOW}Check manually at hibp.com")
+            else:
+                self._print(f"    ❌ {Fore.WHITE}Breaches: {Fore.RED}Check failed - visit hibp.com")
+
+    def _render_whois(self, records: List[Record]) -> None:
+        for record in records:
+            if record.error:
+                continue  # Errors are reported through status()
+
+            self._print(f"    🌐 {Fore.WHITE}Domain: {Fore.GREEN}{record.domain_name}")
+            self._print(f"    🏢 {Fore.WHITE}Registrar: {Fore.CYAN}{record.registrar}")
+
+            if record.age_days is not None:
+                self._print(f"    📅 {Fore.WHITE}Age: {Fore.CYAN}{record.age_days} days")
+
+            if record.expires_in_days is not None:
+                status_color = Fore.GREEN if record.expires_in_days > 30 else Fore.RED
+                self._print(f"    ⏳ {Fore.WHITE}Expires in: {status_color}{record.expires_in_days} days")
+
+            if record.name_servers:
+                self._print(f"    🔧 {Fore.WHITE}Name Servers: {Fore.CYAN}{len(record.name_servers)} found")
+
+    def _render_scan_summary(self, records: List[Record]) -> None:
+        labels = {
+            "phone": ("Phone Number", "📞", "Number"),
+            "email": ("Email Address", "📧", "Email"),
+            "domain": ("Domain", "🌐", "Domain"),
+        }
+        for summary in records:
+            self._print(Fore.CYAN + Style.BRIGHT + "\n    📈 INTELLIGENCE SUMMARY")
+            self._print(Fore.CYAN + "    " + "─" * 50)
+
+            if summary.target_type in labels:
+                type_label, icon, target_label = labels[summary.target_type]
+                self._print(f"    🎯 {Fore.WHITE}Target Type: {Fore.GREEN}{type_label}")
+                self._print(f"    {icon} {Fore.WHITE}{target_label}: {Fore.CYAN}{summary.target}")
+                self._print(f"    🔍 {Fore.WHITE}Analysis: {Fore.YELLOW}{summary.analysis}")
+
+            self._print(f"    ⚡ {Fore.WHITE}Status: {Fore.GREEN}{summary.status}")
+            self._print(f"    📋 {Fore.WHITE}Report ID: {Fore.CYAN}{summary.case_id}")
+
+
+class JSONLRenderer(Renderer):
+    """One JSON object per record, written as soon as the record is produced"""
+
+    def __init__(self, stream=None, case_id: Optional[str] = None):
+        super().__init__(stream)
+        self.case_id = case_id
+
+    def emit(self, record: Record) -> None:
+        data = record.to_dict()
+        data['case_id'] = self.case_id
+        self.stream.write(json.dumps(data, ensure_ascii=False, default=str) + "\n")
+
+
+class JSONRenderer(Renderer):
+    """A single JSON document holding every record of the run"""
+
+    def __init__(self, stream=None, case_id: Optional[str] = None):
+        super().__init__(stream)
+        self.case_id = case_id
+        self.records = []
+
+    def emit(self, record: Record) -> None:
+        self.records.append(record.to_dict())
+
+    def close(self) -> None:
+        document = {'case_id': self.case_id, 'records': self.records}
+        json.dump(document, self.stream, ensure_ascii=False, indent=2, default=str)
+        self.stream.write("\n")
+        super().close()
+
+
+class CSVRenderer(Renderer):
+    """Long-format CSV (case_id, record, field, value) so mixed record types share one header"""
+
+    FIELDNAMES = ['case_id', 'record', 'field', 'value']
+
+    def __init__(self, stream=None, case_id: Optional[str] = None):
+        super().__init__(stream)
+        self.case_id = case_id
+        self.writer = csv.writer(self.stream)
+        self.writer.writerow(self.FIELDNAMES)
+
+    def emit(self, record: Record) -> None:
+        data = record.to_dict()
+        kind = data.pop('record')
+        for field, value in data.items():
+            if isinstance(value, list) and all(not isinstance(item, (dict, list)) for item in value):
+                value = "|".join("" if item is None else str(item) for item in value)
+            elif isinstance(value, (dict, list)):
+                value = json.dumps(value, ensure_ascii=False, default=str)
+            self.writer.writerow([self.case_id, kind, field, "" if value is None else value])
+
+
+def get_renderer(output_format: str = "text", stream=None, case_id: Optional[str] = None) -> Renderer:
+    """
+    Create a renderer for the requested output format
+
+    Args:
+        output_format: One of OUTPUT_FORMATS
+        stream: Output stream (defaults to stdout)
+        case_id: Case ID embedded in machine-readable output
+
+    Returns:
+        Renderer instance
+    """
+    if output_format == "text":
+        return TerminalRenderer(stream)
+    if output_format == "jsonl":
+        return JSONLRenderer(stream, case_id=case_id)
+    if output_format == "json":
+        return JSONRenderer(stream, case_id=case_id)
+    if output_format == "csv":
+        return CSVRenderer(stream, case_id=case_id)
+    raise ValueError(f"Unknown output format: {output_format}")
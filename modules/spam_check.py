@@ -1,20 +1,58 @@
-import urllib.parse
 from colorama import Fore, Style, init
-from typing import List, Dict, Tuple
-import requests
-import time
+from typing import List, Dict, Tuple, Optional, Union
 import re
+import time
+import unicodedata
+from contextlib import nullcontext
+from modules.records import SpamCheckReport
+from utils.transport import HTTPTransport, get_transport
+from utils.spam_rules import SpamRuleEngine, get_rule_engine, split_number
+from utils.prefix_index import PrefixIndex, get_prefix_index
+from utils.report_sink import ReportSink, report_sink
+from utils.number_profile import NumberProfile, number_profile
+from utils.url_builder import URLBuilder
 
 # Initialize colorama
 init(autoreset=True)
 
+SEARCH_URLS = URLBuilder(["Google", "Bing", "DuckDuckGo"],
+                         templates={"DuckDuckGo": "https://duckduckgo.com/?q={}"})
+
+# Vectorized heuristics evaluated by AdvancedSpamChecker.score_batch
+BATCH_FEATURES = ['repeating_digits', 'sequential_run', 'zero_block', 'repeated_ending']
+BATCH_WEIGHTS = [0.35, 0.25, 0.2, 0.2]
+DIGIT_WIDTH = 15  # E.164 numbers have at most 15 digits
+DIGIT_PAD = 255   # Marks unused (left-padding) cells in a digit matrix
+
+_NON_DIGITS = re.compile(r'\D')
+
+
+def ascii_digits(number: str) -> str:
+    """Decimal digits of a number as ASCII ('+٩١ 98' -> '9198'); everything else is dropped"""
+    digits = _NON_DIGITS.sub('', number)
+    if not digits.isascii():
+        # \d also matches other scripts' decimal digits (Arabic-Indic, Devanagari, fullwidth...)
+        digits = "".join(str(unicodedata.decimal(ch)) for ch in digits)
+    return digits
+
 class AdvancedSpamChecker:
-    def __init__(self, user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"):
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': user_agent})
-        self.rate_limit_delay = 2  # seconds between requests
+    def __init__(self, user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+                 verbose: bool = True, transport: Optional[HTTPTransport] = None,
+                 rule_engine: Optional[SpamRuleEngine] = None, default_region: Optional[str] = None,
+                 prefix_index: Optional[PrefixIndex] = None):
+        self.transport = transport or get_transport()
+        self.session = self.transport.client(headers={'User-Agent': user_agent})
+        self.verbose = verbose  # False skips all terminal rendering
+        self.rule_engine = rule_engine or get_rule_engine()
+        self.prefix_index = prefix_index or get_prefix_index()
+        self.default_region = default_region  # Region assumed for numbers without '+' (None = tool default)
 
-    def generate_spam_sources(self, number: str) -> Dict[str, List[Tuple[str, str]]]:
+    def _print(self, message: str) -> None:
+        """Print only when terminal output is enabled"""
+        if self.verbose:
+            print(message)
+
+    def generate_spam_sources(self, number: Union[str, NumberProfile]) -> Dict[str, List[Tuple[str, str]]]:
         """
         Generate comprehensive spam check sources
         
@@ -25,8 +63,9 @@ class AdvancedSpamChecker:
             Dictionary of spam source categories with lists of (name, url) tuples
         """
         # Clean number for different formats
-        clean_number = number.replace('+', '').replace(' ', '').replace('-', '').replace('(', '').replace(')', '')
-        international_number = number if number.startswith('+') else f'+{number}'
+        profile = number_profile(number, self.default_region)
+        clean_number = profile.digits
+        international_number = profile.e164
         
         categories = {
             "International Spam Databases": [
@@ -89,7 +128,7 @@ class AdvancedSpamChecker:
         
         return categories
 
-    def check_local_spam_patterns(self, number: str) -> List[str]:
+    def check_local_spam_patterns(self, number: Union[str, NumberProfile]) -> List[str]:
         """
         Analyze number for common spam patterns
         
@@ -99,39 +138,134 @@ class AdvancedSpamChecker:
         Returns:
             List of detected patterns
         """
-        patterns = []
-        clean_number = re.sub(r'[^\d+]', '', number)
-        
-        # Common spam number patterns
-        spam_patterns = [
-            (r'^\+?1?(\d{3})\1{2,}\d{4}$', 'Repeating digits pattern'),
-            (r'^\+?1?(800|888|877|866|855|844|833)\d{7}$', 'Toll-free number'),
-            (r'^\+?1?(900)\d{7}$', 'Premium rate number'),
-            (r'^\+?1?(\d{3})000\d{4}$', 'Sequential zeros pattern'),
-            (r'^\+?1?(\d{3})111\d{4}$', 'Sequential ones pattern'),
-            (r'^\+?1?(\d{3})123\d{4}$', 'Sequential digits pattern'),
-            (r'^\+?1?(\d{3})555\d{4}$', 'Common TV/Movie pattern'),
-            (r'^\+?1?(\d{3})(\d{3})\2$', 'Repeated ending pattern')
-        ]
+        return [description for _, description in self._match_patterns(number)]
+
+    def _match_patterns(self, number: Union[str, NumberProfile]) -> List[Tuple[str, str]]:
+        """(rule_id, description) from the country rule pack and the risk prefix index"""
+        if isinstance(number, NumberProfile):
+            calling_code, national_number = number.country_code, number.national_number
+        else:
+            calling_code, national_number = split_number(number, self.default_region)
+        matches = self.rule_engine.match(calling_code, national_number)
+        if calling_code is not None:
+            matches.extend((entry.rule_id, entry.description)
+                           for entry in self.prefix_index.lookup(f"{calling_code}{national_number}"))
+        return matches
+
+    def match_rule_ids(self, number: Union[str, NumberProfile]) -> List[str]:
+        """
+        IDs of every spam rule matching a number (single regex pass)
+        
+        Args:
+            number: Phone number to analyze
+            
+        Returns:
+            List of rule IDs (data/spam_rules.json) and risk prefix IDs (data/risk_prefixes.json)
+        """
+        return [rule_id for rule_id, _ in self._match_patterns(number)]
+
+    @staticmethod
+    def digit_matrix(numbers: List[str], width: int = DIGIT_WIDTH):
+        """
+        Load numbers into a right-aligned, fixed-width uint8 digit matrix
         
-        for pattern, description in spam_patterns:
-            if re.match(pattern, clean_number):
-                patterns.append(description)
+        Args:
+            numbers: Raw phone numbers (formatting characters are ignored)
+            width: Columns kept per number (the last `width` digits)
+            
+        Returns:
+            numpy uint8 array of shape (len(numbers), width); DIGIT_PAD marks padding
+        """
+        import numpy as np
         
-        # Area code analysis
-        suspicious_area_codes = [
-            '268', '284', '664', '649', '767', '809', '829', '849',  # Caribbean premium
-            '876', '868', '284', '340', '670', '671', '684', '787',  # Caribbean
-            '900', '976'  # Premium rate
-        ]
+        # '/' is one below '0', so it wraps to 255 (DIGIT_PAD) after subtracting '0'
+        padded = "".join(ascii_digits(number)[-width:].rjust(width, '/') for number in numbers)
+        digits = np.frombuffer(padded.encode('ascii'), dtype=np.uint8).reshape(-1, width)
+        return digits - np.uint8(48)
+
+    @staticmethod
+    def _has_run(mask, length: int):
+        """Rows of a boolean matrix containing at least `length` consecutive True cells"""
+        import numpy as np
+        
+        rows, cols = mask.shape
+        if length > cols:
+            return np.zeros(rows, dtype=bool)
+        counts = np.zeros((rows, cols + 1), dtype=np.int16)
+        np.cumsum(mask, axis=1, dtype=np.int16, out=counts[:, 1:])
+        return ((counts[:, length:] - counts[:, :-length]) == length).any(axis=1)
+
+    def score_batch(self, numbers: List[str]):
+        """
+        Vectorized spam heuristics for large batches of caller IDs
         
-        area_code = clean_number[-10:-7] if len(clean_number) >= 10 else None
-        if area_code in suspicious_area_codes:
-            patterns.append(f"Suspicious area code: {area_code}")
+        Features (columns, see BATCH_FEATURES):
+            repeating_digits - a run of 7+ identical digits
+            sequential_run   - a run of 7+ ascending digits (e.g. 1234567)
+            zero_block       - 3+ consecutive zeros within the last 7 digits
+            repeated_ending  - the last 3 digits repeat the 3 before them
         
-        return patterns
+        Args:
+            numbers: Raw phone numbers
+            
+        Returns:
+            (features, scores): boolean matrix of shape (n, len(BATCH_FEATURES))
+            and a float32 score in [0, 1] per number (BATCH_WEIGHTS-weighted)
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("score_batch requires numpy (pip install numpy)")
+        
+        digits = self.digit_matrix(numbers)
+        valid = digits != DIGIT_PAD
+        pairs = valid[:, 1:] & valid[:, :-1]
+        
+        same = (digits[:, 1:] == digits[:, :-1]) & pairs
+        step = ((digits[:, 1:].astype(np.int16) - digits[:, :-1]) == 1) & pairs
+        zeros = digits[:, -7:] == 0
+        
+        features = np.column_stack([
+            self._has_run(same, 6),
+            self._has_run(step, 6),
+            self._has_run(zeros, 3),
+            (digits[:, -3:] == digits[:, -6:-3]).all(axis=1) & valid[:, -6:].all(axis=1),
+        ])
+        scores = features.astype(np.float32) @ np.asarray(BATCH_WEIGHTS, dtype=np.float32)
+        return features, scores
+
+    @staticmethod
+    def score_number(number: str, width: int = DIGIT_WIDTH) -> Tuple[List[bool], float]:
+        """
+        The score_batch heuristics for a single number, without numpy
+        
+        Args:
+            number: Raw phone number
+            width: Digits considered (the last `width`, as in digit_matrix)
+            
+        Returns:
+            (features, score): one flag per BATCH_FEATURES entry and the weighted score
+        """
+        digits = [int(ch) for ch in ascii_digits(number)[-width:]]
+        
+        def has_run(flags: List[bool], length: int) -> bool:
+            run = 0
+            for flag in flags:
+                run = run + 1 if flag else 0
+                if run >= length:
+                    return True
+            return False
+        
+        pairs = list(zip(digits, digits[1:]))
+        features = [
+            has_run([a == b for a, b in pairs], 6),
+            has_run([b - a == 1 for a, b in pairs], 6),
+            has_run([d == 0 for d in digits[-7:]], 3),
+            len(digits) >= 6 and digits[-3:] == digits[-6:-3],
+        ]
+        return features, sum(weight for flag, weight in zip(features, BATCH_WEIGHTS) if flag)
 
-    def generate_spam_search_terms(self, number: str) -> List[Tuple[str, str]]:
+    def generate_spam_search_terms(self, number: Union[str, NumberProfile]) -> List[Tuple[str, str]]:
         """
         Generate comprehensive spam search terms
         
@@ -141,7 +275,7 @@ class AdvancedSpamChecker:
         Returns:
             List of (search_type, search_url) tuples
         """
-        clean_number = number.replace('+', '').replace(' ', '')
+        clean_number = number_profile(number, self.default_region).digits
         
         search_terms = [
             ("Basic Spam Report", f"\"{clean_number}\" spam"),
@@ -164,16 +298,7 @@ class AdvancedSpamChecker:
         # Generate search URLs
         search_urls = []
         for term_type, search_term in search_terms:
-            encoded_term = urllib.parse.quote(search_term)
-            google_url = f"https://www.google.com/search?q={encoded_term}"
-            bing_url = f"https://www.bing.com/search?q={encoded_term}"
-            duckduckgo_url = f"https://duckduckgo.com/?q={encoded_term}"
-            
-            search_urls.extend([
-                (f"Google - {term_type}", google_url),
-                (f"Bing - {term_type}", bing_url),
-                (f"DuckDuckGo - {term_type}", duckduckgo_url)
-            ])
+            search_urls.extend((f"{engine} - {term_type}", url) for engine, url in SEARCH_URLS.urls(search_term))
         
         return search_urls
 
@@ -245,7 +370,8 @@ class AdvancedSpamChecker:
                 print(Fore.WHITE + f"      {url}")
 
     def save_spam_report(self, number: str, spam_sources: Dict, patterns: List[str], 
-                        search_terms: List[Tuple[str, str]], filename: str = None) -> None:
+                        search_terms: List[Tuple[str, str]], filename: str = None,
+                        sink: Optional[ReportSink] = None) -> None:
         """
         Save comprehensive spam report to file
         
@@ -254,51 +380,66 @@ class AdvancedSpamChecker:
             spam_sources: Dictionary of spam sources
             patterns: List of detected patterns
             search_terms: List of search terms
-            filename: Output filename
+            filename: Output filename (.jsonl/.csv pick a machine format, .gz compresses)
+            sink: Shared report sink of a batch run (filename is then ignored)
         """
         if filename is None:
             filename = f"spam_report_{number.replace('+', '')}.txt"
             
+        report = {
+            'report': 'spam',
+            'target': number,
+            'generated': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'patterns': patterns,
+            'sources': spam_sources,
+            'search_terms': search_terms,
+        }
+        
+        def write_text(f):
+            f.write(f"SPAM & SCAM REPORT\n")
+            f.write(f"Phone Number: {number}\n")
+            f.write(f"Generated: {report['generated']}\n")
+            f.write("=" * 60 + "\n\n")
+            
+            # Write patterns
+            f.write("DETECTED PATTERNS:\n")
+            if patterns:
+                for pattern in patterns:
+                    f.write(f"• {pattern}\n")
+            else:
+                f.write("• No obvious spam patterns detected\n")
+            f.write("\n")
+            
+            # Write spam sources
+            f.write("SPAM CHECK SOURCES:\n")
+            f.write("-" * 40 + "\n")
+            for category, sources in spam_sources.items():
+                f.write(f"\n{category}:\n")
+                for source_name, url in sources:
+                    f.write(f"  • {source_name}: {url}\n")
+            
+            # Write search terms
+            f.write("\n\nSEARCH TERMS:\n")
+            f.write("-" * 40 + "\n")
+            for term_name, url in search_terms:
+                f.write(f"  • {term_name}: {url}\n")
+            
+            # Legal disclaimer
+            f.write("\n\nLEGAL DISCLAIMER:\n")
+            f.write("This report is for informational purposes only. Use the information responsibly.\n")
+            f.write("Respect privacy laws and terms of service of the listed platforms.\n")
+        
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(f"SPAM & SCAM REPORT\n")
-                f.write(f"Phone Number: {number}\n")
-                f.write(f"Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write("=" * 60 + "\n\n")
-                
-                # Write patterns
-                f.write("DETECTED PATTERNS:\n")
-                if patterns:
-                    for pattern in patterns:
-                        f.write(f"• {pattern}\n")
-                else:
-                    f.write("• No obvious spam patterns detected\n")
-                f.write("\n")
-                
-                # Write spam sources
-                f.write("SPAM CHECK SOURCES:\n")
-                f.write("-" * 40 + "\n")
-                for category, sources in spam_sources.items():
-                    f.write(f"\n{category}:\n")
-                    for source_name, url in sources:
-                        f.write(f"  • {source_name}: {url}\n")
-                
-                # Write search terms
-                f.write("\n\nSEARCH TERMS:\n")
-                f.write("-" * 40 + "\n")
-                for term_name, url in search_terms:
-                    f.write(f"  • {term_name}: {url}\n")
-                
-                # Legal disclaimer
-                f.write("\n\nLEGAL DISCLAIMER:\n")
-                f.write("This report is for informational purposes only. Use the information responsibly.\n")
-                f.write("Respect privacy laws and terms of service of the listed platforms.\n")
+            with report_sink(sink, filename) as out:
+                out.write(report, write_text)
             
-            print(Fore.GREEN + f"[💾] Spam report saved to: {filename}")
+            if sink is None:
+                print(Fore.GREEN + f"[💾] Spam report saved to: {filename}")
         except Exception as e:
             print(Fore.RED + f"[❌] Error saving spam report: {e}")
 
-    def spam_check(self, number: str, save_report: bool = False, check_patterns: bool = True) -> Dict:
+    def spam_check(self, number: Union[str, NumberProfile], save_report: bool = False, check_patterns: bool = True,
+                   sink: Optional[ReportSink] = None) -> SpamCheckReport:
         """
         Comprehensive spam check function
         
@@ -306,65 +447,79 @@ class AdvancedSpamChecker:
             number: Phone number to check
             save_report: Whether to save report to file
             check_patterns: Whether to analyze number patterns
+            sink: Shared report sink; when given the report is always written to it
             
         Returns:
-            Dictionary with all generated data
+            SpamCheckReport record (also readable as a dictionary)
         """
-        print(Fore.RED + f"\n[🚫] Starting comprehensive spam check for: {number}")
+        # Parse once; sources, patterns and search terms share the profile
+        profile = number_profile(number, self.default_region)
+        number = profile.raw
+        
+        self._print(Fore.RED + f"\n[🚫] Starting comprehensive spam check for: {number}")
         
         # Generate spam sources
-        spam_sources = self.generate_spam_sources(number)
+        spam_sources = self.generate_spam_sources(profile)
         
         # Check for spam patterns
         patterns = []
         if check_patterns:
-            patterns = self.check_local_spam_patterns(number)
+            patterns = self.check_local_spam_patterns(profile)
         
         # Generate search terms
-        search_terms = self.generate_spam_search_terms(number)
+        search_terms = self.generate_spam_search_terms(profile)
         
         # Display results
-        self.display_spam_sources(number, spam_sources)
-        
-        if check_patterns:
-            self.display_spam_patterns(number, patterns)
-        
-        self.display_search_terms(search_terms)
+        if self.verbose:
+            self.display_spam_sources(number, spam_sources)
+            
+            if check_patterns:
+                self.display_spam_patterns(number, patterns)
+            
+            self.display_search_terms(search_terms)
         
         # Save report if requested
-        if save_report:
-            self.save_spam_report(number, spam_sources, patterns, search_terms)
+        if save_report or sink is not None:
+            self.save_spam_report(number, spam_sources, patterns, search_terms, sink=sink)
         
         # Legal disclaimer
-        print(Fore.RED + "\n" + "="*80)
-        print(Fore.RED + "[!] LEGAL DISCLAIMER:")
-        print(Fore.RED + "    This tool aggregates publicly available spam reporting sources.")
-        print(Fore.RED + "    Use this information responsibly and respect privacy laws.")
-        print(Fore.RED + "    Always verify information from multiple sources.")
-        
-        return {
-            'sources': spam_sources,
-            'patterns': patterns,
-            'search_terms': search_terms
-        }
+        self._print(Fore.RED + "\n" + "="*80)
+        self._print(Fore.RED + "[!] LEGAL DISCLAIMER:")
+        self._print(Fore.RED + "    This tool aggregates publicly available spam reporting sources.")
+        self._print(Fore.RED + "    Use this information responsibly and respect privacy laws.")
+        self._print(Fore.RED + "    Always verify information from multiple sources.")
+        
+        return SpamCheckReport(
+            number=number,
+            sources=spam_sources,
+            patterns=patterns,
+            search_terms=search_terms
+        )
 
-    def batch_spam_check(self, numbers: List[str], delay: float = 3.0) -> None:
+    def batch_spam_check(self, numbers: List[str], delay: Optional[float] = None,
+                         report_path: Optional[str] = None) -> List[SpamCheckReport]:
         """
         Perform spam check on multiple numbers
         
         Args:
             numbers: List of phone numbers to check
-            delay: Delay between checks in seconds
+            delay: Accepted for compatibility; these checks are local and never wait
+            report_path: Append every report to this one file (.txt/.jsonl/.csv, optionally .gz)
+            
+        Returns:
+            List of SpamCheckReport records, in input order
         """
-        print(Fore.RED + f"\n[🚫] Starting batch spam check for {len(numbers)} numbers...")
+        self._print(Fore.RED + f"\n[🚫] Starting batch spam check for {len(numbers)} numbers...")
         
-        for i, number in enumerate(numbers, 1):
-            print(Fore.YELLOW + f"\n[{i}/{len(numbers)}] Checking: {number}")
-            self.spam_check(number)
-            
-            if i < len(numbers):  # No delay after last check
-                print(Fore.YELLOW + f"[⏳] Waiting {delay} seconds...")
-                time.sleep(delay)
+        reports = []
+        with report_sink(path=report_path, append=True) if report_path else nullcontext() as sink:
+            for i, number in enumerate(numbers, 1):
+                self._print(Fore.YELLOW + f"\n[{i}/{len(numbers)}] Checking: {number}")
+                reports.append(self.spam_check(number, sink=sink))
+        
+        if report_path:
+            self._print(Fore.GREEN + f"[💾] {len(reports)} spam reports written to: {report_path}")
+        return reports
 
 
 # Simplified function for basic usage (backward compatibility)
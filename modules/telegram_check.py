@@ -1,21 +1,26 @@
-import urllib.parse
 from colorama import Fore, Style, init
-from typing import List, Dict, Tuple
-import requests
+from typing import List, Dict, Tuple, Optional, Union
 import time
+from contextlib import nullcontext
 import re
 import hashlib
+from utils.transport import HTTPTransport, get_transport
+from utils.number_profile import NumberProfile, number_profile, unique
+from utils.report_sink import ReportSink, report_sink
+from utils.url_builder import URLBuilder
 
 # Initialize colorama
 init(autoreset=True)
 
+SEARCH_URLS = URLBuilder(["Google", "Bing", "DuckDuckGo", "Yandex", "Startpage"])
+
 class AdvancedTelegramLookup:
-    def __init__(self, user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"):
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': user_agent})
-        self.rate_limit_delay = 2  # seconds between requests
+    def __init__(self, user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+                 transport: Optional[HTTPTransport] = None):
+        self.transport = transport or get_transport()
+        self.session = self.transport.client(headers={'User-Agent': user_agent})
 
-    def generate_username_variations(self, number: str) -> List[str]:
+    def generate_username_variations(self, number: Union[str, NumberProfile]) -> List[str]:
         """
         Generate multiple possible Telegram username variations
         
@@ -25,46 +30,19 @@ class AdvancedTelegramLookup:
         Returns:
             List of possible usernames
         """
-        # Clean the number
-        clean_number = number.replace('+', '').replace(' ', '').replace('-', '').replace('(', '').replace(')', '')
+        profile = number_profile(number)
+        clean_number = profile.digits  # +919876543210 -> 919876543210
         
         variations = []
         
-        # Basic variations
-        variations.extend([
-            clean_number,  # +919876543210 -> 919876543210
-            clean_number[-10:],  # Last 10 digits (without country code)
-            f"user{clean_number}",
-            f"user{clean_number[-10:]}",
-            f"id{clean_number}",
-            f"id{clean_number[-10:]}",
-            f"tg{clean_number}",
-            f"tg{clean_number[-10:]}",
-            f"telegram{clean_number}",
-            f"telegram{clean_number[-10:]}",
-        ])
-        
-        # Country-specific variations
-        if number.startswith('+91'):  # India
-            without_country = clean_number[2:]  # Remove 91
+        # Full international digits, then every local form (without country code, trunk-prefixed)
+        for form in (clean_number,) + profile.local_forms:
             variations.extend([
-                without_country,
-                f"user{without_country}",
-                f"id{without_country}",
-            ])
-        elif number.startswith('+1'):  # US/Canada
-            without_country = clean_number[1:]  # Remove 1
-            variations.extend([
-                without_country,
-                f"user{without_country}",
-                f"id{without_country}",
-            ])
-        elif number.startswith('+44'):  # UK
-            without_country = clean_number[2:]  # Remove 44
-            variations.extend([
-                without_country,
-                f"user{without_country}",
-                f"id{without_country}",
+                form,
+                f"user{form}",
+                f"id{form}",
+                f"tg{form}",
+                f"telegram{form}",
             ])
         
         # Hash-based variations (common pattern)
@@ -78,9 +56,8 @@ class AdvancedTelegramLookup:
             f"id{sha1_hash}",
         ])
         
-        # Remove duplicates and empty strings
-        variations = list(set([v for v in variations if v.strip()]))
-        return variations
+        # Remove duplicates and empty strings, keeping the most likely names first
+        return unique(variations)
 
     def generate_direct_links(self, username_variations: List[str]) -> List[Tuple[str, str]]:
         """
@@ -102,7 +79,7 @@ class AdvancedTelegramLookup:
         
         return links
 
-    def generate_osint_links(self, number: str) -> List[Tuple[str, str]]:
+    def generate_osint_links(self, number: Union[str, NumberProfile]) -> List[Tuple[str, str]]:
         """
         Generate OSINT and search engine links for Telegram investigation
         
@@ -112,7 +89,7 @@ class AdvancedTelegramLookup:
         Returns:
             List of (source, url) tuples
         """
-        clean_number = number.replace('+', '').replace(' ', '')
+        clean_number = number_profile(number).digits
         
         osint_sources = [
             ("Google Search", f"https://www.google.com/search?q=%22{clean_number}%22+telegram"),
@@ -135,7 +112,7 @@ class AdvancedTelegramLookup:
         
         return osint_sources
 
-    def generate_advanced_queries(self, number: str, username_variations: List[str]) -> List[Tuple[str, str]]:
+    def generate_advanced_queries(self, number: Union[str, NumberProfile], username_variations: List[str]) -> List[Tuple[str, str]]:
         """
         Generate advanced search queries for comprehensive investigation
         
@@ -146,7 +123,7 @@ class AdvancedTelegramLookup:
         Returns:
             List of (query_type, query) tuples
         """
-        clean_number = number.replace('+', '').replace(' ', '')
+        clean_number = number_profile(number).digits
         
         queries = []
         
@@ -182,7 +159,7 @@ class AdvancedTelegramLookup:
         
         return queries
 
-    def check_telegram_public_data(self, number: str) -> List[Tuple[str, str]]:
+    def check_telegram_public_data(self, number: Union[str, NumberProfile]) -> List[Tuple[str, str]]:
         """
         Check public Telegram databases and directories
         
@@ -192,7 +169,7 @@ class AdvancedTelegramLookup:
         Returns:
             List of (database, url) tuples
         """
-        clean_number = number.replace('+', '').replace(' ', '')
+        clean_number = number_profile(number).digits
         
         public_sources = [
             ("Telegram Directory", "https://t.me/directory"),
@@ -222,20 +199,10 @@ class AdvancedTelegramLookup:
         Returns:
             List of (query_type, url) tuples
         """
-        search_engines = [
-            ("Google", "https://www.google.com/search?q={}"),
-            ("Bing", "https://www.bing.com/search?q={}"),
-            ("DuckDuckGo", "https://duckduckgo.com/html/?q={}"),
-            ("Yandex", "https://yandex.com/search/?text={}"),
-            ("Startpage", "https://www.startpage.com/sp/search?query={}"),
-        ]
-        
         urls = []
         
         for query_type, query in queries:
-            for engine_name, base_url in search_engines:
-                encoded_query = urllib.parse.quote(query)
-                url = base_url.format(encoded_query)
+            for engine_name, url in SEARCH_URLS.urls(query):
                 urls.append((
                     f"{engine_name} - {query_type}",
                     url
@@ -320,7 +287,8 @@ class AdvancedTelegramLookup:
 
     def save_telegram_report(self, number: str, direct_links: List[Tuple[str, str]], 
                            osint_links: List[Tuple[str, str]], search_urls: List[Tuple[str, str]],
-                           public_sources: List[Tuple[str, str]], filename: str = None) -> None:
+                           public_sources: List[Tuple[str, str]], filename: str = None,
+                           sink: Optional[ReportSink] = None) -> None:
         """
         Save comprehensive Telegram report to file
         
@@ -330,67 +298,83 @@ class AdvancedTelegramLookup:
             osint_links: List of OSINT sources
             search_urls: List of search queries
             public_sources: List of public data sources
-            filename: Output filename
+            filename: Output filename (.jsonl/.csv pick a machine format, .gz compresses)
+            sink: Shared report sink of a batch run (filename is then ignored)
         """
         if filename is None:
             filename = f"telegram_lookup_{number.replace('+', '')}.txt"
             
+        report = {
+            'report': 'telegram',
+            'target': number,
+            'generated': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'direct_links': direct_links,
+            'osint_links': osint_links,
+            'search_urls': search_urls,
+            'public_sources': public_sources,
+        }
+        
+        def write_text(f):
+            f.write(f"TELEGRAM OSINT REPORT\n")
+            f.write(f"Phone Number: {number}\n")
+            f.write(f"Generated: {report['generated']}\n")
+            f.write("=" * 60 + "\n\n")
+            
+            # Direct links
+            f.write("DIRECT TELEGRAM PROFILE LINKS:\n")
+            f.write("-" * 40 + "\n")
+            for username, url in direct_links:
+                f.write(f"  @{username}: {url}\n")
+            f.write("\n")
+            
+            # OSINT sources
+            f.write("OSINT INVESTIGATION SOURCES:\n")
+            f.write("-" * 40 + "\n")
+            for source, url in osint_links:
+                f.write(f"  {source}: {url}\n")
+            f.write("\n")
+            
+            # Search queries
+            f.write("ADVANCED SEARCH QUERIES:\n")
+            f.write("-" * 40 + "\n")
+            for query_name, url in search_urls:
+                f.write(f"  {query_name}: {url}\n")
+            f.write("\n")
+            
+            # Public sources
+            f.write("PUBLIC TELEGRAM DATA:\n")
+            f.write("-" * 40 + "\n")
+            for source, url in public_sources:
+                f.write(f"  {source}: {url}\n")
+            f.write("\n")
+            
+            # Methodology
+            f.write("METHODOLOGY:\n")
+            f.write("-" * 40 + "\n")
+            f.write("1. Username generation based on phone number patterns\n")
+            f.write("2. Direct Telegram profile link testing\n")
+            f.write("3. Search engine OSINT queries\n")
+            f.write("4. Public Telegram directory checks\n")
+            f.write("5. Advanced Telegram OSINT techniques\n\n")
+            
+            # Legal disclaimer
+            f.write("LEGAL DISCLAIMER:\n")
+            f.write("-" * 40 + "\n")
+            f.write("This report is for educational and authorized investigations only.\n")
+            f.write("Respect Telegram's Terms of Service and applicable privacy laws.\n")
+            f.write("Unauthorized access or scraping may violate laws and platform policies.\n")
+        
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(f"TELEGRAM OSINT REPORT\n")
-                f.write(f"Phone Number: {number}\n")
-                f.write(f"Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write("=" * 60 + "\n\n")
-                
-                # Direct links
-                f.write("DIRECT TELEGRAM PROFILE LINKS:\n")
-                f.write("-" * 40 + "\n")
-                for username, url in direct_links:
-                    f.write(f"  @{username}: {url}\n")
-                f.write("\n")
-                
-                # OSINT sources
-                f.write("OSINT INVESTIGATION SOURCES:\n")
-                f.write("-" * 40 + "\n")
-                for source, url in osint_links:
-                    f.write(f"  {source}: {url}\n")
-                f.write("\n")
-                
-                # Search queries
-                f.write("ADVANCED SEARCH QUERIES:\n")
-                f.write("-" * 40 + "\n")
-                for query_name, url in search_urls:
-                    f.write(f"  {query_name}: {url}\n")
-                f.write("\n")
-                
-                # Public sources
-                f.write("PUBLIC TELEGRAM DATA:\n")
-                f.write("-" * 40 + "\n")
-                for source, url in public_sources:
-                    f.write(f"  {source}: {url}\n")
-                f.write("\n")
-                
-                # Methodology
-                f.write("METHODOLOGY:\n")
-                f.write("-" * 40 + "\n")
-                f.write("1. Username generation based on phone number patterns\n")
-                f.write("2. Direct Telegram profile link testing\n")
-                f.write("3. Search engine OSINT queries\n")
-                f.write("4. Public Telegram directory checks\n")
-                f.write("5. Advanced Telegram OSINT techniques\n\n")
-                
-                # Legal disclaimer
-                f.write("LEGAL DISCLAIMER:\n")
-                f.write("-" * 40 + "\n")
-                f.write("This report is for educational and authorized investigations only.\n")
-                f.write("Respect Telegram's Terms of Service and applicable privacy laws.\n")
-                f.write("Unauthorized access or scraping may violate laws and platform policies.\n")
+            with report_sink(sink, filename) as out:
+                out.write(report, write_text)
             
-            print(Fore.GREEN + f"[💾] Telegram report saved to: {filename}")
+            if sink is None:
+                print(Fore.GREEN + f"[💾] Telegram report saved to: {filename}")
         except Exception as e:
             print(Fore.RED + f"[❌] Error saving Telegram report: {e}")
 
-    def telegram_lookup(self, number: str, save_report: bool = False, advanced: bool = True) -> Dict:
+    def telegram_lookup(self, number: Union[str, NumberProfile], save_report: bool = False, advanced: bool = True,
+                        sink: Optional[ReportSink] = None) -> Dict:
         """
         Comprehensive Telegram lookup function
         
@@ -398,28 +382,33 @@ class AdvancedTelegramLookup:
             number: Phone number to investigate
             save_report: Whether to save report to file
             advanced: Whether to include advanced techniques
+            sink: Shared report sink; when given the report is always written to it
             
         Returns:
             Dictionary with all generated data
         """
+        # Parse once; every generator below reuses the same profile
+        profile = number_profile(number)
+        number = profile.raw
+        
         print(Fore.CYAN + f"\n[🔍] Starting comprehensive Telegram lookup for: {number}")
         
         # Generate username variations
-        username_variations = self.generate_username_variations(number)
+        username_variations = self.generate_username_variations(profile)
         print(Fore.YELLOW + f"[📊] Generated {len(username_variations)} username variations")
         
         # Generate direct links
         direct_links = self.generate_direct_links(username_variations)
         
         # Generate OSINT links
-        osint_links = self.generate_osint_links(number)
+        osint_links = self.generate_osint_links(profile)
         
         # Generate advanced queries
-        search_queries = self.generate_advanced_queries(number, username_variations)
+        search_queries = self.generate_advanced_queries(profile, username_variations)
         search_urls = self.generate_search_urls(search_queries)
         
         # Get public data sources
-        public_sources = self.check_telegram_public_data(number)
+        public_sources = self.check_telegram_public_data(profile)
         
         # Display results
         self.display_telegram_links(number, direct_links)
@@ -430,8 +419,8 @@ class AdvancedTelegramLookup:
             self.display_public_sources(public_sources)
         
         # Save report if requested
-        if save_report:
-            self.save_telegram_report(number, direct_links, osint_links, search_urls, public_sources)
+        if save_report or sink is not None:
+            self.save_telegram_report(number, direct_links, osint_links, search_urls, public_sources, sink=sink)
         
         # Legal disclaimer
         print(Fore.RED + "\n" + "="*80)
@@ -448,23 +437,25 @@ class AdvancedTelegramLookup:
             'public_sources': public_sources
         }
 
-    def batch_telegram_lookup(self, numbers: List[str], delay: float = 3.0) -> None:
+    def batch_telegram_lookup(self, numbers: List[str], delay: Optional[float] = None,
+                              report_path: Optional[str] = None) -> None:
         """
         Perform Telegram lookup on multiple numbers
         
         Args:
             numbers: List of phone numbers to check
-            delay: Delay between checks in seconds
+            delay: Accepted for compatibility; these checks are local and never wait
+            report_path: Append every report to this one file (.txt/.jsonl/.csv, optionally .gz)
         """
         print(Fore.CYAN + f"\n[🔍] Starting batch Telegram lookup for {len(numbers)} numbers...")
         
-        for i, number in enumerate(numbers, 1):
-            print(Fore.YELLOW + f"\n[{i}/{len(numbers)}] Checking: {number}")
-            self.telegram_lookup(number)
-            
-            if i < len(numbers):  # No delay after last check
-                print(Fore.YELLOW + f"[⏳] Waiting {delay} seconds...")
-                time.sleep(delay)
+        with report_sink(path=report_path, append=True) if report_path else nullcontext() as sink:
+            for i, number in enumerate(numbers, 1):
+                print(Fore.YELLOW + f"\n[{i}/{len(numbers)}] Checking: {number}")
+                self.telegram_lookup(number, sink=sink)
+        
+        if report_path:
+            print(Fore.GREEN + f"[💾] {len(numbers)} Telegram reports written to: {report_path}")
 
 
 # Simplified function for basic usage (backward compatibility)
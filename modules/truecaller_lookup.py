@@ -1,21 +1,43 @@
-import urllib.parse
 from colorama import Fore, Style, init
-from typing import List, Dict, Tuple, Optional
-import requests
+from typing import List, Dict, Tuple, Optional, Union
+import threading
 import time
+from contextlib import nullcontext
 import re
 import json
+from urllib.parse import urlparse
+from modules.records import TruecallerReport
+from utils.config import load_settings
+from utils.orchestrator import Probe, ProbeOrchestrator
+from apis.providers import PhoneProvider, ProviderRegistry, get_provider_registry
+from utils.transport import HTTPTransport, get_transport
+from utils.number_profile import NumberProfile, number_profile
+from utils.report_sink import ReportSink, report_sink
+from utils.url_builder import URLBuilder
 
 # Initialize colorama
 init(autoreset=True)
 
+SEARCH_URLS = URLBuilder(["Google", "Bing", "DuckDuckGo", "Yandex"])
+
 class AdvancedTruecallerLookup:
-    def __init__(self, user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"):
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': user_agent})
-        self.rate_limit_delay = 2  # seconds between requests
+    def __init__(self, user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+                 verbose: bool = True, transport: Optional[HTTPTransport] = None,
+                 api_quorum: Optional[int] = None, api_timeout: float = 10.0,
+                 registry: Optional[ProviderRegistry] = None):
+        self.transport = transport or get_transport()
+        self.session = self.transport.client(headers={'User-Agent': user_agent})
+        self.registry = registry or get_provider_registry()
+        self.api_quorum = int(load_settings()["api_quorum"] if api_quorum is None else api_quorum)
+        self.api_timeout = api_timeout  # Budget for the whole concurrent API fan-out
+        self.verbose = verbose  # False skips all terminal rendering
+
+    def _print(self, message: str) -> None:
+        """Print only when terminal output is enabled"""
+        if self.verbose:
+            print(message)
 
-    def generate_truecaller_links(self, number: str) -> List[Tuple[str, str]]:
+    def generate_truecaller_links(self, number: Union[str, NumberProfile]) -> List[Tuple[str, str]]:
         """
         Generate multiple Truecaller and reverse lookup links
         
@@ -25,7 +47,7 @@ class AdvancedTruecallerLookup:
         Returns:
             List of (source, url) tuples
         """
-        clean_number = number.replace('+', '').replace(' ', '').replace('-', '').replace('(', '').replace(')', '')
+        clean_number = number_profile(number).digits
         
         links = [
             ("Truecaller Search", f"https://www.truecaller.com/search/{clean_number}"),
@@ -38,7 +60,7 @@ class AdvancedTruecallerLookup:
         
         return links
 
-    def generate_search_dorks(self, number: str) -> List[Tuple[str, str]]:
+    def generate_search_dorks(self, number: Union[str, NumberProfile]) -> List[Tuple[str, str]]:
         """
         Generate comprehensive search dorks for Truecaller data
         
@@ -48,7 +70,7 @@ class AdvancedTruecallerLookup:
         Returns:
             List of (search_type, url) tuples
         """
-        clean_number = number.replace('+', '').replace(' ', '')
+        clean_number = number_profile(number).digits
         
         dorks = [
             ("Truecaller Site Search", f'site:truecaller.com "{clean_number}"'),
@@ -60,18 +82,9 @@ class AdvancedTruecallerLookup:
         ]
         
         # Generate search URLs for multiple engines
-        search_engines = [
-            ("Google", "https://www.google.com/search?q={}"),
-            ("Bing", "https://www.bing.com/search?q={}"),
-            ("DuckDuckGo", "https://duckduckgo.com/html/?q={}"),
-            ("Yandex", "https://yandex.com/search/?text={}"),
-        ]
-        
         urls = []
         for dork_type, dork_query in dorks:
-            for engine_name, base_url in search_engines:
-                encoded_query = urllib.parse.quote(dork_query)
-                url = base_url.format(encoded_query)
+            for engine_name, url in SEARCH_URLS.urls(dork_query):
                 urls.append((
                     f"{engine_name} - {dork_type}",
                     url
@@ -79,59 +92,65 @@ class AdvancedTruecallerLookup:
         
         return urls
 
-    def check_third_party_apis(self, number: str) -> List[Tuple[str, str, Optional[Dict]]]:
+    def check_third_party_apis(self, number: Union[str, NumberProfile],
+                               quorum: Optional[int] = None) -> List[Tuple[str, str, Optional[Dict]]]:
         """
         Check multiple third-party Truecaller-like APIs
         
         Args:
             number: Phone number to check
+            quorum: Stop waiting after this many APIs returned data (default: api_quorum setting, 0 = all)
             
         Returns:
             List of (api_name, api_url, response_data) tuples
         """
-        clean_number = number.replace('+', '').replace(' ', '')
-        
-        apis = [
-            {
-                "name": "Numspy API",
-                "url": f"https://api.numspy.io/v1/lookup?number={clean_number}",
-                "headers": {"User-Agent": "NumIntensePro"}
-            },
-            {
-                "name": "NumVerify",
-                "url": f"https://api.numverify.com/v1/validate?number={clean_number}",
-                "headers": {"User-Agent": "NumIntensePro"}
-            },
-            {
-                "name": "AbstractAPI",
-                "url": f"https://phonevalidation.abstractapi.com/v1/?phone={clean_number}",
-                "headers": {"User-Agent": "NumIntensePro"}
-            },
+        clean_number = number_profile(number).digits
+        
+        # Providers are queried concurrently (fastest healthy first), one request in
+        # flight each; with a quorum the slowest answers are abandoned once enough arrived
+        quorum = self.api_quorum if quorum is None else quorum
+        cancel = threading.Event()
+        probes = [
+            Probe(provider.label, self._query_api, provider, clean_number, cancel, url=provider.url,
+                  on_timeout=lambda provider=provider: (provider.label, provider.display_url(clean_number), None),
+                  on_error=lambda error, provider=provider: (provider.label, provider.display_url(clean_number),
+                                                             f"Error: {error}"))
+            for provider in self.registry.ranked(include_unavailable=True)
         ]
+        orchestrator = ProbeOrchestrator(max_workers=len(probes), per_host_limit=1, deadline=self.api_timeout)
+        results = orchestrator.run(probes, quorum=quorum or None,
+                                   accept=lambda result: isinstance(result[2], dict), cancel=cancel)
+        # Report in registration order, however the providers happen to rank today
+        order = {provider.label: index for index, provider in enumerate(self.registry.providers)}
+        return sorted(results, key=lambda result: order.get(result[0], len(order)))
+
+    def _query_api(self, provider: PhoneProvider, number: str,
+                   cancel: threading.Event) -> Tuple[str, str, Optional[Dict]]:
+        """
+        Query one registered provider
         
-        results = []
-        for api in apis:
-            try:
-                response = self.session.get(
-                    api["url"], 
-                    headers=api.get("headers", {}),
-                    timeout=10
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    results.append((api["name"], api["url"], data))
-                else:
-                    results.append((api["name"], api["url"], None))
-                    
-                time.sleep(self.rate_limit_delay)
-                
-            except Exception as e:
-                results.append((api["name"], api["url"], f"Error: {str(e)}"))
-        
-        return results
+        Args:
+            provider: Provider from the registry
+            number: Digits-only phone number
+            cancel: Set once the caller stopped waiting; the response body is then skipped
+            
+        Returns:
+            (api_name, api_url, response_data) tuple; errors are reported as 'Error: ...' strings
+        """
+        url = provider.display_url(number)
+        reason = self.registry.unavailable_reason(provider)
+        if reason:
+            return provider.label, url, f"Error: {reason}"
+        if not self.registry.healthy(provider.name):
+            return provider.label, url, "Error: Skipped, provider is failing (see registry stats)"
+        
+        data = self.registry.query(provider.name, number, cancel=cancel, headers=self.session.headers)
+        if provider.classify(data) is None:
+            error = data.get("error") if isinstance(data, dict) else None
+            return provider.label, url, f"Error: {error}" if error and error != "Cancelled" else None
+        return provider.label, url, data
 
-    def generate_alternative_lookup_sites(self, number: str) -> List[Tuple[str, str]]:
+    def generate_alternative_lookup_sites(self, number: Union[str, NumberProfile]) -> List[Tuple[str, str]]:
         """
         Generate alternative reverse phone lookup sites
         
@@ -141,7 +160,7 @@ class AdvancedTruecallerLookup:
         Returns:
             List of (site_name, url) tuples
         """
-        clean_number = number.replace('+', '').replace(' ', '')
+        clean_number = number_profile(number).digits
         
         sites = [
             ("SpyDialer", f"https://www.spydialer.com/default.aspx?phone={clean_number}"),
@@ -170,42 +189,8 @@ class AdvancedTruecallerLookup:
         Returns:
             Dictionary of parsed information
         """
-        parsed = {}
-        
-        try:
-            if api_name == "Numspy API":
-                parsed.update({
-                    "Name": data.get("name", "Not found"),
-                    "Carrier": data.get("carrier", "Not found"),
-                    "Location": data.get("location", "Not found"),
-                    "Timezone": data.get("timezone", "Not found"),
-                    "Valid": data.get("valid", "Unknown"),
-                })
-                
-            elif api_name == "NumVerify":
-                parsed.update({
-                    "Valid": data.get("valid", "Unknown"),
-                    "Number": data.get("international_format", "Not found"),
-                    "Country": data.get("country_name", "Not found"),
-                    "Location": data.get("location", "Not found"),
-                    "Carrier": data.get("carrier", "Not found"),
-                    "Line Type": data.get("line_type", "Not found"),
-                })
-                
-            elif api_name == "AbstractAPI":
-                parsed.update({
-                    "Valid": data.get("valid", "Unknown"),
-                    "Number": data.get("format", {}).get("international", "Not found"),
-                    "Country": data.get("country", {}).get("name", "Not found"),
-                    "Location": data.get("location", "Not found"),
-                    "Carrier": data.get("carrier", "Not found"),
-                    "Type": data.get("type", "Not found"),
-                })
-                
-        except Exception as e:
-            parsed["Error"] = f"Parse error: {str(e)}"
-        
-        return parsed
+        provider = self.registry.get(api_name)
+        return provider.parse(data) if provider else {}
 
     def display_truecaller_links(self, number: str, links: List[Tuple[str, str]]) -> None:
         """
@@ -297,7 +282,8 @@ class AdvancedTruecallerLookup:
     def save_truecaller_report(self, number: str, truecaller_links: List[Tuple[str, str]], 
                              api_results: List[Tuple[str, str, Optional[Dict]]],
                              search_dorks: List[Tuple[str, str]], 
-                             alt_sites: List[Tuple[str, str]], filename: str = None) -> None:
+                             alt_sites: List[Tuple[str, str]], filename: str = None,
+                             sink: Optional[ReportSink] = None) -> None:
         """
         Save comprehensive Truecaller report to file
         
@@ -307,65 +293,85 @@ class AdvancedTruecallerLookup:
             api_results: List of API results
             search_dorks: List of search dorks
             alt_sites: List of alternative sites
-            filename: Output filename
+            filename: Output filename (.jsonl/.csv pick a machine format, .gz compresses)
+            sink: Shared report sink of a batch run (filename is then ignored)
         """
         if filename is None:
             filename = f"truecaller_lookup_{number.replace('+', '')}.txt"
             
-        try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(f"TRUECALLER OSINT REPORT\n")
-                f.write(f"Phone Number: {number}\n")
-                f.write(f"Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write("=" * 60 + "\n\n")
-                
-                # Truecaller links
-                f.write("DIRECT TRUECALLER LINKS:\n")
-                f.write("-" * 40 + "\n")
-                for source, url in truecaller_links:
-                    f.write(f"  {source}: {url}\n")
-                f.write("\n")
-                
-                # API Results
-                f.write("API LOOKUP RESULTS:\n")
-                f.write("-" * 40 + "\n")
-                for api_name, api_url, data in api_results:
-                    f.write(f"  {api_name}:\n")
-                    f.write(f"    URL: {api_url}\n")
-                    if data and isinstance(data, dict):
-                        parsed_data = self.parse_api_response(api_name, data)
-                        for key, value in parsed_data.items():
-                            f.write(f"    {key}: {value}\n")
-                    else:
-                        f.write(f"    Result: No data available\n")
-                    f.write("\n")
-                
-                # Search dorks
-                f.write("SEARCH DORKS:\n")
-                f.write("-" * 40 + "\n")
-                for dork_name, url in search_dorks:
-                    f.write(f"  {dork_name}: {url}\n")
-                f.write("\n")
-                
-                # Alternative sites
-                f.write("ALTERNATIVE LOOKUP SITES:\n")
-                f.write("-" * 40 + "\n")
-                for site_name, url in alt_sites:
-                    f.write(f"  {site_name}: {url}\n")
+        report = {
+            'report': 'truecaller',
+            'target': number,
+            'generated': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'truecaller_links': truecaller_links,
+            'api_results': [
+                {'api': api_name, 'url': api_url,
+                 'data': self.parse_api_response(api_name, data) if data and isinstance(data, dict) else None}
+                for api_name, api_url, data in api_results
+            ],
+            'search_dorks': search_dorks,
+            'alternative_sites': alt_sites,
+        }
+        
+        def write_text(f):
+            f.write(f"TRUECALLER OSINT REPORT\n")
+            f.write(f"Phone Number: {number}\n")
+            f.write(f"Generated: {report['generated']}\n")
+            f.write("=" * 60 + "\n\n")
+            
+            # Truecaller links
+            f.write("DIRECT TRUECALLER LINKS:\n")
+            f.write("-" * 40 + "\n")
+            for source, url in truecaller_links:
+                f.write(f"  {source}: {url}\n")
+            f.write("\n")
+            
+            # API Results
+            f.write("API LOOKUP RESULTS:\n")
+            f.write("-" * 40 + "\n")
+            for api_name, api_url, data in api_results:
+                f.write(f"  {api_name}:\n")
+                f.write(f"    URL: {api_url}\n")
+                if data and isinstance(data, dict):
+                    parsed_data = self.parse_api_response(api_name, data)
+                    for key, value in parsed_data.items():
+                        f.write(f"    {key}: {value}\n")
+                else:
+                    f.write(f"    Result: No data available\n")
                 f.write("\n")
-                
-                # Legal disclaimer
-                f.write("LEGAL DISCLAIMER:\n")
-                f.write("-" * 40 + "\n")
-                f.write("This report is for educational and authorized investigations only.\n")
-                f.write("Respect privacy laws and terms of service of the listed platforms.\n")
-                f.write("Some APIs may require proper authentication and paid subscriptions.\n")
             
-            print(Fore.GREEN + f"[💾] Truecaller report saved to: {filename}")
+            # Search dorks
+            f.write("SEARCH DORKS:\n")
+            f.write("-" * 40 + "\n")
+            for dork_name, url in search_dorks:
+                f.write(f"  {dork_name}: {url}\n")
+            f.write("\n")
+            
+            # Alternative sites
+            f.write("ALTERNATIVE LOOKUP SITES:\n")
+            f.write("-" * 40 + "\n")
+            for site_name, url in alt_sites:
+                f.write(f"  {site_name}: {url}\n")
+            f.write("\n")
+            
+            # Legal disclaimer
+            f.write("LEGAL DISCLAIMER:\n")
+            f.write("-" * 40 + "\n")
+            f.write("This report is for educational and authorized investigations only.\n")
+            f.write("Respect privacy laws and terms of service of the listed platforms.\n")
+            f.write("Some APIs may require proper authentication and paid subscriptions.\n")
+        
+        try:
+            with report_sink(sink, filename) as out:
+                out.write(report, write_text)
+            
+            if sink is None:
+                print(Fore.GREEN + f"[💾] Truecaller report saved to: {filename}")
         except Exception as e:
             print(Fore.RED + f"[❌] Error saving Truecaller report: {e}")
 
-    def truecaller_lookup(self, number: str, save_report: bool = False, use_apis: bool = True) -> Dict:
+    def truecaller_lookup(self, number: Union[str, NumberProfile], save_report: bool = False, use_apis: bool = True,
+                          sink: Optional[ReportSink] = None) -> TruecallerReport:
         """
         Comprehensive Truecaller lookup function
         
@@ -373,70 +379,88 @@ class AdvancedTruecallerLookup:
             number: Phone number to investigate
             save_report: Whether to save report to file
             use_apis: Whether to use third-party APIs
+            sink: Shared report sink; when given the report is always written to it
             
         Returns:
-            Dictionary with all generated data
+            TruecallerReport record (also readable as a dictionary)
         """
-        print(Fore.CYAN + f"\n[📞] Starting comprehensive Truecaller lookup for: {number}")
+        # Parse once; every generator below reuses the same profile
+        profile = number_profile(number)
+        number = profile.raw
+        
+        self._print(Fore.CYAN + f"\n[📞] Starting comprehensive Truecaller lookup for: {number}")
         
         # Generate Truecaller links
-        truecaller_links = self.generate_truecaller_links(number)
+        truecaller_links = self.generate_truecaller_links(profile)
         
         # Generate search dorks
-        search_dorks = self.generate_search_dorks(number)
+        search_dorks = self.generate_search_dorks(profile)
         
         # Check third-party APIs
         api_results = []
         if use_apis:
-            api_results = self.check_third_party_apis(number)
+            api_results = self.check_third_party_apis(profile)
         
         # Generate alternative sites
-        alt_sites = self.generate_alternative_lookup_sites(number)
+        alt_sites = self.generate_alternative_lookup_sites(profile)
         
         # Display results
-        self.display_truecaller_links(number, truecaller_links)
-        
-        if use_apis:
-            self.display_api_results(api_results)
-        
-        self.display_search_dorks(search_dorks)
-        self.display_alternative_sites(alt_sites)
+        if self.verbose:
+            self.display_truecaller_links(number, truecaller_links)
+            
+            if use_apis:
+                self.display_api_results(api_results)
+            
+            self.display_search_dorks(search_dorks)
+            self.display_alternative_sites(alt_sites)
         
         # Save report if requested
-        if save_report:
-            self.save_truecaller_report(number, truecaller_links, api_results, search_dorks, alt_sites)
+        if save_report or sink is not None:
+            self.save_truecaller_report(number, truecaller_links, api_results, search_dorks, alt_sites, sink=sink)
         
         # Legal disclaimer
-        print(Fore.RED + "\n" + "="*80)
-        print(Fore.RED + "[!] LEGAL DISCLAIMER:")
-        print(Fore.RED + "    This tool aggregates publicly available reverse lookup services.")
-        print(Fore.RED + "    Respect privacy laws and platform terms of service.")
-        print(Fore.RED + "    Some APIs may require proper authentication for full access.")
-        
-        return {
-            'truecaller_links': truecaller_links,
-            'api_results': api_results,
-            'search_dorks': search_dorks,
-            'alternative_sites': alt_sites
-        }
+        self._print(Fore.RED + "\n" + "="*80)
+        self._print(Fore.RED + "[!] LEGAL DISCLAIMER:")
+        self._print(Fore.RED + "    This tool aggregates publicly available reverse lookup services.")
+        self._print(Fore.RED + "    Respect privacy laws and platform terms of service.")
+        self._print(Fore.RED + "    Some APIs may require proper authentication for full access.")
+        
+        return TruecallerReport(
+            number=number,
+            truecaller_links=truecaller_links,
+            api_results=api_results,
+            search_dorks=search_dorks,
+            alternative_sites=alt_sites
+        )
 
-    def batch_truecaller_lookup(self, numbers: List[str], delay: float = 3.0) -> None:
+    def batch_truecaller_lookup(self, numbers: List[str], delay: Optional[float] = None,
+                                report_path: Optional[str] = None) -> List[TruecallerReport]:
         """
         Perform Truecaller lookup on multiple numbers
         
         Args:
             numbers: List of phone numbers to check
-            delay: Delay between checks in seconds
-        """
-        print(Fore.CYAN + f"\n[📞] Starting batch Truecaller lookup for {len(numbers)} numbers...")
-        
-        for i, number in enumerate(numbers, 1):
-            print(Fore.YELLOW + f"\n[{i}/{len(numbers)}] Checking: {number}")
-            self.truecaller_lookup(number)
+            delay: Minimum seconds between requests to each lookup API during the batch
+                   (default: rate_limit_delay from config; local-only checks never wait)
+            report_path: Append every report to this one file (.txt/.jsonl/.csv, optionally .gz)
             
-            if i < len(numbers):  # No delay after last check
-                print(Fore.YELLOW + f"[⏳] Waiting {delay} seconds...")
-                time.sleep(delay)
+        Returns:
+            List of TruecallerReport records, in input order
+        """
+        self._print(Fore.CYAN + f"\n[📞] Starting batch Truecaller lookup for {len(numbers)} numbers...")
+        
+        reports = []
+        # Only the lookup APIs are contacted, so only their hosts are slowed down
+        api_hosts = [urlparse(provider.url).hostname or "" for provider in self.registry.providers]
+        with report_sink(path=report_path, append=True) if report_path else nullcontext() as sink, \
+                self.registry.transport.limiter.pace(delay, hosts=api_hosts):
+            for i, number in enumerate(numbers, 1):
+                self._print(Fore.YELLOW + f"\n[{i}/{len(numbers)}] Checking: {number}")
+                reports.append(self.truecaller_lookup(number, sink=sink))
+        
+        if report_path:
+            self._print(Fore.GREEN + f"[💾] {len(reports)} Truecaller reports written to: {report_path}")
+        return reports
 
 
 # Simplified function for basic usage (backward compatibility)
@@ -452,15 +476,14 @@ def truecaller_lookup(number: str) -> None:
     try:
         # Original dork
         dork = f'intext:"{number}" site:truecaller.com'
-        encoded_dork = urllib.parse.quote(dork)
-        print(Fore.YELLOW + f"[🔍] Google Dork: https://www.google.com/search?q={encoded_dork}")
+        print(Fore.YELLOW + f"[🔍] Google Dork: {SEARCH_URLS.url('Google', dork)}")
 
         # Original API call
         clean_number = number.replace('+', '').replace(' ', '')
         url = f"https://api.numspy.io/v1/lookup?number={clean_number}"
         headers = {"User-Agent": "NumIntensePro"}
         
-        response = requests.get(url, headers=headers, timeout=10)
+        response = get_transport().get(url, headers=headers, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -2,21 +2,47 @@
 
 import whois
 from colorama import Fore, Style, init
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import json
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
 import re
+from modules.records import WhoisRecord
+from utils.whois_cache import WHOISCache, get_whois_cache, registrable_domain
+from utils.report_sink import ReportSink, report_sink
+from utils.rate_limiter import RateLimiter, get_rate_limiter
+from utils.replay import whois_backend
+from utils.metrics import get_metrics
 
 # Initialize colorama
 init(autoreset=True)
 
 class AdvancedWHOISLookup:
-    def __init__(self, timeout: int = 10, retries: int = 2):
+    def __init__(self, timeout: int = 10, retries: int = 2, verbose: bool = True,
+                 whois_cache: Optional[WHOISCache] = None, limiter: Optional[RateLimiter] = None):
         self.timeout = timeout
         self.retries = retries
+        self.verbose = verbose  # False skips all terminal rendering
+        self.whois_cache = whois_cache or get_whois_cache()
+        self.limiter = limiter or get_rate_limiter()
+        self._whois = None  # whois.whois, or the cassette / stand-in backend when replaying
+        metrics = get_metrics()
+        self._attempts = metrics.counter("whois_attempts_total", "WHOIS lookup attempts by outcome "
+                                         "(found, not_found, incomplete, parser_error, error)", ("outcome",))
+        self._retries = metrics.counter("whois_retries_total", "WHOIS lookups retried after a failed attempt")
+        self._query_latency = metrics.histogram("whois_query_duration_seconds",
+                                                "Network WHOIS query latency by server (TLD)", ("server",))
         self.results = {}
 
+    def _print(self, message: str) -> None:
+        """Print only when terminal output is enabled"""
+        if self.verbose:
+            print(message)
+
     def validate_domain(self, domain: str) -> bool:
         """
         Validate domain format
@@ -36,7 +62,7 @@ class AdvancedWHOISLookup:
         if re.match(domain_pattern, domain):
             return True
         else:
-            print(Fore.RED + f"[❌] Invalid domain format: {domain}")
+            self._print(Fore.RED + f"[❌] Invalid domain format: {domain}")
             return False
 
     def clean_domain(self, domain: str) -> str:
@@ -73,28 +99,39 @@ class AdvancedWHOISLookup:
         """
         for attempt in range(self.retries):
             try:
-                print(Fore.YELLOW + f"[🔄] WHOIS lookup attempt {attempt + 1}/{self.retries}...")
+                self._print(Fore.YELLOW + f"[🔄] WHOIS lookup attempt {attempt + 1}/{self.retries}...")
+                
+                result = self.whois_cache.lookup(domain, self._query_whois)
                 
-                result = whois.whois(domain)
+                if result is None:
+                    self._attempts.inc("not_found")
+                    self._print(Fore.RED + f"[❌] Domain not found in WHOIS database: {domain}")
+                    return None
                 
                 # Check if we got valid data
-                if result and (result.domain_name or result.registrar):
+                if result.domain_name or result.registrar:
+                    self._attempts.inc("found")
                     return result
                 else:
-                    print(Fore.YELLOW + f"[⚠️] Attempt {attempt + 1} returned incomplete data")
+                    self._attempts.inc("incomplete")
+                    self._print(Fore.YELLOW + f"[⚠️] Attempt {attempt + 1} returned incomplete data")
                     
             except whois.parser.PywhoisError as e:
                 if "No match" in str(e):
-                    print(Fore.RED + f"[❌] Domain not found in WHOIS database: {domain}")
+                    self._attempts.inc("not_found")
+                    self._print(Fore.RED + f"[❌] Domain not found in WHOIS database: {domain}")
                     return None
                 else:
-                    print(Fore.RED + f"[❌] WHOIS parser error (attempt {attempt + 1}): {e}")
+                    self._attempts.inc("parser_error")
+                    self._print(Fore.RED + f"[❌] WHOIS parser error (attempt {attempt + 1}): {e}")
                     
             except Exception as e:
-                print(Fore.RED + f"[❌] Unexpected error (attempt {attempt + 1}): {e}")
+                self._attempts.inc("error")
+                self._print(Fore.RED + f"[❌] Unexpected error (attempt {attempt + 1}): {e}")
             
             # Wait before retry
             if attempt < self.retries - 1:
+                self._retries.inc()
                 time.sleep(2)
         
         return None
@@ -138,7 +175,7 @@ class AdvancedWHOISLookup:
             formatted['lookup_timestamp'] = datetime.now().isoformat()
             
         except Exception as e:
-            print(Fore.RED + f"[❌] Error formatting WHOIS data: {e}")
+            self._print(Fore.RED + f"[❌] Error formatting WHOIS data: {e}")
             formatted['error'] = str(e)
         
         return formatted
@@ -355,50 +392,61 @@ class AdvancedWHOISLookup:
         if dnssec and dnssec != "Not Available":
             print(Fore.WHITE + f"  🔹 DNSSEC: {dnssec}")
 
-    def save_whois_report(self, domain: str, whois_info: Dict, filename: str = None) -> None:
+    def save_whois_report(self, domain: str, whois_info: Dict, filename: str = None,
+                          sink: Optional[ReportSink] = None) -> None:
         """
         Save WHOIS report to file
         
         Args:
             domain: Domain name
             whois_info: WHOIS information
-            filename: Output filename
+            filename: Output filename (.jsonl/.csv pick a machine format, .gz compresses)
+            sink: Shared report sink of a batch run (filename is then ignored)
         """
         if filename is None:
             filename = f"whois_report_{domain.replace('.', '_')}.txt"
         
+        report = {'report': 'whois', 'target': domain, 'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+        report.update((key, value) for key, value in whois_info.items() if key != 'raw_data')
+        
+        def write_text(f):
+            f.write(f"WHOIS LOOKUP REPORT\n")
+            f.write(f"Domain: {domain}\n")
+            f.write(f"Generated: {report['generated']}\n")
+            f.write("=" * 60 + "\n\n")
+            
+            # Write structured data
+            for category, value in whois_info.items():
+                if category != 'raw_data':  # Skip raw data in text report
+                    f.write(f"{category.upper().replace('_', ' ')}: {value}\n")
+            
+            f.write("\n" + "=" * 60 + "\n")
+            f.write("END OF REPORT\n")
+        
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(f"WHOIS LOOKUP REPORT\n")
-                f.write(f"Domain: {domain}\n")
-                f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write("=" * 60 + "\n\n")
-                
-                # Write structured data
-                for category, value in whois_info.items():
-                    if category != 'raw_data':  # Skip raw data in text report
-                        f.write(f"{category.upper().replace('_', ' ')}: {value}\n")
-                
-                f.write("\n" + "=" * 60 + "\n")
-                f.write("END OF REPORT\n")
+            with report_sink(sink, filename) as out:
+                out.write(report, write_text)
             
-            print(Fore.GREEN + f"[💾] WHOIS report saved to: {filename}")
+            if sink is None:
+                print(Fore.GREEN + f"[💾] WHOIS report saved to: {filename}")
             
         except Exception as e:
             print(Fore.RED + f"[❌] Error saving WHOIS report: {e}")
 
-    def whois_lookup(self, domain: str, save_report: bool = False) -> Optional[Dict]:
+    def whois_lookup(self, domain: str, save_report: bool = False,
+                     sink: Optional[ReportSink] = None) -> Optional[WhoisRecord]:
         """
         Main WHOIS lookup function
         
         Args:
             domain: Domain to lookup
             save_report: Whether to save report to file
+            sink: Shared report sink; when given the report is always written to it
             
         Returns:
-            WHOIS information dictionary or None if error
+            WhoisRecord (also readable as a dictionary) or None if error
         """
-        print(Fore.BLUE + f"\n[🌐] Starting WHOIS lookup for: {domain}")
+        self._print(Fore.BLUE + f"\n[🌐] Starting WHOIS lookup for: {domain}")
         
         # Clean and validate domain
         clean_domain = self.clean_domain(domain)
@@ -406,54 +454,157 @@ class AdvancedWHOISLookup:
         if not self.validate_domain(clean_domain):
             return None
         
-        print(Fore.YELLOW + f"[🔍] Looking up: {clean_domain}")
+        self._print(Fore.YELLOW + f"[🔍] Looking up: {clean_domain}")
         
         # Perform WHOIS lookup
         whois_data = self.perform_whois_lookup(clean_domain)
         
         if not whois_data:
-            print(Fore.RED + f"[❌] WHOIS lookup failed for: {clean_domain}")
+            self._print(Fore.RED + f"[❌] WHOIS lookup failed for: {clean_domain}")
             return None
         
         # Format and display results
         formatted_info = self.format_whois_data(whois_data)
-        self.display_whois_results(clean_domain, formatted_info)
+        if self.verbose:
+            self.display_whois_results(clean_domain, formatted_info)
         
         # Save report if requested
-        if save_report:
-            self.save_whois_report(clean_domain, formatted_info)
+        if save_report or sink is not None:
+            self.save_whois_report(clean_domain, formatted_info, sink=sink)
+        
+        self._print(Fore.GREEN + f"\n[✅] WHOIS lookup completed for: {clean_domain}")
+        
+        return WhoisRecord.from_whois_info(clean_domain, formatted_info)
+
+    def _fetch_record(self, domain: str) -> Optional[WhoisRecord]:
+        """Clean, validate and look up one domain without rendering it"""
+        clean_domain = self.clean_domain(domain)
+        if not self.validate_domain(clean_domain):
+            return None
+        
+        whois_data = self.perform_whois_lookup(clean_domain)
+        if not whois_data:
+            return None
+        
+        return WhoisRecord.from_whois_info(clean_domain, self.format_whois_data(whois_data))
+
+    def _query_whois(self, domain: str):
+        """Network WHOIS query, paced per WHOIS server by the shared rate limiter"""
+        server = self.server_key(domain)
+        self.limiter.acquire(f"whois:{server}")
+        if self._whois is None:
+            self._whois = whois_backend() or whois.whois
+        started = time.perf_counter()
+        try:
+            return self._whois(domain)
+        finally:
+            self._query_latency.observe(server, value=time.perf_counter() - started)
+
+    @staticmethod
+    def server_key(domain: str) -> str:
+        """
+        Group key for the WHOIS server responsible for a registrable domain
+        
+        Registries run one WHOIS server per TLD, so the TLD is used as a
+        stand-in for the server (example.co.uk and example.uk share '.uk').
+        """
+        return registrable_domain(domain).rsplit('.', 1)[-1]
+
+    def iter_batch_whois(self, domains: Iterable[str], delay: float = 3.0,
+                         max_workers: int = 8) -> Iterator[Tuple[str, Optional[WhoisRecord]]]:
+        """
+        Look up many domains, streaming results as they complete
         
-        print(Fore.GREEN + f"\n[✅] WHOIS lookup completed for: {clean_domain}")
+        Domains are de-duplicated on their registrable domain and grouped by
+        WHOIS server (TLD). Groups run concurrently; network lookups against
+        one server are spaced at least `delay` seconds apart by the shared
+        rate limiter (raised with pace() for the batch), while cache hits skip the wait.
         
-        return formatted_info
+        Args:
+            domains: Domains to lookup
+            delay: Minimum spacing between lookups against one WHOIS server
+            max_workers: Number of WHOIS servers queried in parallel
+            
+        Returns:
+            Iterator of (domain, WhoisRecord or None), in completion order.
+            Every input domain is yielded exactly once; closing the iterator early
+            stops the remaining lookups.
+        """
+        # registrable domain -> input aliases, grouped by server
+        servers = {}
+        total = 0
+        for domain in domains:
+            key = registrable_domain(self.clean_domain(domain))
+            servers.setdefault(self.server_key(key), {}).setdefault(key, []).append(domain)
+            total += 1
+        
+        if not total:
+            return
+        
+        done = queue.Queue()
+        stop = threading.Event()
+        
+        def run_group(server: str, group: Dict[str, List[str]]) -> None:
+            for aliases in group.values():
+                if stop.is_set():
+                    return
+                try:
+                    # Network lookups wait on the shared whois:<server> limiter in _query_whois
+                    record = self._fetch_record(aliases[0])
+                except Exception as e:
+                    self._print(Fore.RED + f"[❌] Unexpected error for {aliases[0]}: {e}")
+                    record = None
+                for domain in aliases:
+                    done.put((domain, record))
+        
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(servers))))
+        with self.limiter.pace(delay, hosts=[f"whois:{server}" for server in servers]):
+            try:
+                for server, group in servers.items():
+                    executor.submit(run_group, server, group)
+                for _ in range(total):
+                    yield done.get()
+            finally:
+                # Closed early: drop queued groups and let running ones stop after their
+                # current lookup, then release the pace floor
+                stop.set()
+                executor.shutdown(wait=True, cancel_futures=True)
 
-    def batch_whois_lookup(self, domains: List[str], delay: float = 3.0) -> Dict[str, Optional[Dict]]:
+    def batch_whois_lookup(self, domains: List[str], delay: float = 3.0,
+                           max_workers: int = 8, report_path: Optional[str] = None) -> Dict[str, Optional[WhoisRecord]]:
         """
         Perform WHOIS lookup on multiple domains
         
         Args:
             domains: List of domains to lookup
-            delay: Delay between lookups in seconds
+            delay: Minimum spacing between lookups against one WHOIS server
+            max_workers: Number of WHOIS servers queried in parallel
+            report_path: Append every successful lookup to this one file (.txt/.jsonl/.csv, optionally .gz)
             
         Returns:
-            Dictionary of domain -> WHOIS results
+            Dictionary of domain -> WHOIS results, in input order
         """
-        print(Fore.BLUE + f"\n[🌐] Starting batch WHOIS lookup for {len(domains)} domains...")
+        self._print(Fore.BLUE + f"\n[🌐] Starting batch WHOIS lookup for {len(domains)} domains...")
         
-        results = {}
+        results = {domain: None for domain in domains}
         
-        for i, domain in enumerate(domains, 1):
-            print(Fore.YELLOW + f"\n[{i}/{len(domains)}] Processing: {domain}")
-            
-            result = self.whois_lookup(domain)
-            results[domain] = result
-            
-            if i < len(domains):  # No delay after last domain
-                print(Fore.YELLOW + f"[⏳] Waiting {delay} seconds...")
-                time.sleep(delay)
+        # Results stream in on this thread, so one sink collects every report
+        with report_sink(path=report_path, append=True) if report_path else nullcontext() as sink:
+            for i, (domain, record) in enumerate(self.iter_batch_whois(domains, delay, max_workers), 1):
+                results[domain] = record
+                if record is None:
+                    self._print(Fore.RED + f"\n[{i}/{len(domains)}] WHOIS lookup failed for: {domain}")
+                else:
+                    self._print(Fore.GREEN + f"\n[{i}/{len(domains)}] Completed: {domain}")
+                    if self.verbose:
+                        self.display_whois_results(record.domain, record)
+                    if sink is not None:
+                        self.save_whois_report(record.domain, record, sink=sink)
         
         successful = sum(1 for result in results.values() if result is not None)
-        print(Fore.GREEN + f"\n[📊] Batch complete: {successful}/{len(domains)} successful lookups")
+        self._print(Fore.GREEN + f"\n[📊] Batch complete: {successful}/{len(domains)} successful lookups")
+        if report_path:
+            self._print(Fore.GREEN + f"[💾] {successful} WHOIS reports written to: {report_path}")
         
         return results
 
@@ -7,33 +7,97 @@ Author: GulsHan Kumar
 License: MIT
 """
 
-import phonenumbers
-from phonenumbers import geocoder, carrier, timezone
 import argparse
 import sys
-import requests
 import json
 import time
 import os
 from datetime import datetime
-from colorama import init, Fore, Style
 import re
 import random
-import whois
-from bs4 import BeautifulSoup
+from utils.lazy_import import LazyModule, LazyAttribute, missing_modules
+from modules.records import PhoneIntel, SpamResult, SocialResult, BreachResult, WhoisRecord, ScanSummary, ProbeError
+from modules.renderers import OUTPUT_FORMATS, TerminalRenderer, get_renderer
+from utils.profiling import get_profiler, stage
 
-# Initialize colorama
-init(autoreset=True)
+# Subsystems load on first use so --help and offline checks stay fast
+phonenumbers = LazyModule('phonenumbers')
+geocoder = LazyModule('phonenumbers.geocoder')
+carrier = LazyModule('phonenumbers.carrier')
+timezone = LazyModule('phonenumbers.timezone')
+whois = LazyModule('whois')
 
-class NumIntensePro:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (NumIntensePro/4.0.0)'
+# Initialize colorama when it is first used
+colorama = LazyModule('colorama', on_load=lambda module: module.init(autoreset=True))
+Fore = LazyAttribute(colorama, 'Fore')
+Style = LazyAttribute(colorama, 'Style')
+
+_NUMBER_TYPE_NAMES = {}
+
+def number_type_name(number_type):
+    """Machine-readable name for a phonenumbers.PhoneNumberType value"""
+    if not _NUMBER_TYPE_NAMES:
+        _NUMBER_TYPE_NAMES.update({
+            getattr(phonenumbers.PhoneNumberType, name): name
+            for name in dir(phonenumbers.PhoneNumberType) if name.isupper()
         })
+    return _NUMBER_TYPE_NAMES.get(number_type, "UNKNOWN")
+
+class NumIntensePro:
+    def __init__(self, renderer=None, scan_deadline=15.0, transport=None, profiler=None):
+        self.renderer = renderer or TerminalRenderer()
+        self.profiler = profiler or get_profiler()  # Per-stage timing spans (no-ops unless started)
+        self.transport = transport
+        self.scan_deadline = scan_deadline  # Overall budget for concurrent network probes
+        self._session = None
+        self._metadata_cache = None
+        self._orchestrator = None
+        self._whois_cache = None
         self.results = {}
         self.case_id = self.generate_case_id()
         
+    @property
+    def session(self):
+        """HTTP client on the shared pooled transport, created on first network call"""
+        if self._session is None:
+            if self.transport is None:
+                from utils.transport import get_transport
+                self.transport = get_transport()
+            self._session = self.transport.client(headers={
+                'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (NumIntensePro/4.0.0)'
+            })
+        return self._session
+        
+    @property
+    def metadata_cache(self):
+        """Prefix-keyed geocoder/carrier/timezone cache (shared process-wide), fetched on first lookup"""
+        if self._metadata_cache is None:
+            from utils.metadata_cache import get_metadata_cache
+            self._metadata_cache = get_metadata_cache()
+        return self._metadata_cache
+        
+    @property
+    def whois_cache(self):
+        """Persistent WHOIS cache keyed on registrable domain, created on first lookup"""
+        if self._whois_cache is None:
+            from utils.whois_cache import get_whois_cache
+            self._whois_cache = get_whois_cache()
+        return self._whois_cache
+        
+    @property
+    def orchestrator(self):
+        """Concurrent probe runner, created on first network scan"""
+        if self._orchestrator is None:
+            from utils.orchestrator import ProbeOrchestrator
+            self._orchestrator = ProbeOrchestrator(deadline=self.scan_deadline)
+        return self._orchestrator
+        
+    def run_probes(self, probes):
+        """Run probes concurrently; results come back in probe order"""
+        self.session  # Create the shared session before worker threads race for it
+        with self.profiler.span("probes", count=len(probes)):
+            return self.orchestrator.run(probes)
+        
     def generate_case_id(self):
         """Generate unique case ID for investigation"""
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
@@ -65,157 +129,172 @@ class NumIntensePro:
 
     def print_status(self, module, message, status="INFO"):
         """Print formatted status messages"""
-        status_colors = {
-            "SUCCESS": Fore.GREEN,
-            "ERROR": Fore.RED,
-            "WARNING": Fore.YELLOW,
-            "INFO": Fore.CYAN,
-            "PROCESSING": Fore.BLUE
-        }
-        
-        status_icons = {
-            "SUCCESS": "✅",
-            "ERROR": "❌",
-            "WARNING": "⚠️",
-            "INFO": "🔹",
-            "PROCESSING": "🔄"
-        }
-        
-        color = status_colors.get(status, Fore.WHITE)
-        icon = status_icons.get(status, "🔹")
-        
-        print(f"{color}{icon} [{module}] {message}")
+        self.renderer.status(module, message, status)
 
-    def validate_number(self, number):
+    @stage("validate")
+    def validate_number(self, number, quiet=False):
         """Validate and parse phone number"""
+        from utils.number_profile import default_region, number_profile
+        
         try:
             # Clean the number
             number = re.sub(r'[^\d+]', '', number)
             
-            # Add country code if missing
-            if not number.startswith('+'):
-                self.print_status("VALIDATION", "No country code detected. Assuming +91 (India)", "WARNING")
-                number = '+91' + number
+            # Numbers without a country code are read in the configured default region
+            if not number.startswith('+') and not quiet:
+                region = default_region()
+                self.print_status("VALIDATION", f"No country code detected. Assuming "
+                                  f"+{phonenumbers.country_code_for_region(region)} ({region})", "WARNING")
             
-            parsed = phonenumbers.parse(number)
-            if not phonenumbers.is_valid_number(parsed):
-                self.print_status("VALIDATION", "Invalid phone number format", "ERROR")
+            # One parse per scan: every later stage reuses this profile
+            profile = number_profile(number)
+            parsed = profile.parsed
+            if parsed is None or not profile.valid:
+                if not quiet:
+                    self.print_status("VALIDATION", "Invalid phone number format", "ERROR")
                 return None
                 
+            number = profile.e164
             self.results['raw_number'] = number
             self.results['parsed_number'] = parsed
-            self.print_status("VALIDATION", "Phone number validated successfully", "SUCCESS")
+            self.results['profile'] = profile
+            if not quiet:
+                self.print_status("VALIDATION", "Phone number validated successfully", "SUCCESS")
             return parsed
             
         except Exception as e:
-            self.print_status("VALIDATION", f"Error parsing number: {e}", "ERROR")
+            if not quiet:
+                self.print_status("VALIDATION", f"Error parsing number: {e}", "ERROR")
             return None
 
-    def get_basic_info(self, parsed):
-        """Display comprehensive basic information"""
-        print(Fore.CYAN + Style.BRIGHT + "\n    📊 BASIC INTELLIGENCE REPORT")
-        print(Fore.CYAN + "    " + "─" * 50)
-        
-        # Phone number formats
-        international = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
-        e164 = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-        national = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.NATIONAL)
+    def extract_basic_info(self, parsed):
+        """Collect basic number intelligence as plain data (no output)"""
+        from utils.number_profile import NumberProfile, number_profile
         
-        print(f"    📱 {Fore.WHITE}Number: {Fore.GREEN}{international}")
-        print(f"    🔢 {Fore.WHITE}E164 Format: {Fore.YELLOW}{e164}")
-        print(f"    🏠 {Fore.WHITE}National Format: {Fore.YELLOW}{national}")
-        
-        # Location information
-        country = geocoder.description_for_number(parsed, 'en')
-        carrier_name = carrier.name_for_number(parsed, 'en')
-        timezones = timezone.time_zones_for_number(parsed)
-        region_code = phonenumbers.region_code_for_number(parsed)
-        
-        print(f"    🌍 {Fore.WHITE}Country: {Fore.CYAN}{country} ({region_code})")
-        print(f"    🏢 {Fore.WHITE}Carrier: {Fore.CYAN}{carrier_name}")
+        # Formats come from the scan's shared profile instead of being re-derived
+        if isinstance(parsed, NumberProfile):
+            profile = parsed
+        else:
+            profile = number_profile(phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164))
+        parsed = profile.parsed
+        number_type = phonenumbers.number_type(parsed)
+        # Country/region/carrier/timezone share one prefix-keyed cache probe
+        with self.profiler.span("basic_info.metadata"):
+            metadata = self.metadata_cache.lookup(parsed, number_type, profile.region)
         
-        if timezones:
-            print(f"    🕐 {Fore.WHITE}Timezone(s): {Fore.CYAN}{', '.join(timezones)}")
+        return {
+            'international': profile.international,
+            'e164': profile.e164,
+            'national': profile.national,
+            'country': metadata['country'],
+            'region': metadata['region'],
+            'carrier': metadata['carrier'],
+            'timezones': list(metadata['timezones']),
+            'valid': profile.valid,
+            'possible': phonenumbers.is_possible_number(parsed),
+            'number_type': number_type,
+            'number_type_name': number_type_name(number_type),
+        }
 
-        # Validation info
-        is_valid = phonenumbers.is_valid_number(parsed)
-        is_possible = phonenumbers.is_possible_number(parsed)
-        
-        valid_status = "✅ Valid" if is_valid else "❌ Invalid"
-        possible_status = "✅ Possible" if is_possible else "❌ Not Possible"
+    @stage("basic_info")
+    def get_basic_info(self, parsed):
+        """Collect and render comprehensive basic information"""
+        info = self.extract_basic_info(self.results.get('profile') or parsed)
         
-        print(f"    ✅ {Fore.WHITE}Validation: {Fore.GREEN if is_valid else Fore.RED}{valid_status}")
-        print(f"    🔍 {Fore.WHITE}Possibility: {Fore.GREEN if is_possible else Fore.RED}{possible_status}")
+        intel = PhoneIntel(
+            target=self.results.get('raw_number'),
+            e164=info['e164'],
+            international=info['international'],
+            national=info['national'],
+            country=info['country'],
+            region=info['region'],
+            carrier=info['carrier'],
+            timezones=info['timezones'],
+            valid=info['valid'],
+            possible=info['possible'],
+            number_type=info['number_type_name']
+        )
+        self.renderer.render(intel)
+        return intel
+
+    def spam_probes(self, number, profile=None):
+        """Build the spam database probes for a number"""
+        from utils.orchestrator import Probe
+        from utils.number_profile import number_profile
         
-        # Number type with emoji
-        number_type = phonenumbers.number_type(parsed)
-        type_map = {
-            phonenumbers.PhoneNumberType.MOBILE: "📱 Mobile",
-            phonenumbers.PhoneNumberType.FIXED_LINE: "🏠 Fixed Line",
-            phonenumbers.PhoneNumberType.FIXED_LINE_OR_MOBILE: "📞 Fixed Line or Mobile",
-            phonenumbers.PhoneNumberType.TOLL_FREE: "🆓 Toll Free",
-            phonenumbers.PhoneNumberType.PREMIUM_RATE: "💎 Premium Rate",
-            phonenumbers.PhoneNumberType.VOIP: "🌐 VOIP",
-            phonenumbers.PhoneNumberType.UNKNOWN: "❓ Unknown"
-        }
-        number_type_str = type_map.get(number_type, "❓ Unknown")
-        print(f"    🔧 {Fore.WHITE}Number Type: {Fore.CYAN}{number_type_str}")
+        clean_num = (profile or number_profile(number)).digits
+        url = f"https://www.tellows.com/num/{clean_num}"
+        return [
+            Probe("Tellows", self.probe_tellows, number, url, url=url,
+                  on_timeout=lambda: SpamResult(target=number, source="Tellows", status="Timed Out"),
+                  on_error=lambda error: ProbeError(target=number, probe="Tellows", error=repr(error)))
+        ]
+
+    @stage("probe.tellows")
+    def probe_tellows(self, number, url):
+        """Query Tellows for a single number"""
+        try:
+            response = self.session.get(url, timeout=10)
+            if "score" in response.text.lower():
+                status = "Data Available"
+            else:
+                status = "No Data"
+        except Exception:
+            status = "Connection Failed"
+        return SpamResult(target=number, source="Tellows", status=status)
 
     def check_spam_databases(self, number):
         """Check multiple spam databases for reputation"""
         self.print_status("SPAM", "Checking spam reputation databases...", "PROCESSING")
         
-        clean_num = number.replace('+', '')
-        spam_results = []
+        spam_results = self.run_probes(self.spam_probes(number))
+        
+        self.renderer.render(spam_results)
+        return spam_results
+
+    def social_probes(self, number, profile=None):
+        """Build the social media probes for a number"""
+        from utils.orchestrator import Probe
+        from utils.number_profile import number_profile
+        
+        clean_num = (profile or number_profile(number)).digits
+        platforms = [
+            ("Facebook", f"https://www.facebook.com/{clean_num}"),
+            ("Telegram", f"https://t.me/{clean_num}")
+        ]
         
-        # Check Tellows
+        return [
+            Probe(platform, self.probe_social, number, platform, url, url=url,
+                  on_timeout=lambda platform=platform, url=url: SocialResult(
+                      target=number, platform=platform, url=url, status="Timed Out"),
+                  on_error=lambda error, platform=platform: ProbeError(
+                      target=number, probe=platform, error=repr(error)))
+            for platform, url in platforms
+        ]
+
+    @stage("probe.social")
+    def probe_social(self, number, platform, url):
+        """Probe one social platform for a profile"""
         try:
-            response = self.session.get(f"https://www.tellows.com/num/{clean_num}", timeout=10)
-            if "score" in response.text.lower():
-                spam_results.append(("Tellows", "Data Available"))
-            else:
-                spam_results.append(("Tellows", "No Data"))
-        except:
-            spam_results.append(("Tellows", "Connection Failed"))
-        
-        # Display results
-        print(f"\n    🚫 {Fore.WHITE}Spam Database Results:")
-        for db, status in spam_results:
-            if "Available" in status:
-                print(f"       {Fore.GREEN}✅ {db}: {status}")
-            elif "No Data" in status:
-                print(f"       {Fore.YELLOW}⚠️  {db}: {status}")
+            response = self.session.head(url, timeout=5)
+            if response.status_code == 200:
+                status = "Possible Profile Found"
             else:
-                print(f"       {Fore.RED}❌ {db}: {status}")
+                status = "No Direct Profile"
+        except Exception:
+            status = "Check Failed"
+        return SocialResult(target=number, platform=platform, url=url, status=status)
 
     def check_social_presence(self, number):
         """Check social media presence"""
         self.print_status("SOCIAL", "Analyzing social media presence...", "PROCESSING")
         
-        clean_num = number.replace('+', '').replace(' ', '')
+        social_results = self.run_probes(self.social_probes(number))
         
-        # Check Facebook pattern
-        try:
-            fb_url = f"https://www.facebook.com/{clean_num}"
-            response = self.session.head(fb_url, timeout=5)
-            if response.status_code == 200:
-                print(f"    📘 {Fore.WHITE}Facebook: {Fore.GREEN}Possible Profile Found")
-            else:
-                print(f"    📘 {Fore.WHITE}Facebook: {Fore.YELLOW}No Direct Profile")
-        except:
-            print(f"    📘 {Fore.WHITE}Facebook: {Fore.RED}Check Failed")
-
-        # Check Telegram pattern
-        try:
-            tg_url = f"https://t.me/{clean_num}"
-            response = self.session.head(tg_url, timeout=5)
-            if response.status_code == 200:
-                print(f"    📱 {Fore.WHITE}Telegram: {Fore.GREEN}Possible Profile Found")
-            else:
-                print(f"    📱 {Fore.WHITE}Telegram: {Fore.YELLOW}No Direct Profile")
-        except:
-            print(f"    📱 {Fore.WHITE}Telegram: {Fore.RED}Check Failed")
+        self.renderer.render(social_results)
+        return social_results
 
+    @stage("breach")
     def check_breaches(self, email):
         """Check email breaches with actual data"""
         self.print_status("BREACH", f"Checking breaches for: {email}", "PROCESSING")
@@ -235,26 +314,34 @@ class NumIntensePro:
             
             if response.status_code == 200:
                 breaches = response.json()
-                print(f"    🔥 {Fore.WHITE}Breaches Found: {Fore.RED}{len(breaches)}")
-                for breach in breaches[:3]:  # Show first 3 breaches
-                    print(f"       {Fore.YELLOW}• {breach.get('Name', 'Unknown')} - {breach.get('BreachDate', 'Unknown')}")
+                result = BreachResult(target=email, status="breached", count=len(breaches), breaches=breaches)
             elif response.status_code == 404:
-                print(f"    ✅ {Fore.WHITE}Breaches: {Fore.GREEN}No breaches found")
+                result = BreachResult(target=email, status="clean", count=0, breaches=[])
             else:
-                print(f"    ℹ️  {Fore.WHITE}Breaches: {Fore.YELLOW}Check manually at hibp.com")
+                result = BreachResult(target=email, status="unknown")
                 
-        except Exception as e:
-            print(f"    ❌ {Fore.WHITE}Breaches: {Fore.RED}Check failed - visit hibp.com")
+        except Exception:
+            result = BreachResult(target=email, status="error")
+        
+        self.renderer.render(result)
+        return result
 
+    @stage("whois")
     def advanced_whois_lookup(self, domain):
         """Enhanced WHOIS lookup with more details"""
         self.print_status("DOMAIN", f"Advanced domain analysis: {domain}", "PROCESSING")
         
         try:
-            domain_info = whois.whois(domain)
-            
-            print(f"    🌐 {Fore.WHITE}Domain: {Fore.GREEN}{domain_info.domain_name}")
-            print(f"    🏢 {Fore.WHITE}Registrar: {Fore.CYAN}{domain_info.registrar}")
+            # Cache hits never import or touch the whois socket
+            domain_info = self.whois_cache.lookup(domain)
+            if domain_info is None:
+                raise LookupError(f"No match for domain \"{domain}\"")
+            record = WhoisRecord(
+                domain=domain,
+                domain_name=domain_info.domain_name,
+                registrar=domain_info.registrar,
+                name_servers=domain_info.name_servers
+            )
             
             # Domain age calculation
             if domain_info.creation_date:
@@ -264,8 +351,8 @@ class NumIntensePro:
                     created = domain_info.creation_date
                 
                 if hasattr(created, 'strftime'):
-                    domain_age = (datetime.now() - created).days
-                    print(f"    📅 {Fore.WHITE}Age: {Fore.CYAN}{domain_age} days")
+                    record.creation_date = created
+                    record.age_days = (datetime.now() - created).days
             
             # Expiry status
             if domain_info.expiration_date:
@@ -275,61 +362,98 @@ class NumIntensePro:
                     expires = domain_info.expiration_date
                 
                 if hasattr(expires, 'strftime'):
-                    days_left = (expires - datetime.now()).days
-                    status_color = Fore.GREEN if days_left > 30 else Fore.RED
-                    print(f"    ⏳ {Fore.WHITE}Expires in: {status_color}{days_left} days")
-            
-            # Name servers
-            if domain_info.name_servers:
-                print(f"    🔧 {Fore.WHITE}Name Servers: {Fore.CYAN}{len(domain_info.name_servers)} found")
+                    record.expiration_date = expires
+                    record.expires_in_days = (expires - datetime.now()).days
                 
         except Exception as e:
             self.print_status("WHOIS", f"Error: {e}", "ERROR")
+            record = WhoisRecord(domain=domain, error=str(e))
+        
+        self.renderer.render(record)
+        return record
 
+    def run_email_batch(self, emails):
+        """Breach-check many emails, looking up each registrable domain only once"""
+        from utils.whois_cache import registrable_domain, unique_domains
+        
+        records = [self.check_breaches(email) for email in emails]
+        domains = unique_domains(emails)
+        self.print_status("DOMAIN", f"{len(domains)} unique domains across {len(emails)} emails", "INFO")
+        whois_records = {domain: self.advanced_whois_lookup(domain) for domain in domains}
+        records.extend(whois_records.values())
+        
+        # Map every email to its (shared) domain record for callers
+        self.results['email_domains'] = {email: whois_records.get(registrable_domain(email)) for email in emails}
+        return records
+
+    @stage("report")
     def generate_intelligence_report(self, target, target_type):
         """Generate comprehensive intelligence report"""
-        print(Fore.CYAN + Style.BRIGHT + "\n    📈 INTELLIGENCE SUMMARY")
-        print(Fore.CYAN + "    " + "─" * 50)
-        
-        if target_type == "phone":
-            print(f"    🎯 {Fore.WHITE}Target Type: {Fore.GREEN}Phone Number")
-            print(f"    📞 {Fore.WHITE}Number: {Fore.CYAN}{target}")
-            print(f"    🔍 {Fore.WHITE}Analysis: {Fore.YELLOW}Basic + Carrier + Social Presence")
-            
-        elif target_type == "email":
-            print(f"    🎯 {Fore.WHITE}Target Type: {Fore.GREEN}Email Address") 
-            print(f"    📧 {Fore.WHITE}Email: {Fore.CYAN}{target}")
-            print(f"    🔍 {Fore.WHITE}Analysis: {Fore.YELLOW}Breach Check + Domain Analysis")
-            
-        elif target_type == "domain":
-            print(f"    🎯 {Fore.WHITE}Target Type: {Fore.GREEN}Domain")
-            print(f"    🌐 {Fore.WHITE}Domain: {Fore.CYAN}{target}")
-            print(f"    🔍 {Fore.WHITE}Analysis: {Fore.YELLOW}WHOIS + Registration Details")
+        analysis = {
+            "phone": "Basic + Carrier + Social Presence",
+            "email": "Breach Check + Domain Analysis",
+            "domain": "WHOIS + Registration Details"
+        }
         
-        print(f"    ⚡ {Fore.WHITE}Status: {Fore.GREEN}Analysis Complete")
-        print(f"    📋 {Fore.WHITE}Report ID: {Fore.CYAN}{self.case_id}")
+        summary = ScanSummary(
+            case_id=self.case_id,
+            target=target,
+            target_type=target_type,
+            analysis=analysis.get(target_type),
+            status="Analysis Complete"
+        )
+        self.renderer.render(summary)
+        return summary
 
     def run_advanced_scan(self, target, target_type):
-        """Run advanced intelligence scan"""
+        """Run advanced intelligence scan and return every stage's records"""
         self.print_status("SCAN", f"Starting advanced {target_type} analysis...", "PROCESSING")
+        records = []
         
         if target_type == "phone":
             parsed = self.validate_number(target)
             if parsed:
-                self.get_basic_info(parsed)
-                self.check_spam_databases(target)
-                self.check_social_presence(target)
+                records.append(self.get_basic_info(parsed))
+                
+                # Spam and social probes are independent: run them together
+                profile = self.results['profile']
+                spam_probes = self.spam_probes(target, profile)
+                social_probes = self.social_probes(target, profile)
+                self.print_status("PROBES", f"Running {len(spam_probes) + len(social_probes)} network probes concurrently...", "PROCESSING")
+                results = self.run_probes(spam_probes + social_probes)
+                spam_results = results[:len(spam_probes)]
+                social_results = results[len(spam_probes):]
+                
+                self.print_status("SPAM", "Spam reputation databases", "INFO")
+                self.renderer.render(spam_results)
+                records.extend(spam_results)
+                
+                self.print_status("SOCIAL", "Social media presence", "INFO")
+                self.renderer.render(social_results)
+                records.extend(social_results)
                 
         elif target_type == "email":
-            self.check_breaches(target)
+            records.append(self.check_breaches(target))
             # Extract domain from email for additional analysis
             domain = target.split('@')[-1]
-            self.advanced_whois_lookup(domain)
+            records.append(self.advanced_whois_lookup(domain))
             
         elif target_type == "domain":
-            self.advanced_whois_lookup(target)
+            records.append(self.advanced_whois_lookup(target))
         
-        self.generate_intelligence_report(target, target_type)
+        records.append(self.generate_intelligence_report(target, target_type))
+        return records
+
+    @stage("archive")
+    def archive_report(self, records, kind="scan"):
+        """Store the run's records as JSONL in the report archive and return the path"""
+        import io
+        from modules.renderers import JSONLRenderer
+        from utils.report_archive import get_report_archive
+
+        buffer = io.StringIO()
+        JSONLRenderer(buffer, case_id=self.case_id).render([record for record in records if record is not None])
+        return get_report_archive().store(self.case_id, buffer.getvalue(), "jsonl", prefix=kind)
 
     def print_legal_notice(self):
         """Print legal disclaimer"""
@@ -340,30 +464,41 @@ class NumIntensePro:
         print(f"    {Fore.YELLOW}🛡️  Respect privacy and obtain proper authorization.")
         print(f"    {Fore.YELLOW}⚖️  Developers assume no liability for misuse.")
 
-def check_dependencies():
+def check_dependencies(verbose=True):
     """Check if required dependencies are installed"""
-    required_modules = ['phonenumbers', 'colorama', 'requests', 'whois', 'bs4']
-    missing_modules = []
-    
-    for module in required_modules:
-        try:
-            __import__(module)
-        except ImportError:
-            missing_modules.append(module)
+    required_modules = ['phonenumbers', 'colorama', 'requests', 'whois']
+    # Locate modules without importing them; each subsystem loads on first use
+    missing = missing_modules(required_modules)
     
-    if missing_modules:
-        print(Fore.RED + f"❌ Missing required modules: {', '.join(missing_modules)}")
-        print(Fore.YELLOW + f"💡 Install with: pip install {' '.join(missing_modules)}")
+    if missing:
+        print(Fore.RED + f"❌ Missing required modules: {', '.join(missing)}")
+        print(Fore.YELLOW + f"💡 Install with: pip install {' '.join(missing)}")
         return False
     
-    print(Fore.GREEN + "✅ All core dependencies verified")
+    if verbose:
+        print(Fore.GREEN + "✅ All core dependencies verified")
     return True
 
+def write_profile(profiler, trace_path, cprofile_path=None):
+    """Stop profiling, print the per-stage table to stderr and write the trace files"""
+    profiler.stop()
+    print("\n" + profiler.format_summary(), file=sys.stderr)
+    try:
+        print(f"Chrome trace written to {profiler.write_chrome_trace(trace_path)}", file=sys.stderr)
+        if cprofile_path:
+            print(f"cProfile stats written to {profiler.dump_cprofile(cprofile_path)}", file=sys.stderr)
+    except OSError as e:
+        print(f"Could not write profile: {e}", file=sys.stderr)
+
+def write_metrics(registry, path):
+    """Write the Prometheus textfile-collector file at exit"""
+    try:
+        registry.write_textfile(path)
+    except OSError as e:
+        print(f"Could not write metrics: {e}", file=sys.stderr)
+
 def main():
     """Main function"""
-    if not check_dependencies():
-        sys.exit(1)
-        
     parser = argparse.ArgumentParser(
         description="🔥 NumIntense Pro - Ultimate OSINT Intelligence Suite",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -373,20 +508,41 @@ def main():
 {Fore.WHITE}  {sys.argv[0]} +919876543210 --advanced    {Fore.YELLOW}# Advanced investigation  
 {Fore.WHITE}  {sys.argv[0]} admin@company.com --email   {Fore.YELLOW}# Email forensics
 {Fore.WHITE}  {sys.argv[0]} target.com --domain         {Fore.YELLOW}# Domain intelligence
+{Fore.WHITE}  {sys.argv[0]} +919876543210 -a --format jsonl  {Fore.YELLOW}# Machine-readable output
+{Fore.WHITE}  {sys.argv[0]} --bulk crm.csv --column phone -o out.jsonl  {Fore.YELLOW}# Bulk enrichment
 
 {Fore.MAGENTA}Enhanced Features:
 {Fore.CYAN}  --advanced   {Fore.WHITE}Advanced intelligence with actual data
 {Fore.CYAN}  --quiet      {Fore.WHITE}Minimal output for automated operations
 {Fore.CYAN}  --email      {Fore.WHITE}Target is an email address
 {Fore.CYAN}  --domain     {Fore.WHITE}Target is a domain
+{Fore.CYAN}  --bulk       {Fore.WHITE}Stream-enrich a CSV of phone numbers
+{Fore.CYAN}  --format     {Fore.WHITE}text (default), json, jsonl or csv output
+{Fore.CYAN}  --profile    {Fore.WHITE}Per-stage timing table and a Chrome trace of the run
+{Fore.CYAN}  --metrics-file {Fore.WHITE}Prometheus metrics (requests, latency, cache hits) at exit
         """
     )
     
-    parser.add_argument("target", help="Target (phone number, email, or domain)")
+    parser.add_argument("target", nargs="?", help="Target (phone number, email, or domain)")
     parser.add_argument("-a", "--advanced", action="store_true", help="Run advanced intelligence gathering")
     parser.add_argument("-q", "--quiet", action="store_true", help="Suppress banner and minimize output")
     parser.add_argument("--email", action="store_true", help="Target is an email address")
     parser.add_argument("--domain", action="store_true", help="Target is a domain")
+    parser.add_argument("--bulk", metavar="CSV", help="Enrich every number in a CSV file ('-' for stdin)")
+    parser.add_argument("--column", default="phone", help="CSV column holding phone numbers (default: phone)")
+    parser.add_argument("-o", "--output", default="-", help="Output file for bulk/machine formats ('-' for stdout)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS,
+                        help="Output format: text (default), json, jsonl or csv; bulk mode takes csv/jsonl "
+                             "(default: from --output extension)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Time every scan stage: print a summary table and write a Chrome trace")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Chrome trace-event JSON written by --profile (default: trace_<case id>.json)")
+    parser.add_argument("--cprofile", metavar="FILE", help="Also dump cProfile statistics (implies --profile)")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics while running")
+    parser.add_argument("--metrics-file", metavar="FILE",
+                        help="Write Prometheus metrics to FILE at exit (node_exporter textfile collector)")
     
     if len(sys.argv) == 1:
         parser.print_help()
@@ -394,47 +550,113 @@ def main():
         
     args = parser.parse_args()
     
+    if not args.target and not args.bulk:
+        parser.error("a target or --bulk CSV is required")
+    if args.bulk and args.format in ("text", "json"):
+        parser.error("--bulk supports --format csv or jsonl")
+    
+    output_format = args.format or "text"
+    text_mode = output_format == "text" and not args.bulk
+    
+    # Machine-readable output may stream to stdout, so keep the dependency check silent there
+    if not check_dependencies(verbose=text_mode):
+        sys.exit(1)
+    
     # Initialize tool
     tool = NumIntensePro()
     
+    import atexit
+    if args.profile or args.trace or args.cprofile:
+        tool.profiler.start(cprofile=bool(args.cprofile))
+        # Runs on every exit path, including the sys.exit() calls below
+        atexit.register(write_profile, tool.profiler, args.trace or f"trace_{tool.case_id}.json", args.cprofile)
+    
+    # Prometheus exposition: a /metrics port for long runs, or a textfile-collector file at exit
+    from utils.metrics import get_metrics, metrics_options
+    metrics = get_metrics()
+    exposure = metrics_options()
+    metrics_port = args.metrics_port if args.metrics_port is not None else exposure['port']
+    metrics_file = args.metrics_file or exposure['textfile']
+    if metrics_port is not None:
+        try:
+            url = metrics.serve(int(metrics_port))
+            print(f"Serving metrics on {url}", file=sys.stderr)
+        except OSError as e:
+            tool.print_status("METRICS", f"Cannot serve metrics on port {metrics_port}: {e}", "WARNING")
+    if metrics_file:
+        atexit.register(write_metrics, metrics, metrics_file)
+    scans = metrics.counter("scans_total", "Completed scans by target type and mode", ("target_type", "mode"))
+    
+    if args.bulk:
+        from modules.bulk_enrich import BulkPhoneEnricher
+        
+        enricher = BulkPhoneEnricher(tool, phone_column=args.column)
+        try:
+            with tool.profiler.span("bulk"):
+                stats = enricher.run(args.bulk, args.output, args.format)
+            scans.inc("phone", "bulk")
+        except KeyboardInterrupt:
+            tool.print_status("SYSTEM", "Bulk enrichment interrupted by user", "WARNING")
+            sys.exit(1)
+        except OSError as e:
+            tool.print_status("BULK", f"I/O error: {e}", "ERROR")
+            sys.exit(1)
+        sys.exit(0 if stats is not None else 1)
+    
+    output_stream = None
+    if not text_mode:
+        output_stream = sys.stdout if args.output == "-" else open(args.output, 'w', newline='', encoding='utf-8')
+        tool.renderer = get_renderer(output_format, output_stream, case_id=tool.case_id)
+    
     # Display banner
-    if not args.quiet:
+    if text_mode and not args.quiet:
         tool.print_banner()
     
     # Determine target type and execute appropriate checks
     try:
+        records = []
         if args.email:
             target_type = "email"
             if args.advanced:
-                tool.run_advanced_scan(args.target, target_type)
+                records = tool.run_advanced_scan(args.target, target_type)
             else:
                 tool.print_status("EMAIL", f"Basic email check: {args.target}", "INFO")
-                tool.check_breaches(args.target)
+                records = [tool.check_breaches(args.target)]
                 
         elif args.domain:
             target_type = "domain" 
             if args.advanced:
-                tool.run_advanced_scan(args.target, target_type)
+                records = tool.run_advanced_scan(args.target, target_type)
             else:
                 tool.print_status("DOMAIN", f"Basic domain check: {args.target}", "INFO")
-                tool.advanced_whois_lookup(args.target)
+                records = [tool.advanced_whois_lookup(args.target)]
                 
         else:
             target_type = "phone"
             if args.advanced:
-                tool.run_advanced_scan(args.target, target_type)
+                records = tool.run_advanced_scan(args.target, target_type)
             else:
                 tool.print_status("PHONE", f"Basic phone check: {args.target}", "INFO")
                 parsed = tool.validate_number(args.target)
                 if parsed:
-                    tool.get_basic_info(parsed)
+                    records = [tool.get_basic_info(parsed)]
 
-        # Legal notice
-        if not args.quiet:
-            tool.print_legal_notice()
-            
-        print(f"\n{Fore.GREEN}{Style.BRIGHT}    🎉 Investigation completed successfully!")
-        print(f"    📁 Case ID: {tool.case_id}")
+        scans.inc(target_type, "advanced" if args.advanced else "basic")
+        
+        from utils.config import load_settings
+        report_path = None
+        if records and load_settings().get("save_reports"):
+            report_path = tool.archive_report(records, kind=target_type)
+        
+        if text_mode:
+            # Legal notice
+            if not args.quiet:
+                tool.print_legal_notice()
+                
+            print(f"\n{Fore.GREEN}{Style.BRIGHT}    🎉 Investigation completed successfully!")
+            print(f"    📁 Case ID: {tool.case_id}")
+            if report_path:
+                print(f"    💾 Report archived: {report_path}")
         
     except KeyboardInterrupt:
         tool.print_status("SYSTEM", "Investigation interrupted by user", "WARNING")
@@ -442,6 +664,13 @@ def main():
     except Exception as e:
         tool.print_status("SYSTEM", f"Unexpected error: {e}", "ERROR")
         sys.exit(1)
+    finally:
+        # Interrupted or failed scans still flush what was rendered (json closes its document)
+        try:
+            tool.renderer.close()
+        finally:
+            if output_stream is not None and output_stream is not sys.stdout:
+                output_stream.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,61 @@
+import csv
+import json
+
+import pytest
+
+from modules.bulk_enrich import ENRICHED_FIELDS, BulkPhoneEnricher
+
+ROWS = [
+    {"name": "Ada", "phone": "+1 415 555 2671"},
+    {"name": "Bob", "phone": "not a number"},
+    {"name": "Cy", "phone": ""},
+]
+
+
+@pytest.fixture(scope="module")
+def enricher():
+    pytest.importorskip("phonenumbers")
+    from numintense_pro import NumIntensePro
+    return BulkPhoneEnricher(NumIntensePro(), progress_every=0)
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def test_csv_round_trip(enricher, tmp_path):
+    source, target = tmp_path / "in.csv", tmp_path / "out.csv"
+    write_csv(source, ROWS)
+    stats = enricher.run(str(source), str(target))
+    assert (stats["rows"], stats["valid"], stats["invalid"]) == (3, 1, 2)
+
+    with open(target, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        assert reader.fieldnames == ["name", "phone"] + ENRICHED_FIELDS
+        rows = list(reader)
+    assert [row["name"] for row in rows] == ["Ada", "Bob", "Cy"]
+    assert rows[0]["e164"] == "+14155552671" and rows[0]["region"] == "US" and rows[0]["valid"] == "true"
+    assert rows[1]["e164"] == "" and rows[1]["valid"] == "false"
+
+
+def test_jsonl_output_keeps_input_columns(enricher, tmp_path):
+    source, target = tmp_path / "in.csv", tmp_path / "out.jsonl"
+    write_csv(source, ROWS)
+    enricher.run(str(source), str(target))
+
+    with open(target, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    assert len(rows) == 3
+    assert rows[0]["phone"] == "+1 415 555 2671" and rows[0]["timezone"] == "America/Los_Angeles"
+    assert list(rows[2]) == ["name", "phone"] + ENRICHED_FIELDS
+
+
+def test_input_columns_named_like_enriched_fields_are_refused(enricher, tmp_path, capsys):
+    source, target = tmp_path / "in.csv", tmp_path / "out.csv"
+    write_csv(source, [{"phone": "+14155552671", "region": "West", "valid": "yes"}])
+    assert enricher.run(str(source), str(target)) is None
+    assert "region, valid" in capsys.readouterr().out
+    assert target.read_text(encoding="utf-8") == ""
@@ -0,0 +1,62 @@
+from utils import cache as cache_module
+from utils.cache import NEGATIVE, POSITIVE, ResponseCache
+
+
+def counting_loader(value):
+    calls = []
+
+    def load():
+        calls.append(1)
+        return value
+    return load, calls
+
+
+def test_positive_entries_expire_after_the_provider_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    cache = ResponseCache(path=None, ttls={"numverify": 100})
+    load, calls = counting_loader({"valid": True})
+
+    cache.fetch("numverify", "+919876543210", load, lambda data: POSITIVE)
+    now[0] += 99
+    cache.fetch("numverify", "+919876543210", load, lambda data: POSITIVE)
+    assert len(calls) == 1
+
+    now[0] += 2
+    cache.fetch("numverify", "+919876543210", load, lambda data: POSITIVE)
+    assert len(calls) == 2
+
+
+def test_negative_and_uncached_answers(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    cache = ResponseCache(path=None, ttls={"numverify": 86400}, negative_ttl=60)
+
+    negative, negative_calls = counting_loader({"valid": False})
+    for _ in range(2):
+        cache.fetch("numverify", "+10000000000", negative, lambda data: NEGATIVE)
+    assert len(negative_calls) == 1
+    now[0] += 61
+    cache.fetch("numverify", "+10000000000", negative, lambda data: NEGATIVE)
+    assert len(negative_calls) == 2
+
+    # Errors and quota rejections are classified None and never stored
+    error, error_calls = counting_loader({"error": "rate limited"})
+    for _ in range(2):
+        cache.fetch("numverify", "+919876543210", error, lambda data: None)
+    assert len(error_calls) == 2
+    assert cache.stats()["numverify"]["uncached"] == 2
+
+
+def test_entries_survive_a_restart_on_disk(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    load, calls = counting_loader({"valid": True, "carrier": "Airtel"})
+    first = ResponseCache(path=path)
+    first.fetch("numverify", "+919876543210", load)
+    first.close()
+
+    second = ResponseCache(path=path)
+    assert second.fetch("numverify", "+919876543210", load)["carrier"] == "Airtel"
+    assert len(calls) == 1
+    assert second.stats()["numverify"]["disk_hits"] == 1
+    second.close()
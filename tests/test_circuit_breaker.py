@@ -0,0 +1,58 @@
+import json
+import time
+
+import pytest
+
+from utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+def test_opens_after_threshold_and_fails_fast(tmp_path):
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=60, state_path=str(tmp_path / "b.json"))
+    breaker.record_failure("api.example")
+    assert breaker.state("api.example") == CLOSED
+    breaker.record_failure("api.example")
+    assert breaker.state("api.example") == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call("api.example")
+
+
+def test_failure_count_persists_across_runs(tmp_path):
+    path = str(tmp_path / "b.json")
+    # One failing call per CLI run must still trip the breaker on the third run
+    for _ in range(3):
+        CircuitBreaker(failure_threshold=3, state_path=path).record_failure("dead.example")
+    assert CircuitBreaker(failure_threshold=3, state_path=path).state("dead.example") == OPEN
+
+
+def test_success_clears_persisted_failures(tmp_path):
+    path = str(tmp_path / "b.json")
+    breaker = CircuitBreaker(failure_threshold=3, state_path=path)
+    breaker.record_failure("flaky.example")
+    breaker.record_success("flaky.example")
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == {}
+
+
+def test_late_failure_does_not_extend_cooldown(tmp_path):
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=60, state_path=str(tmp_path / "b.json"))
+    breaker.record_failure("slow.example")
+    opened_at = breaker.stats()["slow.example"]["opened_at"]
+    time.sleep(0.01)
+    breaker.record_failure("slow.example")  # Admitted before the circuit opened
+    assert breaker.stats()["slow.example"]["opened_at"] == opened_at
+
+
+def test_half_open_probe_closes_or_backs_off(tmp_path):
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=0.01, state_path=None)
+    breaker.record_failure("host")
+    time.sleep(0.02)
+    assert breaker.state("host") == HALF_OPEN
+    breaker.before_call("host")  # Becomes the probe
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call("host")  # Only one probe at a time
+    breaker.record_failure("host")
+    assert breaker.stats()["host"]["cooldown"] == pytest.approx(0.02)
+    time.sleep(0.03)
+    breaker.before_call("host")
+    breaker.record_success("host")
+    assert breaker.state("host") == CLOSED
@@ -0,0 +1,49 @@
+import itertools
+
+import pytest
+
+pytest.importorskip("phonenumbers")
+
+from modules.google_dorking import AdvancedDorkGenerator  # noqa: E402
+
+NUMBER = "+14155552671"
+
+
+@pytest.fixture
+def generator():
+    return AdvancedDorkGenerator()
+
+
+def test_categories_are_built_only_when_consumed(generator, monkeypatch):
+    def broken(number_variations):
+        raise AssertionError("Documents should not be generated")
+
+    monkeypatch.setattr(generator, "iter_document_dorks", broken)
+    stream = generator.iter_dorks(NUMBER)
+    category, dorks = next(stream)
+    assert category == "Social Media" and next(dorks)[1].startswith('intext:"+14155552671"')
+    with pytest.raises(AssertionError):
+        next(stream)
+
+
+def test_limits_and_category_subsets_apply_while_generating(generator):
+    limited = generator.generate_all_dorks(NUMBER, max_dorks_per_category=2)
+    full = generator.generate_all_dorks(NUMBER)
+    assert list(limited) == list(generator.categories)
+    for category, dorks in limited.items():
+        assert dorks == full[category][:2]
+
+    subset = [category for category, _ in generator.iter_dorks(NUMBER, categories=["Advanced", "Forums"])]
+    assert subset == ["Advanced", "Forums"]
+
+
+def test_search_urls_stream_matches_the_nested_report(generator):
+    dorks = generator.generate_all_dorks(NUMBER, max_dorks_per_category=1)
+    nested = generator.generate_search_urls(dorks)
+    streamed = list(generator.iter_search_urls(generator.iter_dorks(NUMBER, max_dorks_per_category=1)))
+    assert len(streamed) == len(dorks) * len(generator.search_engines)
+    for engine, category, name, url in streamed:
+        assert (name, url) in nested[engine][category]
+
+    only_bing = list(itertools.islice(generator.iter_search_urls(dorks, engines=["Bing"]), 3))
+    assert {engine for engine, *_ in only_bing} == {"Bing"}
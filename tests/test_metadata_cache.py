@@ -0,0 +1,33 @@
+import phonenumbers
+from phonenumbers import carrier, geocoder, timezone
+
+from utils.metadata_cache import PhoneMetadataCache
+
+
+def direct(parsed):
+    return {
+        'country': geocoder.description_for_number(parsed, "en"),
+        'region': phonenumbers.region_code_for_number(parsed),
+        'carrier': carrier.name_for_number(parsed, "en"),
+        'timezones': tuple(timezone.time_zones_for_number(parsed)),
+    }
+
+
+def test_numbers_in_one_allocation_block_share_an_entry():
+    cache = PhoneMetadataCache()
+    first = phonenumbers.parse("+919876543210")
+    second = phonenumbers.parse("+919876000001")
+    assert cache.make_key(first) == cache.make_key(second)
+    assert cache.lookup(first) == direct(first)
+    assert cache.lookup(second) == direct(second)
+    assert cache.stats()['hits'] == 1
+
+
+def test_shared_country_codes_are_keyed_by_region():
+    cache = PhoneMetadataCache()
+    new_york = phonenumbers.parse("+12125550123")
+    toronto = phonenumbers.parse("+14165550123")
+    jamaica = phonenumbers.parse("+18765550123")
+    for parsed in (new_york, toronto, jamaica):
+        assert cache.lookup(parsed) == direct(parsed)
+    assert cache.stats()['misses'] == 3
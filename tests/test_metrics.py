@@ -0,0 +1,80 @@
+import os
+
+from utils.metrics import MetricsRegistry, _escape, _format_labels, _format_value, get_metrics
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ("host",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        latency.observe("api.example", value=value)
+
+    samples = {(name, labels.get("le")): value for name, labels, value in latency.samples()}
+    assert samples[("numintense_latency_seconds_bucket", "0.1")] == 2
+    assert samples[("numintense_latency_seconds_bucket", "1")] == 3
+    assert samples[("numintense_latency_seconds_bucket", "+Inf")] == 4
+    assert samples[("numintense_latency_seconds_count", None)] == 4
+    assert abs(samples[("numintense_latency_seconds_sum", None)] - 2.65) < 1e-9
+
+
+def test_value_and_label_formatting():
+    assert _format_value(3.0) == "3"
+    assert _format_value(0.25) == "0.25"
+    assert _format_value(float("inf")) == "+Inf"
+    assert _escape('a"b\\c\nd') == 'a\\"b\\\\c\\nd'
+    assert _format_labels({}) == ""
+    assert _format_labels({"host": 'x"y', "outcome": "2xx"}) == '{host="x\\"y",outcome="2xx"}'
+
+
+def test_render_exposition_format():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests", ("host",)).inc("api.example", amount=2)
+    registry.register_collector(lambda: [("ratio", "gauge", "Ratio", [({}, 0.5)])])
+    lines = registry.render().splitlines()
+    assert lines == [
+        "# HELP numintense_requests_total Requests",
+        "# TYPE numintense_requests_total counter",
+        'numintense_requests_total{host="api.example"} 2',
+        "# HELP numintense_ratio Ratio",
+        "# TYPE numintense_ratio gauge",
+        "numintense_ratio 0.5",
+    ]
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+    counter = registry.counter("requests_total", "Requests", ("host",))
+    counter.inc("api.example")
+    registry.histogram("latency_seconds", "Latency").observe(value=1.0)
+    assert counter.value("api.example") == 0.0
+    assert "numintense_requests_total{" not in registry.render()
+
+
+def test_collector_registered_once():
+    registry = MetricsRegistry()
+
+    def collector():
+        return [("ratio", "gauge", "Ratio", [({}, 1)])]
+
+    registry.register_collector(collector)
+    registry.register_collector(collector)
+    assert registry.render().count("# TYPE numintense_ratio gauge") == 1
+
+
+def test_metadata_cache_family_appears_once_for_several_tools():
+    from numintense_pro import NumIntensePro
+    for tool in (NumIntensePro(), NumIntensePro()):
+        tool.metadata_cache.stats()
+    rendered = get_metrics().render()
+    assert rendered.count("# TYPE numintense_metadata_cache_requests_total") == 1
+    assert rendered.count("# TYPE numintense_metadata_cache_hit_ratio") == 1
+
+
+def test_write_textfile_is_atomic(tmp_path):
+    registry = MetricsRegistry()
+    registry.gauge("open_circuits", "Open circuits").set(value=3)
+    path = str(tmp_path / "collector" / "numintense.prom")
+    assert registry.write_textfile(path) == path
+    with open(path, encoding="utf-8") as f:
+        assert "numintense_open_circuits 3" in f.read()
+    assert os.listdir(os.path.dirname(path)) == ["numintense.prom"]
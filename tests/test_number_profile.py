@@ -0,0 +1,42 @@
+import pytest
+
+from utils.number_profile import NumberProfile, default_region, number_profile
+from utils.spam_rules import split_number
+
+
+def test_bare_number_uses_tool_default_region():
+    profile = NumberProfile("9876543210")
+    assert default_region() == "IN"
+    assert profile.valid
+    assert profile.e164 == "+919876543210"
+    assert profile.region == "IN"
+
+
+@pytest.mark.parametrize("raw", ["+919876543210", "919876543210", "09876543210", "+91 98765-43210"])
+def test_every_written_form_gives_the_same_number(raw):
+    assert number_profile(raw).e164 == "+919876543210"
+
+
+def test_invalid_number_only_reformats_typed_digits():
+    profile = NumberProfile("+98 7654 3210")
+    assert not profile.valid
+    assert profile.region is None
+    assert set(profile.variations) == {"+98 7654 3210", "+9876543210", "+98-7654-3210", "9876543210"}
+    # No guessed national forms of a wrongly parsed number
+    assert "76543210" not in profile.variations
+
+
+def test_explicit_region_overrides_default():
+    assert NumberProfile("2015550123", "US").e164 == "+12015550123"
+
+
+def test_profiles_are_immutable_and_memoized():
+    profile = number_profile("+919876543210")
+    assert number_profile("+919876543210") is profile
+    assert number_profile(profile) is profile
+    with pytest.raises(AttributeError):
+        profile.e164 = "+1"
+
+
+def test_split_number_shares_the_default_region():
+    assert split_number("9876543210") == (91, "9876543210")
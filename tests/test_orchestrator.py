@@ -0,0 +1,85 @@
+import threading
+import time
+
+from modules.records import ProbeError
+from utils.orchestrator import Probe, ProbeOrchestrator
+
+
+def sleeper(value, delay=0.0):
+    time.sleep(delay)
+    return value
+
+
+def failing():
+    raise ConnectionError("reset by peer")
+
+
+def test_results_come_back_in_probe_order():
+    orchestrator = ProbeOrchestrator(max_workers=4, deadline=None)
+    probes = [Probe(f"p{i}", sleeper, i, delay=0.05 * (3 - i)) for i in range(4)]
+    assert orchestrator.run(probes) == [0, 1, 2, 3]
+    assert orchestrator.run([]) == []
+
+
+def test_deadline_yields_on_timeout_and_sets_cancel():
+    orchestrator = ProbeOrchestrator(deadline=0.1)
+    cancel = threading.Event()
+    probes = [Probe("fast", sleeper, "fast"),
+              Probe("slow", sleeper, "slow", delay=1.0, on_timeout=lambda: "timed out"),
+              Probe("bare", sleeper, "bare", delay=1.0)]
+    started = time.monotonic()
+    assert orchestrator.run(probes, cancel=cancel) == ["fast", "timed out", None]
+    assert time.monotonic() - started < 0.5
+    assert cancel.is_set()
+
+
+def test_quorum_stops_once_enough_results_were_accepted():
+    orchestrator = ProbeOrchestrator(deadline=5.0)
+    cancel = threading.Event()
+    probes = [Probe("empty", sleeper, None),
+              Probe("a", sleeper, "a", delay=0.02),
+              Probe("b", sleeper, "b", delay=0.04),
+              Probe("slow", sleeper, "slow", delay=1.0, on_timeout=lambda: "abandoned")]
+    started = time.monotonic()
+    results = orchestrator.run(probes, quorum=2, cancel=cancel)
+    assert time.monotonic() - started < 0.5
+    assert results == [None, "a", "b", "abandoned"]
+    assert cancel.is_set()
+
+
+def test_quorum_not_reached_waits_for_all_without_cancelling():
+    orchestrator = ProbeOrchestrator(deadline=5.0)
+    cancel = threading.Event()
+    probes = [Probe("a", sleeper, "a"), Probe("b", sleeper, 0)]
+    assert orchestrator.run(probes, quorum=2, accept=lambda result: result == "a", cancel=cancel) == ["a", 0]
+    assert not cancel.is_set()
+
+
+def test_raised_exceptions_go_through_on_error():
+    orchestrator = ProbeOrchestrator(deadline=None)
+    probes = [Probe("Tellows", failing,
+                    on_error=lambda error: ProbeError(target="+1", probe="Tellows", error=repr(error))),
+              Probe("bare", failing)]
+    record, bare = orchestrator.run(probes)
+    assert record == ProbeError(target="+1", probe="Tellows", error="ConnectionError('reset by peer')")
+    assert record.kind == "probe_error"
+    assert isinstance(bare, ConnectionError)
+
+
+def test_per_host_limit_serialises_probes_against_one_host():
+    orchestrator = ProbeOrchestrator(max_workers=4, per_host_limit=1, deadline=None)
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def tracked():
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.03)
+        with lock:
+            active["now"] -= 1
+
+    probes = [Probe(f"p{i}", tracked, url=f"https://api.example.com/{i}") for i in range(4)]
+    orchestrator.run(probes)
+    assert active["peak"] == 1
+    assert probes[0].host == "api.example.com"
@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from utils.prefix_index import PrefixIndex
+
+
+def write_prefixes(path, entries):
+    path.write_text(json.dumps({"version": "test", "entries": entries}), encoding="utf-8")
+    return str(path)
+
+
+def test_lookup_returns_every_prefix_shortest_first(tmp_path):
+    index = PrefixIndex(write_prefixes(tmp_path / "prefixes.json", [
+        {"prefix": "1900", "id": "nanp.premium", "category": "premium_rate"},
+        {"prefix": "1", "id": "nanp", "category": "zone"},
+        {"prefix": "1900555", "id": "nanp.premium.555", "category": "premium_rate"},
+        {"prefix": "882", "id": "intl.network"},
+    ]))
+    assert index.version == "test" and index.size == 4
+    assert [entry.rule_id for entry in index.lookup("19005551234")] == ["nanp", "nanp.premium", "nanp.premium.555"]
+    assert index.longest_match("19001234567").rule_id == "nanp.premium"
+    assert index.longest_match("4420") is None
+    assert index.lookup("882")[0].category == "high_risk"
+    assert index.categories() == {"premium_rate": 2, "zone": 1, "high_risk": 1}
+
+
+def test_duplicate_prefixes_replace_and_bad_prefixes_are_rejected(tmp_path):
+    index = PrefixIndex(write_prefixes(tmp_path / "prefixes.json", [
+        {"prefix": "44", "id": "old"}, {"prefix": "44", "id": "new"}]))
+    assert index.size == 1 and index.longest_match("447700").rule_id == "new"
+    with pytest.raises(ValueError):
+        PrefixIndex(write_prefixes(tmp_path / "bad.json", [{"prefix": "+44", "id": "plus"}]))
+
+
+def test_bundled_prefixes_load():
+    index = PrefixIndex()
+    assert index.size > 0
+    assert index.longest_match("12425551234").category == "one_ring_scam"
@@ -0,0 +1,118 @@
+import json
+import os
+
+from apis.providers import DEFAULT_PROVIDERS, ProviderRegistry, configured
+
+
+def test_config_overrides_quota_and_cost():
+    numverify = next(provider for provider in DEFAULT_PROVIDERS if provider.name == "numverify")
+    provider = configured(numverify, {"quota": 1000, "cost": 0.5, "quota_period": 86400})
+    assert (provider.quota, provider.cost, provider.quota_period) == (1000, 0.5, 86400.0)
+    assert configured(numverify, {"quota": None}).quota is None
+    # The declared provider is left untouched, and bad values are ignored
+    assert numverify.quota == 100
+    assert configured(numverify, {"quota": "lots"}) is numverify
+
+
+def test_quota_from_config_applies_to_routing(tmp_path):
+    numverify = configured(DEFAULT_PROVIDERS[1], {"quota": 1})
+    registry = ProviderRegistry(providers=[numverify], api_keys={"numverify": "key"},
+                                state_path=str(tmp_path / "stats.json"))
+    assert registry.unavailable_reason(numverify) is None
+    registry.record("numverify", 0.1, False)
+    assert registry.unavailable_reason(numverify) == "NumVerify quota exhausted"
+
+
+def test_statistics_are_saved_on_flush_not_per_call(tmp_path):
+    path = str(tmp_path / "stats.json")
+    registry = ProviderRegistry(providers=list(DEFAULT_PROVIDERS), api_keys={}, state_path=path)
+    for _ in range(5):
+        registry.record("numspy", 0.2, False)
+    assert not os.path.exists(path)
+
+    registry.flush()
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["numspy"]["calls"] == 5
+    restored = ProviderRegistry(providers=list(DEFAULT_PROVIDERS), api_keys={}, state_path=path)
+    assert restored.stats()["numspy"]["calls"] == 5
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+    def json(self):
+        return self.data
+
+
+class CancellingTransport:
+    """Answers, but the caller stops waiting while the response headers arrive"""
+
+    def __init__(self, cancel):
+        self.cancel = cancel
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        self.cancel.set()
+        return FakeResponse({"valid": True})
+
+
+def test_cancelled_call_still_counts_toward_the_quota(tmp_path):
+    import threading
+    from utils.cache import ResponseCache
+
+    cancel = threading.Event()
+    transport = CancellingTransport(cancel)
+    numverify = configured(DEFAULT_PROVIDERS[1], {"quota": 1})
+    registry = ProviderRegistry(providers=[numverify], api_keys={"numverify": "key"}, transport=transport,
+                                cache=ResponseCache(path=None), state_path=None)
+
+    assert registry.query("numverify", "+919876543210", cancel=cancel) == {"error": "Cancelled"}
+    assert transport.calls == 1
+    stats = registry.stats()["numverify"]
+    assert stats["calls"] == 1 and stats["window_calls"] == 1 and stats["error_rate"] == 0
+    assert stats["unavailable"] == "NumVerify quota exhausted"
+
+
+class RecordingTransport:
+    def __init__(self):
+        self.kwargs = None
+
+    def get(self, url, **kwargs):
+        self.kwargs = kwargs
+        return FakeResponse({"valid": True})
+
+    def client(self, headers=None):
+        return self
+
+
+def test_caller_headers_are_sent_with_the_request():
+    from utils.cache import ResponseCache
+
+    transport = RecordingTransport()
+    registry = ProviderRegistry(providers=[DEFAULT_PROVIDERS[1]], api_keys={"numverify": "key"},
+                                transport=transport, cache=ResponseCache(path=None), state_path=None)
+    assert registry.query("numverify", "+919876543210", headers={"User-Agent": "NumIntense"}) == {"valid": True}
+    assert transport.kwargs["headers"] == {"User-Agent": "NumIntense"}
+
+
+def test_placeholder_keys_count_as_missing():
+    from apis.secure_api import PhoneAPI
+    from utils.cache import ResponseCache
+
+    transport = RecordingTransport()
+    registry = ProviderRegistry(providers=list(DEFAULT_PROVIDERS), api_keys={"numverify": "YOUR_API_KEY_HERE"},
+                                transport=transport, cache=ResponseCache(path=None), state_path=None)
+    phone_api = PhoneAPI(config_file="missing.json", transport=transport, cache=ResponseCache(path=None),
+                         registry=registry)
+    assert phone_api.numverify_lookup("+919876543210") == {"error": "NumVerify API key not configured"}
+    assert registry.query("numverify", "+919876543210", api_key="YOUR_API_KEY_HERE") == \
+        {"error": "NumVerify API key not configured"}
+    assert transport.kwargs is None
@@ -0,0 +1,75 @@
+import threading
+import time
+
+from utils.rate_limiter import RateLimiter, TokenBucket
+
+
+def test_bucket_allows_burst_then_queues_waiters():
+    bucket = TokenBucket(burst=2)
+    assert bucket.reserve(1.0) == 0.0
+    assert bucket.reserve(1.0) == 0.0
+    # Each further caller owes one more interval than the one before it
+    assert 0.9 < bucket.reserve(1.0) <= 1.0
+    assert 1.9 < bucket.reserve(1.0) <= 2.0
+
+
+def test_requests_to_one_host_are_spaced():
+    limiter = RateLimiter(delay=0.05)
+    started = time.monotonic()
+    for _ in range(3):
+        limiter.acquire("api.example")
+    assert time.monotonic() - started >= 0.1
+    # Other hosts have their own bucket
+    assert limiter.acquire("other.example") == 0.0
+
+
+def test_concurrent_callers_share_one_bucket():
+    limiter = RateLimiter(delay=0.05)
+    threads = [threading.Thread(target=limiter.acquire, args=("api.example",)) for _ in range(4)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - started >= 0.15
+
+
+def test_host_override_and_pace_floor():
+    limiter = RateLimiter(delay=0.0, host_delays={"example.com": 2.0})
+    assert limiter.interval_for("api.example.com") == 2.0
+    assert limiter.interval_for("example.org") == 0.0
+    with limiter.pace(0.5):
+        assert limiter.interval_for("example.org") == 0.5
+        assert limiter.interval_for("example.com") == 2.0
+    assert limiter.interval_for("example.org") == 0.0
+
+
+def test_pace_floor_only_covers_the_batch_hosts():
+    limiter = RateLimiter(delay=0.0)
+    with limiter.pace(3.0, hosts=["whois:com", "apilayer.net"]):
+        assert limiter.interval_for("whois:com") == 3.0
+        assert limiter.interval_for("api.apilayer.net") == 3.0
+        assert limiter.interval_for("whois:org") == 0.0
+        assert limiter.interval_for("www.tellows.com") == 0.0
+        with limiter.pace(1.0):
+            assert limiter.interval_for("www.tellows.com") == 1.0
+            assert limiter.interval_for("whois:com") == 3.0
+    assert limiter.interval_for("whois:com") == 0.0
+
+
+def test_tokens_refill_at_one_per_interval(monkeypatch):
+    from utils import rate_limiter
+    now = [100.0]
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(burst=2)
+    assert bucket.reserve(1.0) == 0.0
+    assert bucket.reserve(1.0) == 0.0
+    now[0] += 0.5
+    assert bucket.reserve(1.0) == 0.5  # Half a token refilled, half an interval to wait
+    now[0] += 0.5
+    assert bucket.reserve(1.0) == 1.0  # The previous waiter took the refilled token
+    now[0] += 10.0
+    # Refill is capped at the burst size
+    assert bucket.reserve(1.0) == 0.0
+    assert bucket.reserve(1.0) == 0.0
+    assert bucket.reserve(1.0) == 1.0
@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from modules.records import BreachResult, ProbeError, SocialResult, SpamResult, WhoisRecord
+from modules.renderers import TerminalRenderer, get_renderer
+
+
+def test_records_compare_by_type_and_fields():
+    result = SpamResult(target="+1", source="Tellows", status="No Data")
+    assert result == SpamResult(target="+1", source="Tellows", status="No Data")
+    assert result != SpamResult(target="+1", source="Tellows", status="Data Available")
+    # Same fields, different record type
+    assert ProbeError(target="+1", probe="Tellows", error=None) != \
+        SocialResult(target="+1", platform="Tellows", url=None, status=None)
+    assert result != {"target": "+1", "source": "Tellows", "status": "No Data"}
+
+
+def test_records_are_unhashable_like_the_dicts_they_replaced():
+    with pytest.raises(TypeError):
+        hash(SpamResult(target="+1"))
+    with pytest.raises(TypeError):
+        {SpamResult(target="+1")}
+
+
+def test_mapping_access_and_unknown_fields():
+    result = SocialResult(target="+1", platform="Telegram")
+    assert result["platform"] == "Telegram" and result.get("status") is None
+    assert "url" in result and list(result) == ["target", "platform", "url", "status"]
+    with pytest.raises(KeyError):
+        result["missing"]
+    with pytest.raises(TypeError):
+        SpamResult(target="+1", score=3)
+
+
+def records():
+    return [
+        SpamResult(target="+1", source="Tellows", status="No Data"),
+        BreachResult(target="a@example.com", status="breached", count=1,
+                     breaches=[{"Name": "Example", "BreachDate": "2020-01-01"}]),
+        WhoisRecord(domain="example.com", name_servers=["ns1", "ns2"], creation_date=datetime(2000, 1, 2)),
+    ]
+
+
+def test_jsonl_and_json_renderers_tag_records():
+    stream = io.StringIO()
+    renderer = get_renderer("jsonl", stream, case_id="NIP-1")
+    renderer.render(records())
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["record"] for line in lines] == ["spam_result", "breach_result", "whois"]
+    assert lines[2]["creation_date"] == "2000-01-02T00:00:00" and lines[2]["case_id"] == "NIP-1"
+
+    stream = io.StringIO()
+    renderer = get_renderer("json", stream, case_id="NIP-1")
+    renderer.render(records())
+    renderer.close()
+    document = json.loads(stream.getvalue())
+    assert document["case_id"] == "NIP-1"
+    assert document["records"][0] == records()[0].to_dict()
+
+
+def test_csv_renderer_writes_one_row_per_field():
+    stream = io.StringIO()
+    get_renderer("csv", stream, case_id="NIP-1").render(records())
+    rows = list(csv.reader(io.StringIO(stream.getvalue())))
+    assert rows[0] == ["case_id", "record", "field", "value"]
+    fields = {(row[1], row[2]): row[3] for row in rows[1:]}
+    assert fields[("spam_result", "status")] == "No Data"
+    assert fields[("whois", "name_servers")] == "ns1|ns2"
+    assert json.loads(fields[("breach_result", "breaches")])[0]["Name"] == "Example"
+    assert fields[("whois", "registrar")] == ""
+
+
+def test_terminal_renderer_handles_error_records():
+    stream = io.StringIO()
+    TerminalRenderer(stream).render([ProbeError(target="+1", probe="Facebook", error="ConnectionError()")])
+    assert "Facebook: ConnectionError()" in stream.getvalue()
+    with pytest.raises(ValueError):
+        get_renderer("xml")
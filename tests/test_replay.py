@@ -0,0 +1,99 @@
+import json
+
+import pytest
+import requests
+
+from utils.circuit_breaker import CircuitBreaker
+from utils.rate_limiter import RateLimiter
+from utils.replay import (Cassette, CassetteMiss, FaultInjector, ReplayAdapter, install_replay,
+                          query_whois_server, request_key)
+from utils.standin_server import StandInServer
+from utils.transport import HTTPTransport
+
+VALIDATE_URL = "https://apilayer.net/api/validate?number=919876543210&format=1"
+
+
+@pytest.fixture
+def cassette(tmp_path):
+    cassette = Cassette(str(tmp_path / "cassette.json"))
+    cassette.add("GET", VALIDATE_URL + "&access_key=secret", 200, {"Content-Type": "application/json",
+                                                                   "Set-Cookie": "session=1"},
+                 json.dumps({"valid": True, "carrier": "Airtel"}).encode(), latency=0.25)
+    cassette.add_whois("example.com", "Domain Name: EXAMPLE.COM\r\nRegistrar: Example Registrar\r\n")
+    return cassette
+
+
+def replay_session(cassette, **faults):
+    session = requests.Session()
+    adapter = ReplayAdapter(cassette, "replay", FaultInjector(**faults))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def offline_transport(options):
+    transport = HTTPTransport(limiter=RateLimiter(0), breaker=CircuitBreaker(state_path=None))
+    install_replay(transport.session, options)
+    return transport
+
+
+def test_request_key_strips_secrets_and_sorts_the_query():
+    key = request_key("get", "https://API.example.com/v1?token=t&b=2&api_key=k&a=1&access_key=x&apikey=y&key=z")
+    assert key == "GET https://api.example.com/v1?a=1&b=2"
+
+
+def test_cassette_never_stores_secrets(cassette):
+    cassette.save()
+    with open(cassette.path, encoding="utf-8") as f:
+        text = f.read()
+    assert "secret" not in text and "access_key" not in text
+    # Only the whitelisted response headers are kept
+    assert "Set-Cookie" not in text
+
+
+def test_replay_hit_serves_the_recorded_response(cassette):
+    # The key in the live request differs from the recorded one; both are stripped
+    response = replay_session(cassette).get(VALIDATE_URL + "&access_key=other")
+    assert response.status_code == 200
+    assert response.json() == {"valid": True, "carrier": "Airtel"}
+    assert response.headers["Content-Type"] == "application/json"
+
+
+def test_replay_miss_raises(cassette):
+    with pytest.raises(CassetteMiss):
+        replay_session(cassette).get("https://apilayer.net/api/validate?number=1")
+
+
+def test_fault_injector_is_reproducible_for_a_seed():
+    def faults(seed):
+        injector = FaultInjector(jitter=1.0, error_rate=0.5, seed=seed)
+        return [(injector.delay_for("api.example"), injector.should_fail()) for _ in range(20)]
+
+    assert faults(7) == faults(7)
+    assert faults(7) != faults(8)
+    failures = [failed for _, failed in faults(7)]
+    assert any(failures) and not all(failures)
+
+
+def test_injected_errors_surface_as_connection_errors(cassette):
+    with pytest.raises(requests.ConnectionError):
+        replay_session(cassette, error_rate=1.0).get(VALIDATE_URL)
+
+
+def test_standin_server_round_trip_through_transport_client(cassette):
+    with StandInServer(cassette, port=0, whois_port=0) as server:
+        transport = offline_transport({"mode": "standin", "server": server.url})
+        client = transport.client({"User-Agent": "NumIntense-Test"})
+        try:
+            response = client.get(VALIDATE_URL + "&access_key=anything", timeout=5)
+            assert response.status_code == 200
+            assert response.json()["carrier"] == "Airtel"
+
+            missing = client.get("https://apilayer.net/api/validate?number=1", timeout=5)
+            assert missing.status_code == 404
+
+            assert "Example Registrar" in query_whois_server("example.com", server.whois_address, timeout=5)
+            assert "No match" in query_whois_server("unknown.org", server.whois_address, timeout=5)
+        finally:
+            transport.close()
+    assert server.stats == {'served': 2, 'missed': 2, 'failed': 0}
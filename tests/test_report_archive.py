@@ -0,0 +1,65 @@
+import gzip
+import os
+import time
+
+from utils.report_archive import DAY, ReportArchive
+
+
+def age(path, seconds):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_store_is_sharded_and_deduplicated(tmp_path):
+    archive = ReportArchive(str(tmp_path))
+    first = archive.store("NIP-1", "same body", "jsonl", prefix="phone")
+    assert archive.store("NIP-1", "same body", "jsonl", prefix="phone") == first
+    relative = os.path.relpath(first, str(tmp_path)).split(os.sep)
+    assert len(relative) == 3 and all(len(part) == 2 for part in relative[:2])
+    assert relative[2].startswith("phone_NIP-1_")
+
+
+def test_rotate_compresses_expires_and_evicts(tmp_path):
+    archive = ReportArchive(str(tmp_path), compress_after=DAY, max_age=30 * DAY, max_bytes=None)
+    fresh = archive.store("C", "fresh")
+    old = archive.store("C", "old")
+    expired = archive.store("C", "expired")
+    age(old, 2 * DAY)
+    age(expired, 31 * DAY)
+
+    stats = archive.rotate()
+
+    assert stats['compressed'] == 1 and stats['expired'] == 1
+    assert os.path.exists(fresh)
+    with gzip.open(old + ".gz", 'rt') as f:
+        assert f.read() == "old"
+    assert not os.path.exists(expired)
+
+
+def test_size_cap_evicts_oldest_first(tmp_path):
+    archive = ReportArchive(str(tmp_path), compress_after=None, max_age=None, max_bytes=10)
+    older = archive.store("C", "x" * 8)
+    age(older, 60)
+    newer = archive.store("C", "y" * 8)
+    archive.rotate()
+    assert not os.path.exists(older)
+    assert os.path.exists(newer)
+
+
+def test_rotation_leaves_files_outside_the_shards_alone(tmp_path):
+    archive = ReportArchive(str(tmp_path), compress_after=DAY, max_age=30 * DAY, max_bytes=None)
+    legacy = tmp_path / "spam_report_20240101_120000.txt"
+    legacy.write_text("flat report from an older version")
+    age(str(legacy), 90 * DAY)
+    user_dir = tmp_path / "my-notes"
+    user_dir.mkdir()
+    stored = archive.store("C", "archived")
+    age(stored, 90 * DAY)
+
+    archive.rotate()
+
+    assert legacy.read_text() == "flat report from an older version"
+    assert user_dir.is_dir()
+    assert not os.path.exists(stored)
+    # The emptied shard directories are pruned
+    assert not os.path.exists(os.path.dirname(stored))
@@ -0,0 +1,53 @@
+import gzip
+import json
+import os
+import stat
+
+import pytest
+
+from utils.report_sink import ReportSink
+
+
+def test_destination_only_changes_on_close(tmp_path):
+    path = tmp_path / "reports.jsonl"
+    path.write_text('{"target": "old"}\n', encoding="utf-8")
+
+    sink = ReportSink(str(path))
+    sink.write({"report": "phone", "target": "+919876543210"})
+    sink.stream.flush()
+    assert path.read_text(encoding="utf-8") == '{"target": "old"}\n'
+
+    sink.close()
+    assert [json.loads(line)["target"] for line in path.read_text(encoding="utf-8").splitlines()] == ["+919876543210"]
+    assert os.listdir(tmp_path) == ["reports.jsonl"]
+
+
+def test_failure_leaves_destination_untouched(tmp_path):
+    path = tmp_path / "reports.csv"
+    path.write_text("previous\n", encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        with ReportSink(str(path)) as sink:
+            sink.write({"report": "phone", "target": "+919876543210", "valid": True})
+            raise RuntimeError("scan failed")
+    assert path.read_text(encoding="utf-8") == "previous\n"
+    assert os.listdir(tmp_path) == ["reports.csv"]
+
+
+def test_append_keeps_gzip_members(tmp_path):
+    path = str(tmp_path / "reports.jsonl.gz")
+    for target in ("first", "second"):
+        with ReportSink(path, append=True) as sink:
+            sink.write({"target": target})
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert [json.loads(line)["target"] for line in f] == ["first", "second"]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permission bits")
+def test_committed_file_follows_the_umask(tmp_path):
+    previous = os.umask(0o027)
+    try:
+        with ReportSink(str(tmp_path / "reports.txt")) as sink:
+            sink.write({"target": "x"})
+    finally:
+        os.umask(previous)
+    assert stat.S_IMODE(os.stat(tmp_path / "reports.txt").st_mode) == 0o640
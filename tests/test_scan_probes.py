@@ -0,0 +1,66 @@
+import io
+import time
+
+import pytest
+
+pytest.importorskip("phonenumbers")
+
+from modules.records import ProbeError, SocialResult, SpamResult  # noqa: E402
+from modules.renderers import TerminalRenderer  # noqa: E402
+from numintense_pro import NumIntensePro  # noqa: E402
+
+NUMBER = "+14155552671"
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, text=""):
+        self.status_code = status_code
+        self.text = text
+
+
+class FakeSession:
+    """Tellows hangs past the deadline; Facebook has a profile; Telegram does not"""
+
+    def get(self, url, **kwargs):
+        time.sleep(1.0)
+        return FakeResponse(text="score: 9")
+
+    def head(self, url, **kwargs):
+        return FakeResponse(200 if "facebook" in url else 404)
+
+
+class FakeTransport:
+    def client(self, headers=None):
+        return FakeSession()
+
+
+def make_tool():
+    return NumIntensePro(renderer=TerminalRenderer(io.StringIO()), scan_deadline=0.3, transport=FakeTransport())
+
+
+def test_probes_run_concurrently_and_slow_ones_time_out():
+    tool = make_tool()
+    probes = tool.spam_probes(NUMBER) + tool.social_probes(NUMBER)
+    started = time.monotonic()
+    results = tool.run_probes(probes)
+    assert time.monotonic() - started < 0.9
+    assert results == [
+        SpamResult(target=NUMBER, source="Tellows", status="Timed Out"),
+        SocialResult(target=NUMBER, platform="Facebook", url="https://www.facebook.com/14155552671",
+                     status="Possible Profile Found"),
+        SocialResult(target=NUMBER, platform="Telegram", url="https://t.me/14155552671",
+                     status="No Direct Profile"),
+    ]
+
+
+def test_a_probe_that_raises_becomes_an_error_record(monkeypatch):
+    tool = make_tool()
+
+    def broken(number, platform, url):
+        raise RuntimeError(f"{platform} parser broke")
+
+    monkeypatch.setattr(tool, "probe_social", broken)
+    results = tool.check_social_presence(NUMBER)
+    assert results == [ProbeError(target=NUMBER, probe="Facebook", error="RuntimeError('Facebook parser broke')"),
+                       ProbeError(target=NUMBER, probe="Telegram", error="RuntimeError('Telegram parser broke')")]
+    assert "Telegram: RuntimeError('Telegram parser broke')" in tool.renderer.stream.getvalue()
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from modules.spam_check import BATCH_FEATURES, AdvancedSpamChecker, ascii_digits
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture(scope="module")
+def checker():
+    return AdvancedSpamChecker(verbose=False)
+
+
+def sample_numbers():
+    rng = random.Random(42)
+    numbers = ["+919999999999", "+14151234567", "+4420 7000 0001", "+919876123123", "12345",
+               "", "+1 (800) 555-0000", "+٩١٩٨٧٦٥٤٣٢١٠", "+９１９８７６５４３２１０", "0000000"]
+    for _ in range(500):
+        length = rng.randint(3, 18)
+        digits = [str(rng.randint(0, 9))]
+        for _ in range(length - 1):
+            # Bias towards repeats, steps and zeros so every feature fires
+            roll = rng.random()
+            last = int(digits[-1])
+            if roll < 0.3:
+                digits.append(str(last))
+            elif roll < 0.5:
+                digits.append(str((last + 1) % 10))
+            elif roll < 0.6:
+                digits.append("0")
+            else:
+                digits.append(str(rng.randint(0, 9)))
+        numbers.append("+" + "".join(digits))
+    return numbers
+
+
+def test_unicode_digits_are_normalised(checker):
+    assert ascii_digits("+٩١ ٩٨٧٦٥-٤٣٢١٠") == "919876543210"
+    assert ascii_digits("+９１９８７６５４３２１０") == "919876543210"
+    matrix = checker.digit_matrix(["+٩١٩٨٧٦٥٤٣٢١٠", "+919876543210"])
+    assert (matrix[0] == matrix[1]).all()
+
+
+def test_score_batch_matches_the_per_number_scorer(checker):
+    numbers = sample_numbers()
+    features, scores = checker.score_batch(numbers)
+    assert features.shape == (len(numbers), len(BATCH_FEATURES))
+    for row, number in enumerate(numbers):
+        expected_features, expected_score = checker.score_number(number)
+        assert list(features[row]) == expected_features, number
+        assert scores[row] == pytest.approx(expected_score, abs=1e-6), number
+    # The sample exercises every feature
+    assert features.any(axis=0).all()
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from utils.spam_rules import CompiledRulePack, SpamRuleEngine, split_number
+
+
+def test_one_pass_reports_every_matching_rule_in_pack_order():
+    pack = CompiledRulePack([
+        {"id": "zeros", "pattern": r"\d{3}000\d{4}"},
+        {"id": "repeat", "pattern": r"(?P<block>\d{3})(?P=block)\d{4}", "description": "Block {block} repeats"},
+        {"id": "premium", "pattern": r"900\d{7}"},
+    ])
+    assert pack.match("9009001234") == [("repeat", "Block 900 repeats"), ("premium", "premium")]
+    assert pack.match("2120001234") == [("zeros", "zeros")]
+    assert pack.match("212555") == []
+
+
+def test_rules_may_reuse_group_names_but_not_numbered_groups():
+    pack = CompiledRulePack([
+        {"id": "a", "pattern": r"(?P<d>\d)(?P=d)\d*"},
+        {"id": "b", "pattern": r"\d(?P<d>\d)(?P=d)\d*", "description": "{d}{d}"},
+    ])
+    assert pack.match("1223") == [("b", "22")]
+    with pytest.raises(ValueError):
+        CompiledRulePack([{"id": "numbered", "pattern": r"(\d)\1"}])
+
+
+def test_country_packs_include_the_universal_rules(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"version": 7, "packs": {
+        "*": {"rules": [{"id": "any.zeros", "pattern": r"0+"}]},
+        "44": {"name": "United Kingdom", "rules": [{"id": "uk.premium", "pattern": r"9\d{9}"}]},
+    }}), encoding="utf-8")
+    engine = SpamRuleEngine(str(path))
+    assert engine.version == 7 and engine.pack_names["44"] == "United Kingdom"
+    assert engine.match_rule_ids(44, "9000000000") == ["uk.premium"]
+    assert engine.match_rule_ids(44, "0000") == ["any.zeros"]
+    # Unknown or missing calling codes fall back to the universal pack
+    assert engine.match_rule_ids(1, "9000000000") == []
+    assert engine.match_rule_ids(None, "000") == ["any.zeros"]
+
+
+def test_bundled_rules_and_number_splitting():
+    pytest.importorskip("phonenumbers")
+    engine = SpamRuleEngine()
+    assert "nanp.premium_rate" in engine.match_rule_ids(*split_number("+1 900 555 1234"))
+    assert split_number("+44 20 7946 0000") == (44, "2079460000")
+    assert split_number("not a number") == (None, "")
@@ -0,0 +1,79 @@
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from utils.config import load_settings
+from utils.rate_limiter import RateLimiter
+from utils.transport import HTTPTransport
+
+
+class RecordingAdapter(BaseAdapter):
+    """Answers every request with a fixed body and remembers what was sent"""
+
+    def __init__(self, status=200, body=b"hello"):
+        super().__init__()
+        self.status = status
+        self.body = body
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        self.sent.append((request, kwargs))
+        response = requests.Response()
+        response.status_code = self.status
+        response._content = self.body
+        response.headers["Content-Length"] = str(len(self.body))
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+def make_transport(adapter, breaker=None, **overrides):
+    settings = dict(load_settings(), **overrides)
+    transport = HTTPTransport(settings, limiter=RateLimiter(0), breaker=breaker or CircuitBreaker(state_path=None))
+    transport.session.mount("https://", adapter)
+    return transport
+
+
+def test_connect_timeout_caps_the_callers_timeout():
+    transport = make_transport(RecordingAdapter(), timeout=10, connect_timeout=5)
+    assert transport._timeout(None) == (5.0, 10.0)
+    assert transport._timeout(3) == (3, 3)
+    assert transport._timeout(30) == (5.0, 30)
+    assert transport._timeout((1, 2)) == (1, 2)
+
+
+def test_clients_share_the_session_but_keep_their_own_headers():
+    adapter = RecordingAdapter()
+    transport = make_transport(adapter, user_agent="Shared/1.0")
+    module = transport.client(headers={"User-Agent": "Module/2.0", "Accept": "text/html"})
+
+    module.get("https://example.com/a", headers={"Accept": "application/json"})
+    transport.get("https://example.com/b")
+    first, second = (request for request, _ in adapter.sent)
+    assert first.headers["User-Agent"] == "Module/2.0" and first.headers["Accept"] == "application/json"
+    assert second.headers["User-Agent"] == "Shared/1.0"
+    assert module.headers == {"User-Agent": "Module/2.0", "Accept": "text/html"}
+    assert adapter.sent[0][1]["timeout"] == (transport.connect_timeout, transport.read_timeout)
+
+
+def test_requests_bytes_and_errors_are_counted_per_host():
+    transport = make_transport(RecordingAdapter(body=b"12345"))
+    transport.get("https://example.com/")
+    transport.get("https://example.com/", stream=True)
+    assert transport.stats() == {"example.com": {"requests": 2, "bytes": 10, "errors": 0}}
+
+
+
+def test_server_errors_open_the_hosts_circuit():
+    adapter = RecordingAdapter(status=503)
+    transport = make_transport(adapter, breaker=CircuitBreaker(failure_threshold=2, state_path=None))
+    for _ in range(2):
+        assert transport.get("https://down.example/").status_code == 503
+    with pytest.raises(CircuitOpenError):
+        transport.get("https://down.example/")
+    assert len(adapter.sent) == 2
+    assert transport.get("https://up.example/").status_code == 503
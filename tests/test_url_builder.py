@@ -0,0 +1,29 @@
+import pytest
+
+from utils.url_builder import SEARCH_ENGINES, URLBuilder, quote_query, split_template
+
+
+def test_query_is_percent_encoded_once():
+    builder = URLBuilder(engines=["Google", "Bing"])
+    query = 'site:facebook.com "+91 98765 43210" & more/100%'
+    encoded = quote_query(query)
+    assert encoded == 'site%3Afacebook.com%20%22%2B91%2098765%2043210%22%20%26%20more/100%25'
+    assert builder.urls(query) == [("Google", "https://www.google.com/search?q=" + encoded),
+                                   ("Bing", "https://www.bing.com/search?q=" + encoded)]
+    assert builder.url("Bing", query) == SEARCH_ENGINES["Bing"].format(encoded)
+
+
+def test_engines_keep_their_order_and_templates_can_be_added():
+    builder = URLBuilder(templates={"Local": "http://search.local/?q={}&safe=off"})
+    assert list(builder.search_engines)[:len(SEARCH_ENGINES)] == list(SEARCH_ENGINES)
+    assert builder.url("Local", "a b") == "http://search.local/?q=a%20b&safe=off"
+    assert [name for name, _ in builder.urls("x", engines=["Qwant", "Google"])] == ["Qwant", "Google"]
+    with pytest.raises(KeyError):
+        URLBuilder(engines=["Altavista"])
+
+
+def test_templates_need_exactly_one_placeholder():
+    assert split_template("https://yandex.com/search/?text={}") == ("https://yandex.com/search/?text=", "")
+    for template in ("https://example.com/search", "https://example.com/{}/{}"):
+        with pytest.raises(ValueError):
+            split_template(template)
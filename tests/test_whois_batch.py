@@ -0,0 +1,71 @@
+import threading
+import time
+
+from modules.whois_lookup import AdvancedWHOISLookup
+from utils.cache import ResponseCache
+from utils.rate_limiter import RateLimiter
+from utils.whois_cache import WHOISCache
+
+
+class Backend:
+    """Fake whois.whois recording every query, optionally slow per domain"""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, domain):
+        with self._lock:
+            self.calls.append((domain, time.monotonic()))
+        time.sleep(self.delays.get(domain, 0.0))
+        return {"domain_name": domain.upper(), "registrar": "Example Registrar"}
+
+
+def make_lookup(backend, limiter=None):
+    lookup = AdvancedWHOISLookup(verbose=False, whois_cache=WHOISCache(ResponseCache(path=None)),
+                                 limiter=limiter or RateLimiter(0))
+    lookup._whois = backend
+    return lookup
+
+
+def test_one_lookup_per_registrable_domain_and_servers_grouped_by_tld():
+    backend = Backend()
+    lookup = make_lookup(backend)
+    domains = ["example.com", "www.example.com", "a.co.uk", "b.uk", "c.com"]
+    results = dict(lookup.iter_batch_whois(domains, delay=0.1))
+
+    assert set(results) == set(domains)
+    assert results["www.example.com"] is results["example.com"]
+    assert sorted(domain for domain, _ in backend.calls) == ["a.co.uk", "b.uk", "c.com", "example.com"]
+    assert lookup.server_key("a.co.uk") == lookup.server_key("b.uk") == "uk"
+
+    # Lookups against one server are spaced by the delay; servers run in parallel
+    started = {domain: at for domain, at in backend.calls}
+    assert abs(started["c.com"] - started["example.com"]) >= 0.09
+    assert abs(started["b.uk"] - started["a.co.uk"]) >= 0.09
+    assert abs(started["a.co.uk"] - started["example.com"]) < 0.09
+
+
+def test_results_stream_in_completion_order():
+    lookup = make_lookup(Backend(delays={"slow.com": 0.3}))
+    order = [domain for domain, _ in lookup.iter_batch_whois(["slow.com", "fast.org"], delay=0)]
+    assert order == ["fast.org", "slow.com"]
+
+
+def test_closing_early_stops_lookups_and_releases_the_floor():
+    backend = Backend()
+    limiter = RateLimiter(0)
+    lookup = make_lookup(backend, limiter)
+    batch = lookup.iter_batch_whois([f"site{i}.com" for i in range(10)], delay=0.2)
+
+    next(batch)
+    assert limiter.interval_for("whois:com") == 0.2
+    assert limiter.interval_for("api.example.com") == 0.0
+    batch.close()
+
+    calls = len(backend.calls)
+    assert calls <= 2
+    assert limiter.interval_for("whois:com") == 0.0
+    time.sleep(0.3)
+    assert len(backend.calls) == calls
@@ -0,0 +1,53 @@
+from utils import cache as cache_module
+from utils.cache import ResponseCache
+from utils.whois_cache import WHOISCache
+
+
+class Loader:
+    """Counts WHOIS calls and answers with a fixed result (or raises it)"""
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self, domain):
+        self.calls += 1
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def make_cache(**kwargs):
+    return WHOISCache(ResponseCache(path=None, **kwargs))
+
+
+def test_complete_answer_is_cached_per_registrable_domain():
+    whois_cache = make_cache()
+    loader = Loader({"domain_name": "EXAMPLE.COM", "registrar": "Example Registrar"})
+    assert whois_cache.lookup("www.example.com", loader).registrar == "Example Registrar"
+    assert whois_cache.lookup("mail@example.com", loader).domain_name == "EXAMPLE.COM"
+    assert loader.calls == 1
+
+
+def test_no_match_is_cached_until_the_negative_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    whois_cache = make_cache(negative_ttl=60)
+    loader = Loader(Exception('No match for "UNREGISTERED.COM".'))
+
+    assert whois_cache.lookup("unregistered.com", loader) is None
+    assert whois_cache.lookup("unregistered.com", loader) is None
+    assert loader.calls == 1
+
+    now[0] += 61
+    whois_cache.lookup("unregistered.com", loader)
+    assert loader.calls == 2
+
+
+def test_incomplete_answer_is_not_cached():
+    whois_cache = make_cache()
+    loader = Loader({"domain_name": None, "registrar": None})
+    whois_cache.lookup("example.org", loader)
+    whois_cache.lookup("example.org", loader)
+    assert loader.calls == 2
+    assert not whois_cache.is_cached("example.org")
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Response Cache
+Description: Two-tier (in-process LRU + SQLite) TTL cache for quota-limited API lookups
+Version: 4.0.0
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.config import load_config
+from utils.metrics import get_metrics
+
+DEFAULT_CACHE_PATH = os.path.join("data", "cache", "responses.sqlite3")
+
+# Seconds a positive answer stays fresh, per provider
+DEFAULT_TTLS = {
+    "numverify": 7 * 86400,
+    "abstractapi": 7 * 86400,
+    "hibp": 86400,
+    "whois": 86400,
+    "default": 86400,
+}
+
+# "Not found" / invalid answers are re-checked sooner
+DEFAULT_NEGATIVE_TTL = 3600
+
+POSITIVE = "positive"
+NEGATIVE = "negative"
+
+_MISS = object()
+
+
+class ResponseCache:
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH, memory_size: int = 1024,
+                 max_entries: int = 50000, ttls: Optional[Dict[str, float]] = None,
+                 negative_ttl: float = DEFAULT_NEGATIVE_TTL, enabled: bool = True):
+        """
+        Args:
+            path: SQLite file for the persistent tier (None = memory only)
+            memory_size: Entries kept in the in-process LRU
+            max_entries: Entries kept on disk before the least recently used are evicted
+            ttls: Per-provider positive TTLs in seconds (merged over DEFAULT_TTLS)
+            negative_ttl: TTL in seconds for negative results
+            enabled: When False every lookup goes straight to the provider
+        """
+        self.path = path
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.negative_ttl = negative_ttl
+        self.enabled = enabled
+
+        self._memory = OrderedDict()  # key -> (expires, json text)
+        self._lock = threading.RLock()
+        self._db = None
+        self._stats = {}
+
+    # ----------------------------------------------------------------- storage
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._db is None and self.path:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._db = sqlite3.connect(self.path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    " key TEXT PRIMARY KEY, provider TEXT NOT NULL,"
+                    " expires REAL NOT NULL, accessed REAL NOT NULL, payload BLOB NOT NULL)"
+                )
+                self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+                self._db.execute("DELETE FROM responses WHERE expires < ?", (time.time(),))
+                self._db.commit()
+            except sqlite3.Error:
+                # A broken or read-only cache must never break a lookup
+                self.path = None
+                self._db = None
+        return self._db
+
+    @staticmethod
+    def _key(provider: str, key: str) -> str:
+        return f"{provider}:{key}"
+
+    def _counter(self, provider: str) -> Dict[str, float]:
+        return self._stats.setdefault(provider, {
+            'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0,
+            'uncached': 0, 'fetch_seconds': 0.0,
+        })
+
+    def _remember(self, key: str, expires: float, text: str) -> None:
+        self._memory[key] = (expires, text)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, provider: str, key: str) -> Any:
+        """
+        Look up a cached response
+
+        Args:
+            provider: Provider name (e.g. 'numverify')
+            key: Provider-specific request key (e.g. the phone number)
+
+        Returns:
+            Cached value, or the module-level _MISS sentinel
+        """
+        if not self.enabled:
+            return _MISS
+
+        full_key = self._key(provider, key)
+        now = time.time()
+        with self._lock:
+            counter = self._counter(provider)
+
+            entry = self._memory.get(full_key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(full_key)
+                    counter['memory_hits'] += 1
+                    return json.loads(entry[1])
+                del self._memory[full_key]
+
+            db = self._connect()
+            if db is not None:
+                try:
+                    row = db.execute("SELECT expires, payload FROM responses WHERE key = ?",
+                                     (full_key,)).fetchone()
+                    if row is not None:
+                        if row[0] > now:
+                            text = zlib.decompress(row[1]).decode('utf-8')
+                            db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, full_key))
+                            db.commit()
+                            self._remember(full_key, row[0], text)
+                            counter['disk_hits'] += 1
+                            return json.loads(text)
+                        db.execute("DELETE FROM responses WHERE key = ?", (full_key,))
+                        db.commit()
+                except (sqlite3.Error, zlib.error, ValueError):
+                    pass
+
+            counter['misses'] += 1
+            return _MISS
+
+    def contains(self, provider: str, key: str) -> bool:
+        """Whether a fresh entry exists (does not touch statistics or recency)"""
+        if not self.enabled:
+            return False
+
+        full_key = self._key(provider, key)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(full_key)
+            if entry is not None and entry[0] > now:
+                return True
+
+            db = self._connect()
+            if db is None:
+                return False
+            try:
+                row = db.execute("SELECT expires FROM responses WHERE key = ?", (full_key,)).fetchone()
+            except sqlite3.Error:
+                return False
+            return row is not None and row[0] > now
+
+    def set(self, provider: str, key: str, value: Any, negative: bool = False) -> None:
+        """
+        Store a response
+
+        Args:
+            provider: Provider name
+            key: Provider-specific request key
+            value: JSON-serialisable response
+            negative: Use the shorter negative TTL
+        """
+        if not self.enabled:
+            return
+
+        ttl = self.negative_ttl if negative else self.ttls.get(provider, self.ttls["default"])
+        now = time.time()
+        expires = now + ttl
+        full_key = self._key(provider, key)
+        text = json.dumps(value, ensure_ascii=False, default=str)
+
+        with self._lock:
+            self._remember(full_key, expires, text)
+            self._counter(provider)['stores'] += 1
+
+            db = self._connect()
+            if db is None:
+                return
+            try:
+                db.execute(
+                    "INSERT OR REPLACE INTO responses (key, provider, expires, accessed, payload)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (full_key, provider, expires, now, zlib.compress(text.encode('utf-8'))),
+                )
+                self._evict(db)
+                db.commit()
+            except sqlite3.Error:
+                pass
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        """Drop the least recently used rows once the store exceeds max_entries"""
+        count = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        # Evict in chunks so we do not pay for a DELETE on every insert
+        excess = count - self.max_entries + max(1, self.max_entries // 10)
+        db.execute(
+            "DELETE FROM responses WHERE key IN "
+            "(SELECT key FROM responses ORDER BY accessed ASC LIMIT ?)", (excess,)
+        )
+
+    # ----------------------------------------------------------------- helpers
+
+    def fetch(self, provider: str, key: str, loader: Callable[[], Any],
+              classify: Optional[Callable[[Any], Optional[str]]] = None) -> Any:
+        """
+        Return a cached response or load and cache a fresh one
+
+        Args:
+            provider: Provider name
+            key: Provider-specific request key
+            loader: Callable performing the real lookup
+            classify: Maps a response to POSITIVE, NEGATIVE or None (do not cache,
+                      e.g. errors and quota rejections). Defaults to POSITIVE.
+
+        Returns:
+            The response
+        """
+        cached = self.get(provider, key)
+        if cached is not _MISS:
+            return cached
+
+        started = time.perf_counter()
+        value = loader()
+        elapsed = time.perf_counter() - started
+
+        kind = classify(value) if classify else POSITIVE
+        with self._lock:
+            counter = self._counter(provider)
+            counter['fetch_seconds'] += elapsed
+            if kind is None:
+                counter['uncached'] += 1
+        if kind is not None:
+            self.set(provider, key, value, negative=(kind == NEGATIVE))
+        return value
+
+    def clear(self, provider: Optional[str] = None) -> None:
+        """Drop cached entries (all, or only one provider's)"""
+        with self._lock:
+            if provider is None:
+                self._memory.clear()
+            else:
+                prefix = self._key(provider, "")
+                for key in [k for k in self._memory if k.startswith(prefix)]:
+                    del self._memory[key]
+
+            db = self._connect()
+            if db is not None:
+                try:
+                    if provider is None:
+                        db.execute("DELETE FROM responses")
+                    else:
+                        db.execute("DELETE FROM responses WHERE provider = ?", (provider,))
+                    db.commit()
+                except sqlite3.Error:
+                    pass
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-provider cache statistics
+
+        Returns:
+            Dictionary of provider -> counters, including hit_ratio and an
+            estimate of the network time saved (hits x mean fetch latency)
+        """
+        with self._lock:
+            report = {}
+            for provider, counter in self._stats.items():
+                entry = dict(counter)
+                hits = entry['memory_hits'] + entry['disk_hits']
+                fetches = entry['misses']
+                total = hits + fetches
+                entry['hits'] = hits
+                entry['hit_ratio'] = hits / total if total else 0.0
+                entry['quota_saved'] = hits
+                mean_fetch = entry['fetch_seconds'] / fetches if fetches else 0.0
+                entry['seconds_saved'] = hits * mean_fetch
+                report[provider] = entry
+            return report
+
+    def metric_families(self) -> List[tuple]:
+        """Hit/miss counters and hit ratio per provider, for the metrics registry"""
+        stats = self.stats()
+        return [
+            ("cache_requests_total", "counter", "Response cache lookups by provider and result",
+             [({'provider': provider, 'result': result}, entry[field])
+              for provider, entry in sorted(stats.items())
+              for result, field in (('memory_hit', 'memory_hits'), ('disk_hit', 'disk_hits'), ('miss', 'misses'))]),
+            ("cache_hit_ratio", "gauge", "Share of response cache lookups served from the cache",
+             [({'provider': provider}, entry['hit_ratio']) for provider, entry in sorted(stats.items())]),
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_cache() -> ResponseCache:
+    """
+    Process-wide response cache, configured from the optional "cache"
+    section of config.json (enabled, path, memory_size, max_entries,
+    ttl {provider: seconds}, negative_ttl)
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            options = load_config().get("cache") or {}
+            _shared_cache = ResponseCache(
+                path=options.get("path", DEFAULT_CACHE_PATH),
+                memory_size=int(options.get("memory_size", 1024)),
+                max_entries=int(options.get("max_entries", 50000)),
+                ttls=options.get("ttl"),
+                negative_ttl=float(options.get("negative_ttl", DEFAULT_NEGATIVE_TTL)),
+                enabled=bool(options.get("enabled", True)),
+            )
+            get_metrics().register_collector(_shared_cache.metric_families)
+        return _shared_cache
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Circuit Breaker
+Description: Per-host circuit breakers for outbound calls, persisted across runs
+Version: 4.0.0
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from utils.config import load_config
+from utils.metrics import get_metrics
+
+DEFAULT_STATE_PATH = os.path.join("data", "cache", "circuit_breakers.json")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """
+    Raised instead of calling a host whose circuit is open
+
+    It is a requests.ConnectionError, so every existing 'connection failed'
+    handler treats it as one without waiting out a timeout.
+    """
+
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"Circuit open for {host}; retrying in {retry_after:.0f}s")
+        self.host = host
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Closed: calls flow, consecutive failures are counted.
+    Open: calls fail fast until the cooldown has passed.
+    Half-open: a single probe call decides between closed and open again.
+    """
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 60.0, max_cooldown: float = 900.0,
+                 state_path: Optional[str] = DEFAULT_STATE_PATH, enabled: bool = True):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open a host's circuit
+            cooldown: Seconds an opened circuit stays open before a probe is allowed
+            max_cooldown: Cap for the cooldown, which doubles each time a probe fails
+            state_path: JSON file shared by all runs (None = memory only)
+            enabled: When False every call is allowed and nothing is tracked
+        """
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown = float(cooldown)
+        self.max_cooldown = max(float(max_cooldown), self.cooldown)
+        self.state_path = state_path
+        self.enabled = enabled
+        self._hosts = self._load_state()  # type: Dict[str, Dict[str, Any]]
+        self._probing = set()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------- calls
+
+    def before_call(self, host: str) -> None:
+        """
+        Admit or reject a call to `host`
+
+        Raises:
+            CircuitOpenError: The circuit is open, or half-open with its probe already in flight
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            entry = self._hosts.get(host)
+            if entry is None or entry['state'] == CLOSED:
+                return
+            remaining = entry['opened_at'] + entry['cooldown'] - time.time()
+            if remaining > 0:
+                raise CircuitOpenError(host, remaining)
+            if host in self._probing:
+                raise CircuitOpenError(host, 0)
+            # Cooldown over: this caller becomes the half-open probe
+            entry['state'] = HALF_OPEN
+            self._probing.add(host)
+
+    def record_success(self, host: str) -> None:
+        """A call to `host` completed; closes a half-open circuit"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._probing.discard(host)
+            if self._hosts.pop(host, None) is not None:
+                self._save_state()
+
+    def record_failure(self, host: str) -> None:
+        """A call to `host` failed; may open (or re-open) its circuit"""
+        if not self.enabled:
+            return
+        with self._lock:
+            probing = host in self._probing
+            self._probing.discard(host)
+            entry = self._hosts.setdefault(host, {'state': CLOSED, 'failures': 0, 'opened_at': 0.0,
+                                                  'cooldown': self.cooldown})
+            entry['failures'] += 1
+            if probing or entry['state'] == HALF_OPEN:
+                # The probe failed: back off further
+                entry['cooldown'] = min(entry['cooldown'] * 2, self.max_cooldown)
+                entry['state'] = OPEN
+                entry['opened_at'] = time.time()
+            elif entry['state'] == CLOSED and entry['failures'] >= self.failure_threshold:
+                entry['state'] = OPEN
+                entry['opened_at'] = time.time()
+            # A call admitted before the circuit opened that fails afterwards only adds to
+            # the count: moving opened_at would keep pushing the cooldown back.
+            # Closed hosts are saved too, so failures add up across short CLI runs.
+            self._save_state()
+
+    def release(self, host: str) -> None:
+        """A call ended without telling anything about the host's health (e.g. a bad request)"""
+        with self._lock:
+            if host in self._probing:
+                self._probing.discard(host)
+                entry = self._hosts.get(host)
+                if entry is not None and entry['state'] == HALF_OPEN:
+                    entry['state'] = OPEN  # Cooldown is already over, so the next call probes again
+
+    # ------------------------------------------------------------- inspection
+
+    def state(self, host: str) -> str:
+        """Current state of a host's circuit (an elapsed cooldown reports half-open)"""
+        with self._lock:
+            entry = self._hosts.get(host)
+            if entry is None:
+                return CLOSED
+            if entry['state'] == OPEN and time.time() >= entry['opened_at'] + entry['cooldown']:
+                return HALF_OPEN
+            return entry['state']
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hosts with failures or a non-closed circuit"""
+        with self._lock:
+            return {host: dict(entry) for host, entry in self._hosts.items()}
+
+    def metric_families(self) -> List[tuple]:
+        """Open circuits and consecutive failures per host, for the metrics registry"""
+        stats = self.stats()
+        return [
+            ("circuit_open", "gauge", "1 while a host's circuit is open or half-open",
+             [({'host': host}, 0 if entry['state'] == CLOSED else 1) for host, entry in sorted(stats.items())]),
+            ("circuit_failures", "gauge", "Consecutive failures counted against a host",
+             [({'host': host}, entry['failures']) for host, entry in sorted(stats.items())]),
+        ]
+
+    def reset(self, host: Optional[str] = None) -> None:
+        """Close one host's circuit, or all of them"""
+        with self._lock:
+            if host is None:
+                self._hosts.clear()
+                self._probing.clear()
+            else:
+                self._hosts.pop(host, None)
+                self._probing.discard(host)
+            self._save_state()
+
+    # ------------------------------------------------------------ persistence
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        if not self.state_path:
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        hosts = {}
+        for host, entry in (state if isinstance(state, dict) else {}).items():
+            if not isinstance(entry, dict) or entry.get('state') not in (CLOSED, OPEN, HALF_OPEN):
+                continue
+            try:
+                failures = int(entry.get('failures', 0))
+                # A half-open probe from a dead process is not in flight any more
+                hosts[host] = {'state': CLOSED if entry['state'] == CLOSED else OPEN, 'failures': failures,
+                               'opened_at': float(entry.get('opened_at', 0)),
+                               'cooldown': float(entry.get('cooldown', self.cooldown))}
+            except (TypeError, ValueError):
+                continue
+            if hosts[host]['state'] == CLOSED and failures <= 0:
+                del hosts[host]
+        return hosts
+
+    def _save_state(self) -> None:
+        """Atomically persist open circuits and failure counts (caller holds the lock)"""
+        if not self.state_path:
+            return
+        state = {host: dict(entry) for host, entry in self._hosts.items()}
+        try:
+            directory = os.path.dirname(os.path.abspath(self.state_path))
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".breakers.", suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f, indent=2)
+            os.replace(temp_path, self.state_path)
+        except OSError:
+            pass  # Breakers still work in memory
+
+
+_shared_breaker = None
+_shared_lock = threading.Lock()
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """
+    Process-wide circuit breaker, configured from the optional "circuit_breaker"
+    section of config.json (enabled, failure_threshold, cooldown, max_cooldown, path)
+    """
+    global _shared_breaker
+    with _shared_lock:
+        if _shared_breaker is None:
+            options = load_config().get("circuit_breaker") or {}
+            _shared_breaker = CircuitBreaker(
+                failure_threshold=int(options.get("failure_threshold", 3)),
+                cooldown=float(options.get("cooldown", 60)),
+                max_cooldown=float(options.get("max_cooldown", 900)),
+                state_path=options.get("path", DEFAULT_STATE_PATH),
+                enabled=bool(options.get("enabled", True)),
+            )
+            get_metrics().register_collector(_shared_breaker.metric_families)
+        return _shared_breaker
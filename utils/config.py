@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Configuration Loader
+Description: Read operation settings from config.json with safe defaults
+Version: 4.0.0
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict
+
+DEFAULT_CONFIG_FILE = "config.json"
+
+DEFAULT_SETTINGS = {
+    "rate_limit_delay": 1,  # Minimum seconds between requests to one host (0 = unlimited)
+    "rate_limit_burst": 1,  # Requests per host allowed back to back
+    "timeout": 10,          # Read timeout in seconds
+    "connect_timeout": 5,   # TCP/TLS connect timeout in seconds
+    "pool_connections": 20, # Number of per-host connection pools kept alive
+    "pool_maxsize": 10,     # Connections kept alive per host
+    "user_agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (NumIntensePro/4.0.0)",
+    "save_reports": False,
+    "api_quorum": 0,        # Stop waiting on lookup APIs after this many answered (0 = wait for all)
+    "default_region": "IN", # Region assumed for numbers typed without a '+' country code
+}
+
+# sample_config.json uses different names for a few settings
+_SETTING_ALIASES = {
+    "request_timeout": "timeout",
+}
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def load_config(config_file: str = DEFAULT_CONFIG_FILE) -> Dict[str, Any]:
+    """
+    Load the raw JSON configuration
+
+    Args:
+        config_file: Path to the JSON config file
+
+    Returns:
+        Parsed configuration, or an empty dict if missing/invalid
+    """
+    try:
+        if os.path.exists(config_file):
+            with open(config_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def load_settings(config_file: str = DEFAULT_CONFIG_FILE) -> Dict[str, Any]:
+    """
+    Operation settings merged over DEFAULT_SETTINGS (cached per file)
+
+    Both the "settings" (config.json) and "operation_settings"
+    (sample_config.json) sections are honoured.
+
+    Args:
+        config_file: Path to the JSON config file
+
+    Returns:
+        Settings dictionary
+    """
+    with _lock:
+        if config_file in _cache:
+            return dict(_cache[config_file])
+
+        settings = dict(DEFAULT_SETTINGS)
+        config = load_config(config_file)
+        for section in ("settings", "operation_settings"):
+            values = config.get(section)
+            if isinstance(values, dict):
+                for key, value in values.items():
+                    settings[_SETTING_ALIASES.get(key, key)] = value
+
+        _cache[config_file] = settings
+        return dict(settings)
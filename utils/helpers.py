@@ -19,15 +19,17 @@ def check_platform():
     return system, architecture
 
 def create_report_directory():
-    """Create reports directory if it doesn't exist"""
-    if not os.path.exists('reports'):
-        os.makedirs('reports')
-    return 'reports'
+    """Create the report archive directory if it doesn't exist"""
+    from utils.report_archive import get_report_archive
+    return get_report_archive().ensure_root()
 
-def generate_filename(prefix, extension="txt"):
-    """Generate timestamped filename"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    return f"reports/{prefix}_{timestamp}.{extension}"
+def generate_filename(prefix, extension="txt", case_id=None, content=None):
+    """Generate a collision-free, sharded report path (content-addressed when content is given)"""
+    from utils.report_archive import get_report_archive
+    case_id = case_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = get_report_archive().path_for(case_id, content, extension, prefix=prefix)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
 
 def print_legal_warning():
     """Print legal disclaimer"""
@@ -59,7 +61,9 @@ def format_phone_number(number):
     
     # Add country code if missing
     if not cleaned.startswith('+'):
-        cleaned = '+91' + cleaned  # Default to India
+        import phonenumbers
+        from utils.number_profile import default_region
+        cleaned = f"+{phonenumbers.country_code_for_region(default_region())}" + cleaned
         
     return cleaned
 
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Lazy Import Helpers
+Description: Defer heavy subsystem imports until a code path first needs them
+Version: 4.0.0
+"""
+
+import importlib
+import importlib.util
+import threading
+import types
+from typing import Callable, List, Optional
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports the real module on first attribute access"""
+
+    def __init__(self, name: str, on_load: Optional[Callable] = None):
+        """
+        Args:
+            name: Dotted module name to import
+            on_load: Optional callback run once with the loaded module
+        """
+        super().__init__(name)
+        self.__dict__['_lazy_name'] = name
+        self.__dict__['_lazy_on_load'] = on_load
+        self.__dict__['_lazy_module'] = None
+        self.__dict__['_lazy_lock'] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__['_lazy_module']
+        if module is not None:
+            return module
+
+        with self.__dict__['_lazy_lock']:
+            module = self.__dict__['_lazy_module']
+            if module is None:
+                module = importlib.import_module(self.__dict__['_lazy_name'])
+                on_load = self.__dict__['_lazy_on_load']
+                if on_load is not None:
+                    on_load(module)
+                self.__dict__['_lazy_module'] = module
+        return module
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the underlying module has been imported yet"""
+        return self.__dict__['_lazy_module'] is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<lazy module '{self.__dict__['_lazy_name']}' ({state})>"
+
+
+class LazyAttribute:
+    """Proxy for an attribute of a lazily imported module (e.g. colorama.Fore)"""
+
+    def __init__(self, module: LazyModule, attr: str):
+        self._module = module
+        self._attr = attr
+
+    def __getattr__(self, name):
+        return getattr(getattr(self._module, self._attr), name)
+
+
+def missing_modules(names: List[str]) -> List[str]:
+    """
+    Report which modules are not installed, without importing them
+
+    Args:
+        names: Top-level module names to check
+
+    Returns:
+        List of module names that cannot be found
+    """
+    return [name for name in names if importlib.util.find_spec(name) is None]
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Phone Metadata Cache
+Description: Prefix-keyed LRU cache for geocoder/carrier/timezone/region lookups
+Version: 4.0.0
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import phonenumbers
+from phonenumbers import geocoder, carrier, timezone
+
+try:
+    from phonenumbers.geodata import GEOCODE_DATA, GEOCODE_LONGEST_PREFIX
+    from phonenumbers.carrierdata import CARRIER_DATA, CARRIER_LONGEST_PREFIX
+    from phonenumbers.tzdata import TIMEZONE_DATA, TIMEZONE_LONGEST_PREFIX
+except ImportError:  # pragma: no cover - very old phonenumbers releases
+    GEOCODE_DATA = CARRIER_DATA = TIMEZONE_DATA = None
+    GEOCODE_LONGEST_PREFIX = CARRIER_LONGEST_PREFIX = TIMEZONE_LONGEST_PREFIX = 9
+
+# Fallback key length when a prefix table is unavailable, or for the geocoder's
+# mobile-token re-parse (Argentina): enough E.164 digits to cover every table
+PREFIX_DIGITS = max(GEOCODE_LONGEST_PREFIX, CARRIER_LONGEST_PREFIX, TIMEZONE_LONGEST_PREFIX) + 1
+
+
+def matched_prefix(data, longest: int, digits: str) -> str:
+    """
+    Longest key of a phonenumbers prefix table that the E.164 digits start with
+
+    phonenumbers walks the same table longest-first, so every number sharing
+    this prefix gets the same answer from it.
+
+    Args:
+        data: Prefix table (GEOCODE_DATA, CARRIER_DATA or TIMEZONE_DATA)
+        longest: Length of the table's longest key
+        digits: E.164 digits without '+'
+
+    Returns:
+        The matching prefix ('' = no entry, so only the country-level answer applies)
+    """
+    if data is None:
+        return digits[:PREFIX_DIGITS]
+    for length in range(min(longest, len(digits)), 0, -1):
+        prefix = digits[:length]
+        if prefix in data:
+            return prefix
+    return ''
+
+
+class PhoneMetadataCache:
+    def __init__(self, maxsize: int = 65536, lang: str = "en"):
+        """
+        Args:
+            maxsize: Maximum number of prefix blocks kept in memory
+            lang: Language used for geocoder and carrier descriptions
+        """
+        self.maxsize = maxsize
+        self.lang = lang
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def make_key(self, parsed, number_type: Optional[int] = None,
+                 region: Optional[str] = None) -> Tuple[int, int, Optional[str], str, str, str]:
+        """
+        Build the cache key for a parsed number
+
+        Numbers share a key when they have the same country code and number
+        type and match the same entries of the geocoder, carrier and timezone
+        prefix tables, so a key covers a whole allocation block rather than
+        nearly the full national number.
+
+        Args:
+            parsed: phonenumbers.PhoneNumber
+            number_type: Pre-computed phonenumbers.number_type() result
+            region: Pre-computed region code (only needed for country codes shared by
+                    several regions, e.g. +1; computed when omitted)
+
+        Returns:
+            (country code, number type, region, geocoder prefix, carrier prefix, timezone prefix) tuple
+        """
+        if number_type is None:
+            number_type = phonenumbers.number_type(parsed)
+        country_code = parsed.country_code
+        national = phonenumbers.national_significant_number(parsed)
+        digits = str(country_code) + national
+
+        if len(phonenumbers.COUNTRY_CODE_TO_REGION_CODE.get(country_code, ())) > 1:
+            # Which region of a shared country code a number belongs to depends on its full pattern
+            region = region or phonenumbers.region_code_for_number(parsed)
+        else:
+            region = None
+
+        mobile_token = phonenumbers.country_mobile_token(country_code)
+        if mobile_token and national.startswith(mobile_token):
+            geocode = digits[:PREFIX_DIGITS]  # The geocoder re-parses without the token
+        else:
+            geocode = matched_prefix(GEOCODE_DATA, GEOCODE_LONGEST_PREFIX, digits)
+        return (country_code, number_type, region, geocode,
+                matched_prefix(CARRIER_DATA, CARRIER_LONGEST_PREFIX, digits),
+                matched_prefix(TIMEZONE_DATA, TIMEZONE_LONGEST_PREFIX, digits))
+
+    def lookup(self, parsed, number_type: Optional[int] = None, region: Optional[str] = None) -> Dict:
+        """
+        Resolve country, region, carrier and timezones with a single probe
+
+        Args:
+            parsed: phonenumbers.PhoneNumber
+            number_type: Pre-computed phonenumbers.number_type() result
+            region: Pre-computed region code, if known
+
+        Returns:
+            Dictionary with 'country', 'region', 'carrier' and 'timezones'
+        """
+        key = self.make_key(parsed, number_type, region)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = {
+            'country': geocoder.description_for_number(parsed, self.lang),
+            'region': region or phonenumbers.region_code_for_number(parsed),
+            'carrier': carrier.name_for_number(parsed, self.lang),
+            'timezones': tuple(timezone.time_zones_for_number(parsed)),
+        }
+
+        with self._lock:
+            self._entries[key] = entry
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return entry
+
+    def clear(self) -> None:
+        """Drop all cached entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def metric_families(self) -> List[tuple]:
+        """Hit/miss counters and hit ratio, for the metrics registry"""
+        stats = self.stats()
+        return [
+            ("metadata_cache_requests_total", "counter", "Phone metadata cache lookups by result",
+             [({'result': 'hit'}, stats['hits']), ({'result': 'miss'}, stats['misses'])]),
+            ("metadata_cache_hit_ratio", "gauge", "Share of phone metadata lookups served from the cache",
+             [({}, stats['hit_ratio'])]),
+        ]
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Return cache counters
+
+        Returns:
+            Dictionary with hits, misses, size and hit_ratio
+        """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'hit_ratio': self.hits / total if total else 0.0,
+        }
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_metadata_cache() -> PhoneMetadataCache:
+    """Process-wide phone metadata cache, registered once with the metrics registry"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            from utils.metrics import get_metrics
+            _shared_cache = PhoneMetadataCache()
+            get_metrics().register_collector(_shared_cache.metric_families)
+        return _shared_cache
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Metrics
+Description: Process-wide counters and latency histograms, exposed in the Prometheus text format
+Version: 4.0.0
+"""
+
+import os
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.config import load_config
+
+# Upper bounds in seconds, from a cache-warm local call up to a slow WHOIS server
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# (metric name, type, help, [(labels, value), ...]) produced by a collector at exposition time
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """A named metric with a fixed set of label names"""
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}  # type: Dict[Tuple[str, ...], object]
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Tuple) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+        return tuple(str(value) for value in labels)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Monotonically increasing count (requests, errors, retries...)"""
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        """Add `amount` to the series identified by the label values (in labelnames order)"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            return [(self.name, self._labels(key), value) for key, value in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+    kind = "gauge"
+
+    def set(self, *labels, value: float) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(Metric):
+    """Distribution of observed values (latencies) in cumulative buckets"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+
+    def observe(self, *labels, value: float) -> None:
+        """Record one observation for the series identified by the label values"""
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                # Per-bucket (non-cumulative) counts, then +Inf, sum
+                series = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        result = []
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._values.items())
+        for key, series in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                result.append((f"{self.name}_bucket", dict(labels, le=_format_value(bound)), cumulative))
+            result.append((f"{self.name}_sum", labels, series[-1]))
+            result.append((f"{self.name}_count", labels, cumulative))
+        return result
+
+
+class MetricsRegistry:
+    """
+    Every module reports into one registry; exposition renders all metrics
+    plus the collectors (callbacks reading existing counters, e.g. cache hit
+    statistics) in the Prometheus text format.
+    """
+
+    def __init__(self, enabled: bool = True, prefix: str = "numintense_"):
+        """
+        Args:
+            enabled: When False every metric is still returned but records nothing
+            prefix: Prepended to every metric name
+        """
+        self.enabled = enabled
+        self.prefix = prefix
+        self._metrics = {}  # type: Dict[str, Metric]
+        self._collectors = []  # type: List[Callable[[], Iterable[Family]]]
+        self._lock = threading.Lock()
+        self._server = None
+
+    def _get_or_create(self, cls, name: str, help_text: str, labelnames: Iterable[str], **kwargs) -> Metric:
+        name = self.prefix + name
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, help_text, labelnames, **kwargs)
+                if not self.enabled:
+                    metric = _disabled(metric)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered with a different type or labels")
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Counter:
+        """Get or create a counter (name without the registry prefix)"""
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Gauge:
+        """Get or create a gauge (name without the registry prefix)"""
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram (name without the registry prefix)"""
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def register_collector(self, collector: Callable[[], Iterable[Family]]) -> None:
+        """
+        Add a callback run at exposition time (registering the same callback again is a no-op)
+
+        Args:
+            collector: Returns (name without prefix, type, help, [(labels, value), ...]) families
+        """
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    # ------------------------------------------------------------ exposition
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        lines = []
+        for metric in sorted(metrics, key=lambda metric: metric.name):
+            lines.append(f"# HELP {metric.name} {_escape(metric.help)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception:
+                continue  # A broken collector must not break the scrape
+            for name, kind, help_text, samples in families:
+                name = self.prefix + name
+                lines.append(f"# HELP {name} {_escape(help_text)}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> str:
+        """
+        Atomically write the exposition for node_exporter's textfile collector
+
+        Args:
+            path: Destination, normally a *.prom file in the collector directory
+
+        Returns:
+            The path
+        """
+        import tempfile
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".metrics.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.render())
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        return path
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> str:
+        """
+        Serve /metrics from a background thread for the rest of the process
+
+        Args:
+            port: TCP port (0 = any free port)
+            host: Interface to bind
+
+        Returns:
+            The scrape URL
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        with self._lock:
+            if self._server is None:
+                self._server = ThreadingHTTPServer((host, port), Handler)
+                self._server.daemon_threads = True
+                threading.Thread(target=self._server.serve_forever, daemon=True).start()
+            bound_host, bound_port = self._server.server_address[:2]
+        return f"http://{bound_host}:{bound_port}/metrics"
+
+    def stop(self) -> None:
+        """Stop the /metrics server, if running"""
+        with self._lock:
+            server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+
+def _disabled(metric: Metric) -> Metric:
+    """Turn a metric's recording methods into no-ops"""
+    for method in ("inc", "set", "observe"):
+        if hasattr(metric, method):
+            setattr(metric, method, lambda *args, **kwargs: None)
+    return metric
+
+
+_shared_registry = None
+_shared_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """
+    Process-wide metrics registry, configured from the optional "metrics"
+    section of config.json (enabled, port, textfile)
+    """
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            options = load_config().get("metrics") or {}
+            _shared_registry = MetricsRegistry(enabled=bool(options.get("enabled", True)))
+        return _shared_registry
+
+
+def metrics_options() -> Dict[str, Optional[object]]:
+    """The "metrics" config section's exposition settings (port, textfile)"""
+    options = load_config().get("metrics") or {}
+    return {'port': options.get("port"), 'textfile': options.get("textfile")}
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Number Profile
+Description: Canonical, immutable forms of a phone number from a single phonenumbers parse
+Version: 4.0.0
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple, Union
+
+import phonenumbers
+
+PROFILE_CACHE_SIZE = 4096
+
+_default_region = None
+
+
+def default_region() -> str:
+    """Region assumed for numbers without a leading '+' (the "default_region" setting, India by default)"""
+    global _default_region
+    if _default_region is None:
+        from utils.config import load_settings
+        _default_region = str(load_settings().get("default_region") or "IN").upper()
+    return _default_region
+
+
+_tool_default_region = default_region  # NumberProfile's default_region argument shadows the name
+
+
+def unique(values) -> List[str]:
+    """Non-empty values de-duplicated in first-seen order"""
+    seen = {}
+    for value in values:
+        if value and value.strip() and value not in seen:
+            seen[value] = None
+    return list(seen)
+
+
+class NumberProfile:
+    """
+    Every format of one phone number, parsed and formatted once
+
+    Instances are read-only and memoized by number_profile(), so modules can
+    share them freely across threads and probes.
+    """
+
+    __slots__ = ('raw', 'parsed', 'e164', 'digits', 'international', 'national', 'national_number',
+                 'national_dialing', 'trunk_prefix', 'country_code', 'region', 'valid', 'variations')
+
+    def __init__(self, raw: str, default_region: Optional[str] = None):
+        """
+        Args:
+            raw: Phone number as entered
+            default_region: Region for numbers without a leading '+'
+                            (None = the tool-wide default_region())
+        """
+        text = raw.strip()
+        digits = re.sub(r'\D', '', text)
+        parsed = None
+        try:
+            if text.startswith('+'):
+                parsed = phonenumbers.parse('+' + digits, None)
+            else:
+                # Digits that already start with the region's country code are recognised as such
+                parsed = phonenumbers.parse(digits, default_region or _tool_default_region())
+        except phonenumbers.NumberParseException:
+            pass
+
+        if parsed is not None and phonenumbers.is_valid_number(parsed):
+            fmt = phonenumbers.PhoneNumberFormat
+            e164 = phonenumbers.format_number(parsed, fmt.E164)
+            national = phonenumbers.format_number(parsed, fmt.NATIONAL)
+            region = phonenumbers.region_code_for_number(parsed)
+            metadata = phonenumbers.PhoneMetadata.metadata_for_region(region) if region else None
+            values = {
+                'parsed': parsed,
+                'e164': e164,
+                'digits': e164[1:],
+                'international': phonenumbers.format_number(parsed, fmt.INTERNATIONAL),
+                'national': national,
+                'national_number': phonenumbers.national_significant_number(parsed),
+                'national_dialing': re.sub(r'\D', '', national),
+                'trunk_prefix': (metadata.national_prefix if metadata else None) or '',
+                'country_code': parsed.country_code,
+                'region': region,
+                'valid': True,
+            }
+        else:
+            # Unparseable or invalid: derived national/local forms would be guesses,
+            # so only the digits the user typed are reformatted
+            values = {
+                'parsed': parsed,
+                'e164': '+' + digits if digits else text,
+                'digits': digits,
+                'international': text,
+                'national': text,
+                'national_number': digits,
+                'national_dialing': digits,
+                'trunk_prefix': '',
+                'country_code': None,
+                'region': None,
+                'valid': False,
+            }
+
+        values['raw'] = raw
+        if values['valid']:
+            variations = [
+                raw,
+                values['e164'],
+                values['digits'],
+                values['national_number'],
+                values['national_dialing'],
+                values['international'],
+                values['international'].replace(' ', '-'),
+                values['national'],
+            ]
+        else:
+            cleaned = re.sub(r'[^\d+]', '', text)
+            variations = [raw, cleaned, text.replace(' ', '-'), text.replace(' ', ''), cleaned.replace('+', '')]
+        values['variations'] = tuple(unique(variations))
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("NumberProfile is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("NumberProfile is immutable")
+
+    def __str__(self) -> str:
+        return self.raw
+
+    def __repr__(self) -> str:
+        return f"NumberProfile({self.e164!r}, region={self.region!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, NumberProfile) and other.raw == self.raw and other.e164 == self.e164
+
+    def __hash__(self) -> int:
+        return hash((self.raw, self.e164))
+
+    @property
+    def local_forms(self) -> Tuple[str, ...]:
+        """Digit-only forms a number is written in at home: national number and trunk-prefixed"""
+        return tuple(unique([self.national_number, self.national_dialing]))
+
+
+@lru_cache(maxsize=PROFILE_CACHE_SIZE)
+def _cached_profile(raw: str, default_region: Optional[str]) -> NumberProfile:
+    return NumberProfile(raw, default_region)
+
+
+def number_profile(number: Union[str, NumberProfile], default_region: Optional[str] = None) -> NumberProfile:
+    """
+    Shared profile for a number (profiles are passed through unchanged)
+
+    Args:
+        number: Raw phone number or an existing NumberProfile
+        default_region: Region for numbers without a leading '+' (None = default_region())
+
+    Returns:
+        Memoized NumberProfile
+    """
+    if isinstance(number, NumberProfile):
+        return number
+    return _cached_profile(number, default_region)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Probe Orchestrator
+Description: Run independent network probes concurrently with per-host caps, a scan deadline and optional quorum
+Version: 4.0.0
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, List, Optional
+from urllib.parse import urlparse
+
+
+class Probe:
+    """A single unit of work: one callable aimed at one host"""
+    __slots__ = ('name', 'host', 'func', 'args', 'kwargs', 'on_timeout', 'on_error')
+
+    def __init__(self, name: str, func: Callable, *args, url: Optional[str] = None,
+                 host: Optional[str] = None, on_timeout: Optional[Callable[[], Any]] = None,
+                 on_error: Optional[Callable[[BaseException], Any]] = None, **kwargs):
+        """
+        Args:
+            name: Label used in error messages
+            func: Callable doing the actual work
+            url: URL the probe will hit (used to derive the host)
+            host: Explicit host key for the per-host limit (overrides url)
+            on_timeout: Callable producing the result when the deadline expires
+            on_error: Callable turning an exception raised by func into the result
+        """
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.host = host or (urlparse(url).hostname if url else None) or name
+        self.on_timeout = on_timeout
+        self.on_error = on_error
+
+
+class ProbeOrchestrator:
+    def __init__(self, max_workers: int = 8, per_host_limit: int = 2, deadline: Optional[float] = 15.0):
+        """
+        Args:
+            max_workers: Size of the thread pool
+            per_host_limit: Maximum probes in flight against one host
+            deadline: Overall wall-clock budget per run in seconds (None = wait for all)
+        """
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.deadline = deadline
+        self._host_slots = {}  # host -> threading.BoundedSemaphore
+        self._lock = threading.Lock()
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_slots[host]
+
+    def _call(self, probe: Probe) -> Any:
+        with self._slot(probe.host):
+            return probe.func(*probe.args, **probe.kwargs)
+
+    def run(self, probes: List[Probe], quorum: Optional[int] = None,
+            accept: Optional[Callable[[Any], bool]] = None,
+            cancel: Optional[threading.Event] = None) -> List[Any]:
+        """
+        Run probes concurrently and collect their results
+
+        Args:
+            probes: Probes to run
+            quorum: Stop waiting once this many probes returned an accepted result (None = wait for all)
+            accept: Decides whether a result counts towards the quorum (default: truthiness)
+            cancel: Event set when the run stops early (quorum or deadline), so probes
+                    still in flight can abandon their work
+
+        Returns:
+            Results in the same order as probes, regardless of completion order.
+            Probes still running at the deadline (or when the quorum was reached) yield
+            probe.on_timeout() (or None); probes that raised yield probe.on_error(exception)
+            (or the exception instance).
+        """
+        if not probes:
+            return []
+
+        started = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(probes)))
+        try:
+            futures = [executor.submit(self._call, probe) for probe in probes]
+            if quorum:
+                self._wait_for_quorum(futures, started, quorum, accept or bool)
+            else:
+                remaining = None if self.deadline is None else max(0.0, self.deadline - (time.monotonic() - started))
+                wait(futures, timeout=remaining)
+        finally:
+            # Never block on stragglers past the deadline; their own timeouts end them
+            executor.shutdown(wait=False)
+
+        if cancel is not None and not all(future.done() for future in futures):
+            cancel.set()
+
+        results = []
+        for probe, future in zip(probes, futures):
+            if not future.done():
+                future.cancel()
+                results.append(probe.on_timeout() if probe.on_timeout else None)
+            elif future.cancelled():
+                results.append(probe.on_timeout() if probe.on_timeout else None)
+            elif future.exception() is not None:
+                error = future.exception()
+                results.append(probe.on_error(error) if probe.on_error else error)
+            else:
+                results.append(future.result())
+        return results
+
+    def _wait_for_quorum(self, futures: List[Any], started: float, quorum: int,
+                         accept: Callable[[Any], bool]) -> None:
+        """Wait until `quorum` futures produced accepted results, all finished, or the deadline passed"""
+        pending = set(futures)
+        accepted = 0
+        while pending:
+            remaining = None if self.deadline is None else self.deadline - (time.monotonic() - started)
+            if remaining is not None and remaining <= 0:
+                return
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                if not future.cancelled() and future.exception() is None and accept(future.result()):
+                    accepted += 1
+            if accepted >= quorum:
+                return
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Risk Prefix Index
+Description: Trie of high-risk E.164 prefixes (premium rate, one-ring scam, wangiri) for O(prefix length) lookups
+Version: 4.0.0
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+DEFAULT_PREFIXES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     "data", "risk_prefixes.json")
+
+_ENTRY = ""  # Trie key holding the entry for the prefix ending at this node (digits are never empty)
+
+
+class RiskPrefix:
+    __slots__ = ('prefix', 'rule_id', 'category', 'description')
+
+    def __init__(self, prefix: str, rule_id: str, category: str, description: str):
+        self.prefix = prefix
+        self.rule_id = rule_id
+        self.category = category
+        self.description = description
+
+    def __repr__(self) -> str:
+        return f"RiskPrefix({self.prefix!r}, {self.rule_id!r}, {self.category!r})"
+
+
+class PrefixIndex:
+    def __init__(self, path: str = DEFAULT_PREFIXES_PATH):
+        """
+        Args:
+            path: Versioned JSON file of risk prefixes
+        """
+        self.path = path
+        self.version = None
+        self._root = {}
+        self.size = 0
+        self.load(path)
+
+    def load(self, path: str) -> None:
+        """Build the trie from a prefix data file"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        root = {}
+        size = 0
+        for spec in data.get("entries", []):
+            prefix = spec["prefix"]
+            if not prefix.isdigit():
+                raise ValueError(f"Risk prefix must be digits only: {prefix!r}")
+            node = root
+            for digit in prefix:
+                node = node.setdefault(digit, {})
+            if _ENTRY not in node:
+                size += 1
+            node[_ENTRY] = RiskPrefix(prefix, spec["id"], spec.get("category", "high_risk"),
+                                      spec.get("description", spec["id"]))
+
+        self.version = data.get("version")
+        self._root = root
+        self.size = size
+
+    def lookup(self, digits: str) -> List[RiskPrefix]:
+        """
+        Every risk prefix of an E.164 number, shortest first
+
+        Args:
+            digits: Calling code + national number, digits only (no '+')
+
+        Returns:
+            List of matching RiskPrefix entries
+        """
+        matches = []
+        node = self._root
+        for digit in digits:
+            node = node.get(digit)
+            if node is None:
+                break
+            entry = node.get(_ENTRY)
+            if entry is not None:
+                matches.append(entry)
+        return matches
+
+    def longest_match(self, digits: str) -> Optional[RiskPrefix]:
+        """Most specific risk prefix of a number, or None"""
+        matches = self.lookup(digits)
+        return matches[-1] if matches else None
+
+    def categories(self) -> Dict[str, int]:
+        """Number of prefixes per category"""
+        counts = {}
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for key, value in node.items():
+                if key == _ENTRY:
+                    counts[value.category] = counts.get(value.category, 0) + 1
+                else:
+                    stack.append(value)
+        return counts
+
+
+_shared_index = None
+_shared_lock = threading.Lock()
+
+
+def get_prefix_index() -> PrefixIndex:
+    """Process-wide prefix index, loaded once on first use"""
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = PrefixIndex()
+        return _shared_index
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Profiling
+Description: Per-stage timing spans, a summary table, cProfile dumps and Chrome trace-event export
+Version: 4.0.0
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class Span:
+    """One timed stage; start and end are perf_counter seconds"""
+    __slots__ = ('name', 'start', 'end', 'thread_id', 'args')
+
+    def __init__(self, name: str, start: float, thread_id: int, args: Dict[str, Any]):
+        self.name = name
+        self.start = start
+        self.end = start
+        self.thread_id = thread_id
+        self.args = args
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class Profiler:
+    """
+    Collects timing spans from any thread.
+
+    Disabled profilers hand out a shared no-op context, so instrumented code
+    costs one attribute check when --profile is not given.
+    """
+
+    def __init__(self, enabled: bool = False):
+        """
+        Args:
+            enabled: Record spans from the start
+        """
+        self.enabled = enabled
+        self.spans = []  # type: List[Span]
+        self.origin = time.perf_counter()
+        self.origin_wall = time.time()
+        self.finished = None  # type: Optional[float]
+        self._threads = {}  # type: Dict[int, str]
+        self._cprofile = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------- recording
+
+    def start(self, cprofile: bool = False) -> "Profiler":
+        """
+        Reset and start recording
+
+        Args:
+            cprofile: Also run cProfile on the calling thread (probe worker threads are
+                      only visible through their spans)
+        """
+        with self._lock:
+            self.spans = []
+            self._threads = {}
+            self.origin = time.perf_counter()
+            self.origin_wall = time.time()
+            self.finished = None
+            self.enabled = True
+        if cprofile:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        return self
+
+    def stop(self) -> None:
+        """Stop recording; spans and the cProfile data stay available"""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self.enabled:
+            self.finished = time.perf_counter()
+        self.enabled = False
+
+    @contextmanager
+    def _record(self, name: str, args: Dict[str, Any]) -> Iterator[Span]:
+        thread = threading.current_thread()
+        span = Span(name, time.perf_counter(), thread.ident, args)
+        try:
+            yield span
+        except BaseException as e:
+            span.args['error'] = type(e).__name__
+            raise
+        finally:
+            span.end = time.perf_counter()
+            with self._lock:
+                self._threads.setdefault(thread.ident, thread.name)
+                self.spans.append(span)
+
+    def span(self, name: str, **args):
+        """
+        Time a stage
+
+        Args:
+            name: Stage name; spans with the same name are aggregated in the summary
+            **args: Details shown on the trace event (e.g. host or platform)
+
+        Returns:
+            Context manager yielding the Span (or None when disabled)
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._record(name, args)
+
+    # --------------------------------------------------------------- reports
+
+    def wall_time(self) -> float:
+        """Seconds from start() to stop() (or to now while recording)"""
+        return (self.finished or time.perf_counter()) - self.origin
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Aggregate spans per stage
+
+        Returns:
+            One row per stage name, slowest total first: count, total, mean, max
+            (seconds) and share of the wall time. Concurrent spans may add up to more than 100%.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        stages = {}
+        for span in spans:
+            entry = stages.setdefault(span.name, {'stage': span.name, 'count': 0, 'total': 0.0, 'max': 0.0})
+            entry['count'] += 1
+            entry['total'] += span.duration
+            entry['max'] = max(entry['max'], span.duration)
+        wall = self.wall_time() or 1e-9
+        rows = sorted(stages.values(), key=lambda entry: entry['total'], reverse=True)
+        for row in rows:
+            row['mean'] = row['total'] / row['count']
+            row['share'] = row['total'] / wall
+        return rows
+
+    def format_summary(self) -> str:
+        """Per-stage summary as a plain-text table"""
+        lines = [f"{'stage':<28} {'count':>6} {'total ms':>10} {'mean ms':>10} {'max ms':>10} {'wall %':>7}"]
+        for row in self.summary():
+            lines.append(f"{row['stage']:<28} {row['count']:>6} {row['total'] * 1000:>10.1f} "
+                         f"{row['mean'] * 1000:>10.1f} {row['max'] * 1000:>10.1f} {row['share']:>7.1%}")
+        lines.append(f"{'wall time':<28} {'':>6} {self.wall_time() * 1000:>10.1f}")
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """
+        Spans as Chrome trace events (load in chrome://tracing or ui.perfetto.dev)
+
+        Returns:
+            Trace document with one complete ('X') event per span and thread-name metadata
+        """
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+            threads = dict(self._threads)
+        # Small, stable tids: the main thread first, others in order of first appearance
+        tids = {}
+        for ident in [threading.main_thread().ident] + [span.thread_id for span in
+                                                        sorted(spans, key=lambda span: span.start)]:
+            tids.setdefault(ident, len(tids) + 1)
+
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': 'numintense'}}]
+        for ident, name in threads.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tids[ident],
+                           'args': {'name': name}})
+        for span in sorted(spans, key=lambda span: span.start):
+            events.append({
+                'name': span.name,
+                'cat': span.name.split('.', 1)[0],
+                'ph': 'X',
+                'ts': round((span.start - self.origin) * 1e6, 3),
+                'dur': round(span.duration * 1e6, 3),
+                'pid': pid,
+                'tid': tids[span.thread_id],
+                'args': {key: value if isinstance(value, (int, float, bool)) or value is None else str(value)
+                         for key, value in span.args.items()},
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms',
+                'otherData': {'started': self.origin_wall, 'wall_time_s': self.wall_time()}}
+
+    def write_chrome_trace(self, path: str) -> str:
+        """Atomically write the Chrome trace JSON and return its path"""
+        import tempfile
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".trace.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.chrome_trace(), f)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        return path
+
+    def dump_cprofile(self, path: str) -> Optional[str]:
+        """Write cProfile statistics (pstats format) and return the path, if cProfile ran"""
+        if self._cprofile is None:
+            return None
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._cprofile.dump_stats(path)
+        return path
+
+
+class _NullSpan:
+    """Context manager used while profiling is off"""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def stage(name: str) -> Callable:
+    """
+    Decorator timing a whole method as a span on `self.profiler`
+
+    Args:
+        name: Stage name
+    """
+    def decorator(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.profiler.span(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+_shared_profiler = None
+_shared_lock = threading.Lock()
+
+
+def get_profiler() -> Profiler:
+    """Process-wide profiler; disabled until --profile starts it"""
+    global _shared_profiler
+    with _shared_lock:
+        if _shared_profiler is None:
+            _shared_profiler = Profiler()
+        return _shared_profiler
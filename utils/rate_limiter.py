@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter
+Description: Per-host token buckets shared by every network call
+Version: 4.0.0
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from utils.config import load_config, load_settings
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    Callers reserve a token under the lock and sleep outside it, so waiting
+    threads queue up in order without holding anything.
+    """
+
+    def __init__(self, burst: int = 1):
+        """
+        Args:
+            burst: Requests allowed back to back before pacing kicks in
+        """
+        self.burst = max(1, int(burst))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, interval: float) -> float:
+        """
+        Take one token, refilling at one token per `interval` seconds
+
+        Args:
+            interval: Seconds per token
+
+        Returns:
+            Seconds the caller must wait before using the token
+        """
+        with self._lock:
+            now = time.monotonic()
+            if interval <= 0:
+                self.tokens = float(self.burst)
+                self.updated = now
+                return 0.0
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) / interval)
+            self.updated = now
+            self.tokens -= 1
+            # A negative balance is a queue: each waiter owes one more interval
+            return 0.0 if self.tokens >= 0 else -self.tokens * interval
+
+
+class RateLimiter:
+    def __init__(self, delay: float = 0.0, burst: int = 1, host_delays: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            delay: Minimum seconds between requests to one host (0 = unlimited)
+            burst: Requests per host allowed back to back
+            host_delays: Per-host overrides of `delay` (a 'example.com' entry also covers its subdomains)
+        """
+        self.delay = float(delay or 0)
+        self.burst = burst
+        self.host_delays = {host.lower(): float(value) for host, value in (host_delays or {}).items()}
+        self._floors = []  # type: List[Tuple[float, Optional[FrozenSet[str]]]]
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._waited = 0.0
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Dict] = None, config: Optional[Dict] = None) -> "RateLimiter":
+        """
+        Build a limiter from operation settings (rate_limit_delay, rate_limit_burst)
+        and the optional "rate_limits" config section mapping hosts to delays
+        """
+        settings = settings if settings is not None else load_settings()
+        config = config if config is not None else load_config()
+        host_delays = config.get("rate_limits")
+        return cls(
+            delay=float(settings.get("rate_limit_delay") or 0),
+            burst=int(settings.get("rate_limit_burst") or 1),
+            host_delays=host_delays if isinstance(host_delays, dict) else None,
+        )
+
+    @staticmethod
+    def _candidates(host: str) -> Iterator[str]:
+        """A host and its parent domains ('api.example.com', 'example.com', 'com')"""
+        candidate = host
+        while candidate:
+            yield candidate
+            candidate = candidate.partition('.')[2]
+
+    def interval_for(self, host: str) -> float:
+        """Effective spacing for a host: its override (or the default), raised by any pace() covering it"""
+        host = host.lower()
+        interval = self.delay
+        for candidate in self._candidates(host):
+            if candidate in self.host_delays:
+                interval = self.host_delays[candidate]
+                break
+        for floor, hosts in self._floors:
+            if floor > interval and (hosts is None or any(c in hosts for c in self._candidates(host))):
+                interval = floor
+        return interval
+
+    def acquire(self, host: str) -> float:
+        """
+        Block until a request to `host` is allowed
+
+        Args:
+            host: Host name (or any key, e.g. a WHOIS server)
+
+        Returns:
+            Seconds spent waiting
+        """
+        interval = self.interval_for(host)
+        if interval <= 0:
+            return 0.0
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.burst)
+        wait = bucket.reserve(interval)
+        if wait > 0:
+            time.sleep(wait)
+            with self._lock:
+                self._waited += wait
+        return wait
+
+    def acquire_url(self, url: str) -> float:
+        """acquire() for the host of a URL"""
+        return self.acquire(urlparse(url).hostname or "")
+
+    @contextmanager
+    def pace(self, delay: Optional[float], hosts: Optional[Iterable[str]] = None) -> Iterator["RateLimiter"]:
+        """
+        Temporarily enforce at least `delay` seconds between requests to each host of a batch
+
+        Args:
+            delay: Minimum spacing while the block runs (None = no change)
+            hosts: Hosts or limiter keys the floor applies to ('example.com' also covers
+                   its subdomains); None applies it to every host
+        """
+        if not delay:
+            yield self
+            return
+        floor = (float(delay), None if hosts is None else frozenset(host.lower() for host in hosts))
+        with self._lock:
+            self._floors = self._floors + [floor]
+        try:
+            yield self
+        finally:
+            with self._lock:
+                floors = list(self._floors)
+                floors.remove(floor)
+                self._floors = floors
+
+    def stats(self) -> Dict[str, float]:
+        """Hosts seen and total seconds spent waiting"""
+        with self._lock:
+            return {'hosts': len(self._buckets), 'waited': round(self._waited, 3)}
+
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide limiter configured from config.json, created on first use"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter.from_settings()
+        return _shared_limiter
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Record / Replay Transport
+Description: Cassette-backed HTTP and WHOIS responses with latency and error injection for offline runs
+Version: 4.0.0
+"""
+
+import atexit
+import base64
+import json
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import parse_qsl, quote, urlencode, urlparse, urlunparse
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from utils.config import load_config
+
+REPLAY_MODES = ["off", "record", "replay", "standin"]
+
+DEFAULT_CASSETTE = os.path.join("data", "cassettes", "default.json")
+
+# Query parameters never written to a cassette (request headers are not recorded at all)
+SECRET_PARAMS = {"access_key", "api_key", "apikey", "key", "token"}
+
+# Response headers worth keeping (hop-by-hop and encoding headers would lie after replay)
+KEPT_HEADERS = {"content-type", "location", "retry-after"}
+
+
+def request_key(method: str, url: str) -> str:
+    """
+    Cassette key of a request: method plus URL with sorted, secret-free query
+
+    Args:
+        method: HTTP method
+        url: Full request URL (query included)
+
+    Returns:
+        e.g. 'GET https://apilayer.net/api/validate?format=1&number=%2B1415'
+    """
+    parts = urlparse(url)
+    query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if name.lower() not in SECRET_PARAMS)
+    clean = urlunparse((parts.scheme, parts.netloc.lower(), parts.path or "/", "", urlencode(query), ""))
+    return f"{method.upper()} {clean}"
+
+
+class Cassette:
+    """
+    Recorded HTTP interactions and WHOIS answers in one JSON file
+
+    {"http": {"<request key>": {"status", "headers", "body" | "body_b64", "latency"}},
+     "whois": {"<domain>": "<raw WHOIS text>"}}
+    """
+
+    def __init__(self, path: str = DEFAULT_CASSETTE):
+        self.path = path
+        self.http = {}  # type: Dict[str, Dict[str, Any]]
+        self.whois = {}  # type: Dict[str, str]
+        self.dirty = False
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.http = dict(data.get("http") or {})
+        self.whois = dict(data.get("whois") or {})
+
+    def save(self) -> None:
+        """Atomically write the cassette if anything was recorded"""
+        with self._lock:
+            if not self.dirty:
+                return
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".cassette.", suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"http": self.http, "whois": self.whois}, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+            self.dirty = False
+
+    def find(self, method: str, url: str) -> Optional[Dict[str, Any]]:
+        """Recorded interaction for a request (None = not recorded)"""
+        return self.http.get(request_key(method, url))
+
+    def add(self, method: str, url: str, status: int, headers: Dict[str, str], body: bytes,
+            latency: float = 0.0) -> None:
+        entry = {
+            "status": status,
+            "headers": {name: value for name, value in headers.items() if name.lower() in KEPT_HEADERS},
+            "latency": round(latency, 4),
+        }
+        try:
+            entry["body"] = body.decode('utf-8')
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(body).decode('ascii')
+        with self._lock:
+            self.http[request_key(method, url)] = entry
+            self.dirty = True
+
+    def find_whois(self, domain: str) -> Optional[str]:
+        return self.whois.get(domain.lower())
+
+    def add_whois(self, domain: str, text: str) -> None:
+        with self._lock:
+            self.whois[domain.lower()] = text
+            self.dirty = True
+
+
+def entry_body(entry: Dict[str, Any]) -> bytes:
+    """Raw body bytes of a cassette entry"""
+    if "body_b64" in entry:
+        return base64.b64decode(entry["body_b64"])
+    return (entry.get("body") or "").encode('utf-8')
+
+
+class FaultInjector:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 host_latency: Optional[Dict[str, float]] = None, seed: Optional[int] = 0,
+                 use_recorded_latency: bool = False):
+        """
+        Args:
+            latency: Seconds added to every response
+            jitter: Extra uniformly random seconds (0..jitter)
+            error_rate: Probability (0..1) that a request fails with a connection error
+            host_latency: Per-host latency overriding `latency`
+            seed: Random seed, so a run's faults are reproducible (None = random)
+            use_recorded_latency: Replay each response after the latency it had when recorded
+        """
+        self.latency = float(latency)
+        self.jitter = float(jitter)
+        self.error_rate = float(error_rate)
+        self.host_latency = {host.lower(): float(value) for host, value in (host_latency or {}).items()}
+        self.use_recorded_latency = use_recorded_latency
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay_for(self, host: str, recorded: float = 0.0) -> float:
+        base = self.host_latency.get(host.lower(), self.latency)
+        if self.use_recorded_latency:
+            base = max(base, recorded)
+        with self._lock:
+            return base + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def should_fail(self) -> bool:
+        if self.error_rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def apply(self, host: str, recorded: float = 0.0) -> bool:
+        """
+        Sleep the configured latency
+
+        Returns:
+            True when this request should fail instead of answering
+        """
+        delay = self.delay_for(host, recorded)
+        if delay > 0:
+            time.sleep(delay)
+        return self.should_fail()
+
+    @classmethod
+    def from_options(cls, options: Dict[str, Any]) -> "FaultInjector":
+        return cls(
+            latency=float(options.get("latency", 0)),
+            jitter=float(options.get("jitter", 0)),
+            error_rate=float(options.get("error_rate", 0)),
+            host_latency=options.get("host_latency"),
+            seed=options.get("seed", 0),
+            use_recorded_latency=bool(options.get("recorded_latency", False)),
+        )
+
+
+def build_response(request: requests.PreparedRequest, status: int, headers: Dict[str, str],
+                   body: bytes) -> requests.Response:
+    """A fully read requests.Response for canned data"""
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response.headers['Content-Length'] = str(len(body))
+    response._content = body
+    response._content_consumed = True
+    response.url = request.url
+    response.request = request
+    response.reason = requests.status_codes._codes.get(status, ("",))[0].replace('_', ' ').upper()
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers) or 'utf-8'
+    return response
+
+
+class CassetteMiss(requests.ConnectionError):
+    """A replayed request that was never recorded"""
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Transport adapter that records live responses to, or replays them from, a cassette
+
+    In replay mode nothing leaves the machine: unrecorded requests raise CassetteMiss.
+    """
+
+    def __init__(self, cassette: Cassette, mode: str = "replay", faults: Optional[FaultInjector] = None,
+                 live: Optional[BaseAdapter] = None):
+        super().__init__()
+        if mode not in ("record", "replay"):
+            raise ValueError(f"ReplayAdapter mode must be 'record' or 'replay', not {mode!r}")
+        self.cassette = cassette
+        self.mode = mode
+        self.faults = faults or FaultInjector()
+        self.live = live or HTTPAdapter()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        host = urlparse(request.url).hostname or ""
+        if self.mode == "record":
+            started = time.perf_counter()
+            response = self.live.send(request, stream=False, timeout=timeout, verify=verify,
+                                      cert=cert, proxies=proxies)
+            self.cassette.add(request.method, request.url, response.status_code, dict(response.headers),
+                              response.content, time.perf_counter() - started)
+            return response
+
+        entry = self.cassette.find(request.method, request.url)
+        if entry is None:
+            raise CassetteMiss(f"No recorded response for {request_key(request.method, request.url)}",
+                               request=request)
+        if self.faults.apply(host, entry.get("latency", 0.0)):
+            raise requests.ConnectionError(f"Injected connection error for {host}", request=request)
+        return build_response(request, int(entry["status"]), dict(entry.get("headers") or {}), entry_body(entry))
+
+    def close(self):
+        self.live.close()
+        if self.mode == "record":
+            self.cassette.save()
+
+
+class StandInAdapter(HTTPAdapter):
+    """
+    Sends every request to the local stand-in server instead of the real host
+
+    https://www.tellows.com/num/1415 becomes <server>/https/www.tellows.com/num/1415,
+    so one server can impersonate every upstream.
+    """
+
+    def __init__(self, server: str, **kwargs):
+        super().__init__(**kwargs)
+        self.server = server.rstrip('/')
+
+    def send(self, request, **kwargs):
+        parts = urlparse(request.url)
+        target = f"{self.server}/{parts.scheme}/{parts.netloc}{quote(parts.path or '/', safe='/%:@')}"
+        if parts.query:
+            target += "?" + parts.query
+        request = request.copy()
+        request.url = target
+        return super().send(request, **kwargs)
+
+
+def standin_url(path: str) -> Optional[str]:
+    """Original URL encoded in a stand-in request path ('/https/host/path?q' -> 'https://host/path?q')"""
+    scheme, _, rest = path.lstrip('/').partition('/')
+    if scheme not in ("http", "https") or not rest:
+        return None
+    netloc, slash, tail = rest.partition('/')
+    return f"{scheme}://{netloc}/{tail}"
+
+
+def replay_options() -> Dict[str, Any]:
+    """The "replay" config section with defaults (mode 'off' when absent)"""
+    options = {"mode": "off", "cassette": DEFAULT_CASSETTE}
+    section = load_config().get("replay")
+    if isinstance(section, dict):
+        options.update(section)
+    if options["mode"] not in REPLAY_MODES:
+        raise ValueError(f"Unknown replay mode: {options['mode']} (expected one of {', '.join(REPLAY_MODES)})")
+    return options
+
+
+_cassettes = {}  # type: Dict[str, Cassette]
+_cassettes_lock = threading.Lock()
+
+
+def get_cassette(path: str) -> Cassette:
+    """Cassette shared by the HTTP transport and the WHOIS backend of one run"""
+    with _cassettes_lock:
+        if path not in _cassettes:
+            _cassettes[path] = Cassette(path)
+        return _cassettes[path]
+
+
+def install_replay(session: requests.Session, options: Optional[Dict[str, Any]] = None,
+                   pool_kwargs: Optional[Dict[str, Any]] = None) -> Optional[BaseAdapter]:
+    """
+    Mount the configured record/replay/stand-in adapter on a session
+
+    Args:
+        session: Session to mount on (both http:// and https://)
+        options: Replay options (default: replay_options())
+        pool_kwargs: Connection pool settings for adapters that open real connections
+
+    Returns:
+        The mounted adapter, or None when replay is off
+    """
+    options = replay_options() if options is None else options
+    mode = options.get("mode", "off")
+    pool_kwargs = pool_kwargs or {}
+    if mode == "off":
+        return None
+    if mode == "standin":
+        adapter = StandInAdapter(options.get("server", "http://127.0.0.1:8765"), **pool_kwargs)
+    else:
+        cassette = get_cassette(options.get("cassette", DEFAULT_CASSETTE))
+        adapter = ReplayAdapter(cassette, mode, FaultInjector.from_options(options), HTTPAdapter(**pool_kwargs))
+        if mode == "record":
+            atexit.register(cassette.save)  # The shared transport is never closed explicitly
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return adapter
+
+
+# ------------------------------------------------------------------ WHOIS
+
+def query_whois_server(domain: str, server: str, timeout: float = 10.0) -> str:
+    """
+    Raw WHOIS (RFC 3912) query
+
+    Args:
+        domain: Domain to look up
+        server: 'host' or 'host:port'
+
+    Returns:
+        Response text
+    """
+    host, _, port = server.partition(':')
+    chunks = []
+    with socket.create_connection((host, int(port or 43)), timeout=timeout) as sock:
+        sock.sendall(domain.encode('idna') + b"\r\n")
+        while True:
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return b"".join(chunks).decode('utf-8', errors='replace')
+
+
+def parse_whois_text(domain: str, text: str):
+    """Parse raw WHOIS text the way whois.whois() would"""
+    import whois
+    if not text.strip() or "no match" in text.lower():
+        raise whois.parser.PywhoisError(f"No match for {domain}")
+    return whois.parser.WhoisEntry.load(domain, text)
+
+
+def whois_backend(options: Optional[Dict[str, Any]] = None) -> Optional[Callable[[str], Any]]:
+    """
+    Replacement for whois.whois() under the configured replay mode
+
+    Returns:
+        Callable(domain) -> parsed WHOIS entry, or None when WHOIS should go to the real registries
+    """
+    options = replay_options() if options is None else options
+    mode = options.get("mode", "off")
+    if mode == "off":
+        return None
+
+    if mode == "standin":
+        server = options.get("whois_server", "127.0.0.1:4343")
+        return lambda domain: parse_whois_text(domain, query_whois_server(domain, server))
+
+    cassette = get_cassette(options.get("cassette", DEFAULT_CASSETTE))
+    faults = FaultInjector.from_options(options)
+
+    def record(domain: str):
+        import whois
+        result = whois.whois(domain)
+        cassette.add_whois(domain, getattr(result, 'text', '') or '')
+        cassette.save()
+        return result
+
+    def replay(domain: str):
+        text = cassette.find_whois(domain)
+        if text is None:
+            raise ConnectionError(f"No recorded WHOIS answer for {domain}")
+        if faults.apply(f"whois:{domain.rsplit('.', 1)[-1]}"):
+            raise ConnectionError(f"Injected WHOIS error for {domain}")
+        return parse_whois_text(domain, text)
+
+    return record if mode == "record" else replay
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Report Archive
+Description: Content-addressed, sharded report storage with compression and retention rotation
+Version: 4.0.0
+"""
+
+import gzip
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+from utils.config import load_config
+
+DEFAULT_REPORT_DIR = "reports"
+
+DAY = 86400
+
+# Marker whose mtime records the last rotation, so frequent stores do not rescan the tree
+ROTATION_MARKER = ".last_rotation"
+
+_UNSAFE = re.compile(r'[^A-Za-z0-9._-]+')
+
+# Archived report names end in the first 16 hex digits of their digest
+_ARCHIVED_NAME = re.compile(r'_[0-9a-f]{16}\.[A-Za-z0-9]+(\.gz)?$')
+
+
+def safe_name(value: str) -> str:
+    """File-name-safe version of a prefix or case ID"""
+    return _UNSAFE.sub('_', value).strip('._') or "report"
+
+
+class ReportArchive:
+    def __init__(self, root: str = DEFAULT_REPORT_DIR, shard_depth: int = 2, shard_width: int = 2,
+                 compress_after: Optional[float] = DAY, max_age: Optional[float] = 30 * DAY,
+                 max_bytes: Optional[int] = 512 * 1024 * 1024, rotate_interval: float = 3600):
+        """
+        Args:
+            root: Archive directory
+            shard_depth: Levels of hash-named subdirectories
+            shard_width: Hex characters per shard level (2 -> 256 directories per level)
+            compress_after: Age in seconds after which reports are gzipped (None = never)
+            max_age: Age in seconds after which reports are deleted (None = keep)
+            max_bytes: Total archive size; oldest reports are deleted beyond it (None = unlimited)
+            rotate_interval: Minimum seconds between automatic rotations triggered by store()
+        """
+        self.root = root
+        self.shard_depth = shard_depth
+        self.shard_width = shard_width
+        self.compress_after = compress_after
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ naming
+
+    def ensure_root(self) -> str:
+        """Create the archive directory if needed"""
+        os.makedirs(self.root, exist_ok=True)
+        return self.root
+
+    def shard_dir(self, digest: str) -> str:
+        """Subdirectory for a hex digest, e.g. reports/3f/a2"""
+        parts = [digest[i * self.shard_width:(i + 1) * self.shard_width] for i in range(self.shard_depth)]
+        return os.path.join(self.root, *parts)
+
+    def path_for(self, case_id: str, content: Optional[Union[str, bytes]] = None,
+                 extension: str = "txt", prefix: Optional[str] = None) -> str:
+        """
+        Archive path of a report
+
+        Args:
+            case_id: Case ID the report belongs to
+            content: Report body; identical content maps to the same path.
+                     Without it a random ID keeps the name unique.
+            extension: File extension
+            prefix: Optional report kind (e.g. 'spam_report')
+
+        Returns:
+            Path like reports/3f/a2/<prefix>_<case id>_<hash>.<extension>
+        """
+        if content is None:
+            digest = uuid.uuid4().hex
+        else:
+            data = content.encode('utf-8') if isinstance(content, str) else content
+            digest = hashlib.sha256(data).hexdigest()
+        name = "_".join(safe_name(part) for part in (prefix, case_id) if part)
+        return os.path.join(self.shard_dir(digest), f"{name}_{digest[:16]}.{extension.lstrip('.')}")
+
+    # ----------------------------------------------------------------- storing
+
+    def store(self, case_id: str, content: Union[str, bytes], extension: str = "txt",
+              prefix: Optional[str] = None) -> str:
+        """
+        Atomically write a report into the archive
+
+        Re-storing identical content for the same case is a no-op, and two
+        reports written in the same second can never collide.
+
+        Args:
+            case_id: Case ID the report belongs to
+            content: Report body
+            extension: File extension
+            prefix: Optional report kind
+
+        Returns:
+            Path of the stored report (the .gz path if it was already compressed)
+        """
+        path = self.path_for(case_id, content, extension, prefix)
+        if os.path.exists(path):
+            return path
+        if os.path.exists(path + ".gz"):
+            return path + ".gz"
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+        self.maybe_rotate()
+        return path
+
+    # ---------------------------------------------------------------- rotation
+
+    def _is_shard(self, name: str) -> bool:
+        return len(name) == self.shard_width and all(c in "0123456789abcdef" for c in name)
+
+    def _shard_dirs(self) -> Iterator[Tuple[str, int]]:
+        """(path, level) of every hash-named shard directory, parents before children"""
+        level_dirs = [self.root]
+        for level in range(1, self.shard_depth + 1):
+            next_level = []
+            for parent in level_dirs:
+                try:
+                    names = sorted(os.listdir(parent))
+                except OSError:
+                    continue
+                for name in names:
+                    path = os.path.join(parent, name)
+                    if self._is_shard(name) and os.path.isdir(path):
+                        next_level.append(path)
+                        yield path, level
+            level_dirs = next_level
+
+    def iter_reports(self) -> Iterator[Tuple[str, os.stat_result]]:
+        """
+        Every archived report with its stat result
+
+        Only files named by path_for() inside the hash shards count; anything
+        else under the root (older flat reports, user files) is never touched.
+        """
+        if not os.path.isdir(self.root):
+            return
+        for directory, level in self._shard_dirs():
+            if level != self.shard_depth:
+                continue
+            try:
+                names = sorted(os.listdir(directory))
+            except OSError:
+                continue
+            for name in names:
+                if name.startswith(".") or not _ARCHIVED_NAME.search(name):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    info = os.stat(path)
+                except OSError:
+                    continue
+                if os.path.isfile(path):
+                    yield path, info
+
+    def maybe_rotate(self) -> Optional[Dict[str, int]]:
+        """Rotate if the last rotation is older than rotate_interval"""
+        marker = os.path.join(self.root, ROTATION_MARKER)
+        try:
+            if time.time() - os.stat(marker).st_mtime < self.rotate_interval:
+                return None
+        except OSError:
+            pass
+        return self.rotate()
+
+    def rotate(self, now: Optional[float] = None) -> Dict[str, int]:
+        """
+        Apply compression and retention
+
+        Args:
+            now: Reference time (defaults to the current time)
+
+        Returns:
+            Counters: compressed, expired, evicted, reports, bytes
+        """
+        now = time.time() if now is None else now
+        stats = {'compressed': 0, 'expired': 0, 'evicted': 0, 'reports': 0, 'bytes': 0}
+
+        with self._lock:
+            self.ensure_root()
+            with open(os.path.join(self.root, ROTATION_MARKER), 'a'):
+                os.utime(os.path.join(self.root, ROTATION_MARKER), (now, now))
+
+            kept = []
+            for path, info in self.iter_reports():
+                age = now - info.st_mtime
+                if self.max_age is not None and age > self.max_age:
+                    self._remove(path)
+                    stats['expired'] += 1
+                    continue
+                if self.compress_after is not None and age > self.compress_after and not path.endswith(".gz"):
+                    compressed = self._compress(path, info)
+                    if compressed is not None:
+                        path, info = compressed
+                        stats['compressed'] += 1
+                kept.append((info.st_mtime, info.st_size, path))
+
+            total = sum(size for _, size, _ in kept)
+            if self.max_bytes is not None and total > self.max_bytes:
+                kept.sort()  # Oldest first
+                while kept and total > self.max_bytes:
+                    _, size, path = kept.pop(0)
+                    self._remove(path)
+                    total -= size
+                    stats['evicted'] += 1
+
+            stats['reports'] = len(kept)
+            stats['bytes'] = total
+            self._prune_empty_dirs()
+        return stats
+
+    def _compress(self, path: str, info: os.stat_result) -> Optional[Tuple[str, os.stat_result]]:
+        """gzip a report in place, keeping its mtime so retention still sees its real age"""
+        target = path + ".gz"
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".", suffix=".tmp")
+        try:
+            with open(path, 'rb') as source, os.fdopen(fd, 'wb') as raw:
+                with gzip.GzipFile(filename=os.path.basename(path), fileobj=raw, mode='wb',
+                                   mtime=int(info.st_mtime)) as gz:
+                    shutil.copyfileobj(source, gz)
+            os.utime(temp_path, (info.st_atime, info.st_mtime))
+            os.replace(temp_path, target)
+            os.unlink(path)
+            return target, os.stat(target)
+        except OSError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            return None
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def _prune_empty_dirs(self) -> None:
+        # Only hash shards, deepest first, so a shard emptied by removing its last child goes too
+        for directory, _ in sorted(self._shard_dirs(), key=lambda item: item[1], reverse=True):
+            try:
+                os.rmdir(directory)  # Fails (harmlessly) unless empty
+            except OSError:
+                pass
+
+
+_shared_archive = None
+_shared_lock = threading.Lock()
+
+
+def get_report_archive() -> ReportArchive:
+    """
+    Process-wide report archive, configured from the optional "reports"
+    section of config.json (directory, shard_depth, compress_after_days,
+    max_age_days, max_size_mb; null disables a limit).
+
+    Retention defaults: gzip after 1 day, delete after 30 days, 512 MB cap.
+    They apply to archived reports in the hash shards only.
+    """
+    global _shared_archive
+    with _shared_lock:
+        if _shared_archive is None:
+            options = load_config().get("reports") or {}
+
+            def days(key: str, default: Optional[float]) -> Optional[float]:
+                value = options.get(key, default)
+                return None if value is None else float(value) * DAY
+
+            max_size_mb = options.get("max_size_mb", 512)
+            _shared_archive = ReportArchive(
+                root=options.get("directory", DEFAULT_REPORT_DIR),
+                shard_depth=int(options.get("shard_depth", 2)),
+                compress_after=days("compress_after_days", 1),
+                max_age=days("max_age_days", 30),
+                max_bytes=None if max_size_mb is None else int(float(max_size_mb) * 1024 * 1024),
+            )
+        return _shared_archive
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Report Sink
+Description: Buffered, atomically committed report files (text/JSONL/CSV, optional gzip, append mode)
+Version: 4.0.0
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, TextIO, Tuple
+
+REPORT_FORMATS = ["text", "jsonl", "csv"]
+
+# Large writes: one syscall per MiB instead of one per report line
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+CSV_FIELDNAMES = ['report', 'target', 'field', 'value']
+
+# Attempts at a unique temporary name before giving up
+_TEMP_ATTEMPTS = 100
+
+_EXTENSIONS = {
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".csv": "csv",
+}
+
+
+def infer_format(path: str) -> str:
+    """Report format implied by a file name ('report.jsonl.gz' -> 'jsonl')"""
+    base = path[:-3] if path.endswith(".gz") else path
+    return _EXTENSIONS.get(os.path.splitext(base)[1].lower(), "text")
+
+
+def _create_temp(directory: str, prefix: str) -> Tuple[int, str]:
+    """
+    Exclusively create a temporary file for writing
+
+    Unlike mkstemp (always 0600) the file is created with mode 0666, so the
+    kernel applies the process umask and committed reports get the usual mode.
+
+    Returns:
+        (file descriptor, path)
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0) | getattr(os, 'O_NOFOLLOW', 0)
+    for _ in range(_TEMP_ATTEMPTS):
+        path = os.path.join(directory, f"{prefix}{os.urandom(6).hex()}.tmp")
+        try:
+            return os.open(path, flags, 0o666), path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"No usable temporary file name in {directory}")
+
+
+def _cell(value: Any) -> str:
+    """Flatten a report value into one CSV cell"""
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)) and all(not isinstance(item, (dict, list, tuple)) for item in value):
+        return "|".join("" if item is None else str(item) for item in value)
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return str(value)
+
+
+class ReportSink:
+    def __init__(self, path: str, output_format: Optional[str] = None, append: bool = False,
+                 compress: Optional[bool] = None, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """
+        Reports are written to a temporary file next to `path` and moved into
+        place by close(), so readers never see a half-written report.
+
+        Args:
+            path: Destination file
+            output_format: One of REPORT_FORMATS (default: inferred from the extension)
+            append: Keep the existing contents and add to them instead of overwriting
+            compress: gzip the output (default: True when path ends in .gz)
+            buffer_size: Write buffer size in bytes
+        """
+        self.path = path
+        self.output_format = output_format or infer_format(path)
+        if self.output_format not in REPORT_FORMATS:
+            raise ValueError(f"Unknown report format: {self.output_format}")
+        self.append = append
+        self.compress = path.endswith(".gz") if compress is None else compress
+        self.count = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, self._temp_path = _create_temp(directory, f".{os.path.basename(path)}.")
+        self._raw = os.fdopen(fd, 'wb', buffering=buffer_size)
+
+        existing = append and os.path.exists(path) and os.path.getsize(path) > 0
+        if existing:
+            # Gzip members concatenate, so compressed files are carried over byte for byte too
+            with open(path, 'rb') as previous:
+                shutil.copyfileobj(previous, self._raw, buffer_size)
+
+        self._gzip = gzip.GzipFile(fileobj=self._raw, mode='wb') if self.compress else None
+        self.stream = io.TextIOWrapper(self._gzip or self._raw, encoding='utf-8',
+                                       newline='' if self.output_format == "csv" else None,
+                                       write_through=False)
+        self._writer = None
+        if self.output_format == "csv":
+            self._writer = csv.writer(self.stream)
+            if not existing:
+                self._writer.writerow(CSV_FIELDNAMES)
+
+    def write(self, report: Dict[str, Any], text: Optional[Callable[[TextIO], None]] = None) -> None:
+        """
+        Add one report
+
+        Args:
+            report: Structured report; 'report' (kind) and 'target' keys are used by CSV
+            text: Writes the human-readable layout to a stream (text format only; without
+                  it every field is written as 'FIELD: value')
+        """
+        if self.output_format == "jsonl":
+            self.stream.write(json.dumps(report, ensure_ascii=False, default=str) + "\n")
+        elif self.output_format == "csv":
+            kind, target = report.get('report'), report.get('target')
+            for field, value in report.items():
+                if field not in ('report', 'target'):
+                    self._writer.writerow([kind, target, field, _cell(value)])
+        elif text is not None:
+            text(self.stream)
+        else:
+            for field, value in report.items():
+                self.stream.write(f"{field.upper().replace('_', ' ')}: {value}\n")
+            self.stream.write("\n")
+        self.count += 1
+
+    def close(self) -> None:
+        """Flush everything and atomically replace the destination file"""
+        if self.stream is None:
+            return
+        self.stream.flush()
+        if self._gzip is not None:
+            self._gzip.close()
+        self._raw.close()
+        self.stream = None
+        os.replace(self._temp_path, self.path)
+
+    def abort(self) -> None:
+        """Discard everything written; the destination file is left untouched"""
+        if self.stream is None:
+            return
+        for stream in (self.stream, self._gzip, self._raw):
+            try:
+                if stream is not None:
+                    stream.close()
+            except Exception:
+                pass
+        self.stream = None
+        try:
+            os.unlink(self._temp_path)
+        except OSError:
+            pass
+
+    def __enter__(self) -> "ReportSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+@contextmanager
+def report_sink(sink: Optional[ReportSink] = None, path: Optional[str] = None, **options) -> Iterator[ReportSink]:
+    """
+    Use a caller's shared sink, or open (and commit) a one-off sink for `path`
+
+    Args:
+        sink: Open sink shared by a batch run (left open)
+        path: Destination used when no sink is given
+        **options: ReportSink options for the one-off sink
+
+    Returns:
+        Context manager yielding a ReportSink
+    """
+    if sink is not None:
+        yield sink
+        return
+    with ReportSink(path, **options) as own:
+        yield own
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Spam Rule Engine
+Description: Per-country spam pattern rule packs compiled into one single-pass matcher
+Version: 4.0.0
+"""
+
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  "data", "spam_rules.json")
+
+UNIVERSAL_PACK = "*"
+
+_NAMED_GROUP = re.compile(r"\(\?P<([A-Za-z_]\w*)>")
+_NAMED_BACKREF = re.compile(r"\(\?P=([A-Za-z_]\w*)\)")
+
+
+class Rule:
+    __slots__ = ('rule_id', 'pattern', 'description', 'group')
+
+    def __init__(self, rule_id: str, pattern: str, description: str, group: str):
+        self.rule_id = rule_id
+        self.pattern = pattern
+        self.description = description
+        self.group = group  # Capture group that flags this rule in the combined regex
+
+
+class CompiledRulePack:
+    """
+    Every rule of a pack folded into one regex of optional lookaheads:
+
+        ^(?:(?=(?P<r0>rule0)$))?(?:(?=(?P<r1>rule1)$))?...
+
+    A single match() then reports every rule that fits the number, because
+    each lookahead either captures its group or is skipped.
+    """
+
+    def __init__(self, rules: List[Dict[str, str]]):
+        self.rules = []
+        parts = []
+        for index, spec in enumerate(rules):
+            group = f"r{index}"
+            pattern = spec["pattern"]
+            compiled = re.compile(pattern)
+            if compiled.groups != len(compiled.groupindex):
+                raise ValueError(f"Rule {spec['id']}: use named groups only, numbered groups "
+                                 f"cannot be combined")
+            # Prefix the rule's own group names so rules cannot collide
+            scoped = _NAMED_GROUP.sub(lambda m: f"(?P<{group}_{m.group(1)}>", pattern)
+            scoped = _NAMED_BACKREF.sub(lambda m: f"(?P={group}_{m.group(1)})", scoped)
+            parts.append(f"(?:(?=(?P<{group}>{scoped})$))?")
+            self.rules.append(Rule(spec["id"], pattern, spec.get("description", spec["id"]), group))
+
+        self.regex = re.compile("^" + "".join(parts))
+
+    def match(self, digits: str) -> List[Tuple[str, str]]:
+        """
+        Args:
+            digits: National significant number
+
+        Returns:
+            (rule_id, description) for every matching rule, in pack order
+        """
+        found = self.regex.match(digits)
+        if found is None:
+            return []
+
+        hits = []
+        groups = found.groupdict()
+        for rule in self.rules:
+            if groups[rule.group] is None:
+                continue
+            description = rule.description
+            if "{" in description:
+                prefix = rule.group + "_"
+                fields = {name[len(prefix):]: value for name, value in groups.items()
+                          if name.startswith(prefix)}
+                description = description.format(**fields)
+            hits.append((rule.rule_id, description))
+        return hits
+
+
+class SpamRuleEngine:
+    def __init__(self, path: str = DEFAULT_RULES_PATH):
+        """
+        Args:
+            path: JSON rule pack file
+        """
+        self.path = path
+        self.version = None
+        self.pack_names = {}
+        self._packs = {}  # calling code -> CompiledRulePack (country rules + universal rules)
+        self.load(path)
+
+    def load(self, path: str) -> None:
+        """Load and compile all rule packs"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        packs = data.get("packs", {})
+        universal = packs.get(UNIVERSAL_PACK, {}).get("rules", [])
+
+        compiled = {}
+        names = {}
+        for code, pack in packs.items():
+            names[code] = pack.get("name", code)
+            if code == UNIVERSAL_PACK:
+                continue
+            compiled[code] = CompiledRulePack(pack.get("rules", []) + universal)
+        compiled[UNIVERSAL_PACK] = CompiledRulePack(universal)
+
+        self.version = data.get("version")
+        self.pack_names = names
+        self._packs = compiled
+
+    def match(self, calling_code: Optional[int], national_number: str) -> List[Tuple[str, str]]:
+        """
+        All rules matching a number, in one regex pass
+
+        Args:
+            calling_code: Country calling code (None if unknown)
+            national_number: National significant number (digits only)
+
+        Returns:
+            List of (rule_id, description)
+        """
+        pack = self._packs.get(str(calling_code)) or self._packs[UNIVERSAL_PACK]
+        return pack.match(national_number)
+
+    def match_rule_ids(self, calling_code: Optional[int], national_number: str) -> List[str]:
+        """Matching rule IDs only (see match)"""
+        return [rule_id for rule_id, _ in self.match(calling_code, national_number)]
+
+
+def split_number(number: str, default_region: Optional[str] = None) -> Tuple[Optional[int], str]:
+    """
+    Split a raw phone number into (calling code, national significant number)
+
+    Args:
+        number: Raw phone number
+        default_region: Region assumed for numbers without a leading '+' (None = the tool-wide default)
+
+    Returns:
+        (calling_code, digits); calling_code is None if the number cannot be parsed
+    """
+    import phonenumbers
+    from utils.number_profile import default_region as tool_default_region
+
+    default_region = default_region or tool_default_region()
+
+    try:
+        parsed = phonenumbers.parse(number, None if number.strip().startswith('+') else default_region)
+        return parsed.country_code, phonenumbers.national_significant_number(parsed)
+    except phonenumbers.NumberParseException:
+        return None, re.sub(r'\D', '', number)
+
+
+_shared_engine = None
+_shared_lock = threading.Lock()
+
+
+def get_rule_engine() -> SpamRuleEngine:
+    """Process-wide rule engine, compiled once on first use"""
+    global _shared_engine
+    with _shared_lock:
+        if _shared_engine is None:
+            _shared_engine = SpamRuleEngine()
+        return _shared_engine
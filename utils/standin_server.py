@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Stand-in Server
+Description: Local HTTP and WHOIS servers impersonating every upstream from a recorded cassette
+Version: 4.0.0
+
+Usage:
+    python -m utils.standin_server --cassette data/cassettes/default.json --latency 0.05 --error-rate 0.1
+
+Then set "replay": {"mode": "standin", "server": "http://127.0.0.1:8765",
+"whois_server": "127.0.0.1:4343"} in config.json.
+"""
+
+import argparse
+import json
+import socketserver
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import urlparse
+
+from utils.replay import DEFAULT_CASSETTE, Cassette, FaultInjector, entry_body, standin_url
+
+
+class _WhoisServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class StandInServer:
+    def __init__(self, cassette: Cassette, host: str = "127.0.0.1", port: int = 8765,
+                 whois_port: Optional[int] = 4343, faults: Optional[FaultInjector] = None,
+                 error_status: int = 503):
+        """
+        Args:
+            cassette: Recorded responses to serve
+            host: Interface to bind
+            port: HTTP port (0 = any free port)
+            whois_port: WHOIS port (0 = any free port, None = no WHOIS server)
+            faults: Latency / error injection
+            error_status: HTTP status of injected errors (0 = drop the connection instead)
+        """
+        self.cassette = cassette
+        self.faults = faults or FaultInjector()
+        self.error_status = error_status
+        self.stats = {'served': 0, 'missed': 0, 'failed': 0}
+        self._lock = threading.Lock()
+
+        self.http = ThreadingHTTPServer((host, port), self._http_handler())
+        self.http.daemon_threads = True
+        self.whois = None
+        if whois_port is not None:
+            self.whois = _WhoisServer((host, whois_port), self._whois_handler())
+        self._threads = []
+
+    @property
+    def url(self) -> str:
+        host, port = self.http.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def whois_address(self) -> Optional[str]:
+        if self.whois is None:
+            return None
+        host, port = self.whois.server_address[:2]
+        return f"{host}:{port}"
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _http_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _serve(self, method: str) -> None:
+                url = standin_url(self.path)
+                entry = server.cassette.find(method, url) if url else None
+                if entry is None:
+                    server._count('missed')
+                    self._send(404, {'Content-Type': 'application/json'},
+                               json.dumps({'error': f"not recorded: {method} {url or self.path}"}).encode())
+                    return
+                if server.faults.apply(urlparse(url).hostname or "", entry.get("latency", 0.0)):
+                    server._count('failed')
+                    if not server.error_status:
+                        self.close_connection = True
+                        return
+                    self._send(server.error_status, {}, b"")
+                    return
+                server._count('served')
+                self._send(int(entry["status"]), entry.get("headers") or {}, entry_body(entry))
+
+            def _send(self, status: int, headers: dict, body: bytes) -> None:
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                self._serve('GET')
+
+            def do_HEAD(self):
+                self._serve('HEAD')
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                self._serve('POST')
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _whois_handler(self):
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                domain = self.rfile.readline(1024).decode('ascii', errors='replace').strip().lower()
+                text = server.cassette.find_whois(domain)
+                if text is None:
+                    server._count('missed')
+                    text = f"No match for \"{domain.upper()}\".\r\n"
+                elif server.faults.apply(f"whois:{domain.rsplit('.', 1)[-1]}"):
+                    server._count('failed')
+                    return  # Closing without an answer, as an overloaded registry does
+                else:
+                    server._count('served')
+                self.wfile.write(text.encode('utf-8'))
+
+        return Handler
+
+    def start(self) -> "StandInServer":
+        """Serve in background threads"""
+        for srv in (self.http, self.whois):
+            if srv is not None:
+                thread = threading.Thread(target=srv.serve_forever, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    def stop(self) -> None:
+        for srv in (self.http, self.whois):
+            if srv is not None:
+                srv.shutdown()
+                srv.server_close()
+        self._threads = []
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve recorded upstream responses locally")
+    parser.add_argument("--cassette", default=DEFAULT_CASSETTE, help="Cassette file to serve")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8765, help="HTTP port")
+    parser.add_argument("--whois-port", type=int, default=4343, help="WHOIS port (-1 disables)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every answer")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random seconds (0..jitter)")
+    parser.add_argument("--recorded-latency", action="store_true", help="Answer after the recorded latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an injected failure")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status of failures (0 = drop)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for jitter and failures")
+    args = parser.parse_args()
+
+    cassette = Cassette(args.cassette)
+    faults = FaultInjector(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                           seed=args.seed, use_recorded_latency=args.recorded_latency)
+    server = StandInServer(cassette, args.host, args.port, None if args.whois_port < 0 else args.whois_port,
+                           faults, args.error_status)
+    print(f"Serving {len(cassette.http)} HTTP and {len(cassette.whois)} WHOIS fixtures "
+          f"on {server.url}" + (f" and whois://{server.whois_address}" if server.whois else ""))
+    try:
+        server.start()
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(json.dumps(server.stats))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
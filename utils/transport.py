@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+HTTP Transport
+Description: One pooled, keep-alive HTTP transport shared by every module and API client
+Version: 4.0.0
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.config import load_settings
+from utils.rate_limiter import RateLimiter, get_rate_limiter
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError, get_circuit_breaker
+from utils.replay import install_replay, replay_options
+from utils.profiling import get_profiler
+from utils.metrics import get_metrics
+
+# Errors that say the host itself is unhealthy (as opposed to a bad request)
+HOST_FAILURES = (requests.ConnectionError, requests.Timeout)
+
+
+class HTTPTransport:
+    """
+    Thread-safe wrapper around a single requests.Session.
+
+    Connections (and their TLS sessions) are kept alive per host and reused
+    across a whole scan or batch. Every request is paced by a per-host
+    token bucket, guarded by a per-host circuit breaker and counted per host
+    (also as Prometheus request counters and latency histograms).
+    """
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None, limiter: Optional[RateLimiter] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        """
+        Args:
+            settings: Operation settings (defaults to utils.config.load_settings())
+            limiter: Per-host rate limiter (defaults to the shared one, or one built
+                     from `settings` when those are given)
+            breaker: Per-host circuit breaker (defaults to the shared, persisted one;
+                     a memory-only one when replaying, so offline runs never trip live hosts)
+        """
+        if limiter is None:
+            limiter = get_rate_limiter() if settings is None else RateLimiter.from_settings(settings)
+        self.limiter = limiter
+        self.replay = replay_options()
+        if breaker is None:
+            breaker = get_circuit_breaker() if self.replay["mode"] == "off" else CircuitBreaker(state_path=None)
+        self.breaker = breaker
+        self.settings = settings if settings is not None else load_settings()
+        self.profiler = get_profiler()
+        self.connect_timeout = float(self.settings["connect_timeout"])
+        self.read_timeout = float(self.settings["timeout"])
+
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': self.settings["user_agent"]})
+        pool_kwargs = {
+            'pool_connections': int(self.settings["pool_connections"]),
+            'pool_maxsize': int(self.settings["pool_maxsize"]),
+        }
+        adapter = HTTPAdapter(**pool_kwargs)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # "replay" config section: record to / replay from a cassette, or use the stand-in server
+        install_replay(self.session, self.replay, pool_kwargs)
+
+        self._stats = {}
+        self._lock = threading.Lock()
+
+        metrics = get_metrics()
+        self._requests = metrics.counter("http_requests_total", "HTTP requests by host and outcome "
+                                         "(status class, timeout, connection_error, circuit_open, error)",
+                                         ("host", "outcome"))
+        self._latency = metrics.histogram("http_request_duration_seconds",
+                                          "HTTP request latency by host, excluding rate-limit waits", ("host",))
+
+    def _timeout(self, timeout):
+        """Apply the configured connect timeout to a caller's read timeout"""
+        if timeout is None:
+            return (self.connect_timeout, self.read_timeout)
+        if isinstance(timeout, (int, float)):
+            return (min(self.connect_timeout, timeout), timeout)
+        return timeout
+
+    def _record(self, host: str, nbytes: int = 0, error: bool = False) -> None:
+        with self._lock:
+            entry = self._stats.setdefault(host, {'requests': 0, 'bytes': 0, 'errors': 0})
+            entry['requests'] += 1
+            entry['bytes'] += nbytes
+            if error:
+                entry['errors'] += 1
+
+    def _observe(self, host: str, outcome: str, started: Optional[float] = None) -> None:
+        self._requests.inc(host, outcome)
+        if started is not None:
+            self._latency.observe(host, value=time.perf_counter() - started)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the shared session
+
+        Args:
+            method: HTTP method
+            url: Target URL
+            **kwargs: Passed to requests.Session.request
+
+        Returns:
+            requests.Response
+            
+        Raises:
+            CircuitOpenError: The host failed repeatedly and is being skipped (a requests.ConnectionError)
+        """
+        host = urlparse(url).hostname or ""
+        kwargs['timeout'] = self._timeout(kwargs.get('timeout'))
+        try:
+            self.breaker.before_call(host)
+        except CircuitOpenError:
+            self._observe(host, "circuit_open")
+            raise
+        started = None
+        try:
+            with self.profiler.span("http.rate_limit", host=host):
+                self.limiter.acquire(host)
+            started = time.perf_counter()
+            with self.profiler.span("http.request", method=method, host=host):
+                response = self.session.request(method, url, **kwargs)
+        except HOST_FAILURES as e:
+            self._observe(host, "timeout" if isinstance(e, requests.Timeout) else "connection_error", started)
+            self._record(host, error=True)
+            self.breaker.record_failure(host)
+            raise
+        except requests.RequestException:
+            self._observe(host, "error", started)
+            self._record(host, error=True)
+            self.breaker.release(host)
+            raise
+        except BaseException:
+            self.breaker.release(host)
+            raise
+
+        self._observe(host, f"{response.status_code // 100}xx", started)
+        if response.status_code >= 500:
+            self.breaker.record_failure(host)
+        else:
+            self.breaker.record_success(host)
+
+        if kwargs.get('stream'):
+            nbytes = int(response.headers.get('Content-Length') or 0)
+        else:
+            nbytes = len(response.content)
+        self._record(host, nbytes)
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault('allow_redirects', False)
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def client(self, headers: Optional[Dict[str, str]] = None) -> "TransportClient":
+        """
+        Session-like view with its own default headers (e.g. a module's User-Agent)
+
+        Args:
+            headers: Headers merged into every request made through the client
+
+        Returns:
+            TransportClient sharing this transport's connection pools
+        """
+        return TransportClient(self, headers)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-host request, byte and error counters"""
+        with self._lock:
+            return {host: dict(entry) for host, entry in self._stats.items()}
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class TransportClient:
+    """Drop-in replacement for a per-module requests.Session"""
+
+    def __init__(self, transport: HTTPTransport, headers: Optional[Dict[str, str]] = None):
+        self.transport = transport
+        self.headers = dict(headers or {})
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        if self.headers:
+            headers = dict(self.headers)
+            headers.update(kwargs.get('headers') or {})
+            kwargs['headers'] = headers
+        return self.transport.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault('allow_redirects', False)
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+
+_shared_transport = None
+_shared_lock = threading.Lock()
+
+
+def get_transport() -> HTTPTransport:
+    """Process-wide shared transport, created on first use"""
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is None:
+            _shared_transport = HTTPTransport()
+        return _shared_transport
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Search URL Builder
+Description: Shared search engine templates with encode-once query quoting
+Version: 4.0.0
+"""
+
+import urllib.parse
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Every search engine the modules link to, in display order
+SEARCH_ENGINES = {
+    "Google": "https://www.google.com/search?q={}",
+    "DuckDuckGo": "https://duckduckgo.com/html/?q={}",
+    "Bing": "https://www.bing.com/search?q={}",
+    "Yandex": "https://yandex.com/search/?text={}",
+    "Startpage": "https://www.startpage.com/sp/search?query={}",
+    "Brave": "https://search.brave.com/search?q={}",
+    "Qwant": "https://www.qwant.com/?q={}",
+    "Ecosia": "https://www.ecosia.org/search?q={}"
+}
+
+QUOTE_CACHE_SIZE = 16384
+
+
+@lru_cache(maxsize=QUOTE_CACHE_SIZE)
+def quote_query(query: str) -> str:
+    """Percent-encode a search query (memoized; dork sets repeat queries across engines)"""
+    return urllib.parse.quote(query)
+
+
+def split_template(template: str) -> Tuple[str, str]:
+    """
+    Split a '{}' URL template into the text before and after the query
+
+    Args:
+        template: e.g. 'https://www.bing.com/search?q={}'
+
+    Returns:
+        (prefix, suffix)
+    """
+    parts = template.split("{}")
+    if len(parts) != 2:
+        raise ValueError(f"Search URL template needs exactly one '{{}}': {template!r}")
+    return parts[0], parts[1]
+
+
+class URLBuilder:
+    def __init__(self, engines: Optional[Iterable[str]] = None,
+                 templates: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            engines: Engine names to build for, in order (default: all of SEARCH_ENGINES)
+            templates: Extra or overriding engine templates
+        """
+        known = dict(SEARCH_ENGINES)
+        known.update(templates or {})
+
+        self.search_engines = {name: known[name] for name in (engines or known)}
+        self._parts = {name: split_template(template) for name, template in self.search_engines.items()}
+
+    def url(self, engine: str, query: str) -> str:
+        """Search URL for one query on one engine"""
+        prefix, suffix = self._parts[engine]
+        return prefix + quote_query(query) + suffix
+
+    def urls(self, query: str, engines: Optional[Iterable[str]] = None) -> List[Tuple[str, str]]:
+        """
+        Search URLs for one query on every engine, encoding the query once
+
+        Args:
+            query: Search query / dork
+            engines: Subset of this builder's engines (default: all)
+
+        Returns:
+            List of (engine, url)
+        """
+        encoded = quote_query(query)
+        parts = self._parts
+        return [(name, parts[name][0] + encoded + parts[name][1]) for name in (engines or parts)]
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+WHOIS Cache
+Description: Persistent TTL cache for WHOIS answers, keyed on the registrable domain
+Version: 4.0.0
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Callable, Iterable, List, Optional
+
+from utils.cache import ResponseCache, get_cache, POSITIVE, NEGATIVE
+
+PROVIDER = "whois"
+
+# Common multi-label public suffixes; anything else registers at the second level
+MULTI_PART_SUFFIXES = {
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "ltd.uk", "plc.uk", "me.uk", "net.uk",
+    "com.au", "net.au", "org.au", "edu.au", "gov.au",
+    "co.in", "net.in", "org.in", "firm.in", "gen.in", "ind.in", "ac.in", "edu.in", "gov.in",
+    "co.nz", "org.nz", "net.nz", "co.za", "org.za", "co.jp", "ne.jp", "or.jp", "ac.jp",
+    "co.kr", "or.kr", "com.br", "net.br", "org.br", "com.cn", "net.cn", "org.cn",
+    "com.mx", "com.ar", "com.tr", "com.sg", "com.my", "com.pk", "com.ng", "com.eg",
+    "com.hk", "com.tw", "co.id", "co.il", "co.th", "com.ph", "com.vn", "com.ua",
+}
+
+
+def registrable_domain(domain: str) -> str:
+    """
+    Reduce a host, URL or email domain to its registrable domain
+
+    Args:
+        domain: e.g. 'https://Mail.Example.co.uk/path' or 'www.example.com'
+
+    Returns:
+        e.g. 'example.co.uk' / 'example.com'
+    """
+    domain = domain.strip().lower()
+    if "@" in domain:
+        domain = domain.rsplit("@", 1)[1]
+    for prefix in ("http://", "https://"):
+        if domain.startswith(prefix):
+            domain = domain[len(prefix):]
+    domain = domain.split("/")[0].split("?")[0].split(":")[0].strip(".")
+
+    labels = [label for label in domain.split(".") if label]
+    if len(labels) <= 2:
+        return ".".join(labels)
+    if ".".join(labels[-2:]) in MULTI_PART_SUFFIXES:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def unique_domains(values: Iterable[str]) -> List[str]:
+    """
+    Registrable domains of emails/hosts, de-duplicated in first-seen order
+
+    Args:
+        values: Email addresses, hosts or URLs
+
+    Returns:
+        List of unique registrable domains
+    """
+    seen = {}
+    for value in values:
+        domain = registrable_domain(value)
+        if domain and domain not in seen:
+            seen[domain] = None
+    return list(seen)
+
+
+class WhoisData(dict):
+    """WHOIS fields with attribute access, like python-whois' WhoisEntry"""
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return self.get(name)
+
+    def __str__(self) -> str:
+        return json.dumps(self, indent=2, default=str)
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, (list, tuple, set)):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _encode(item) for key, item in value.items()}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if set(value) == {"__datetime__"}:
+            return datetime.fromisoformat(value["__datetime__"])
+        return {key: _decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+
+# Registry replies (raw WHOIS text) meaning the domain is not registered
+NOT_FOUND_MARKERS = ("no match", "not found", "no data found", "no entries found")
+
+
+def _is_not_found(text: Any) -> bool:
+    text = str(text or "").lower()
+    return any(marker in text for marker in NOT_FOUND_MARKERS)
+
+
+def _classify(payload: Any) -> Optional[str]:
+    if payload.get("__not_found__"):
+        return NEGATIVE
+    data = payload.get("data") or {}
+    # Anything short of a clear "no match" without a domain or registrar is a
+    # truncated or rate-limited reply: serve it, but ask again next time
+    return POSITIVE if data.get("domain_name") or data.get("registrar") else None
+
+
+def default_loader() -> Callable[[str], Any]:
+    """whois.whois, unless replay mode routes WHOIS to a cassette or the stand-in server"""
+    from utils.replay import whois_backend
+    backend = whois_backend()
+    if backend is not None:
+        return backend
+    import whois
+    return whois.whois
+
+
+class WHOISCache:
+    def __init__(self, cache: Optional[ResponseCache] = None):
+        """
+        Args:
+            cache: Backing ResponseCache (defaults to the shared one)
+        """
+        self.cache = cache or get_cache()
+
+    def lookup(self, domain: str, loader: Optional[Callable[[str], Any]] = None) -> Optional[WhoisData]:
+        """
+        WHOIS data for the registrable domain of `domain`, cached across runs
+
+        Args:
+            domain: Domain, host or email address
+            loader: WHOIS function (defaults to whois.whois, or the replay backend
+                    when the "replay" config section is active)
+
+        Returns:
+            WhoisData, or None when the registry reports no match.
+            Other lookup errors propagate, and incomplete answers (neither a
+            domain name nor a registrar) are returned without being cached.
+        """
+        key = registrable_domain(domain)
+
+        def request():
+            fetch = loader or default_loader()
+            try:
+                result = fetch(key)
+            except Exception as e:
+                if "No match" in str(e):
+                    return {"__not_found__": True}
+                raise
+            data = dict(result or {})
+            if not (data.get("domain_name") or data.get("registrar")) and _is_not_found(getattr(result, "text", "")):
+                return {"__not_found__": True}
+            return {"data": _encode(data)}
+
+        payload = self.cache.fetch(PROVIDER, key, request, _classify)
+        if payload.get("__not_found__"):
+            return None
+        return WhoisData(_decode(payload["data"]))
+
+    def is_cached(self, domain: str) -> bool:
+        """Whether a fresh answer for the domain is already cached"""
+        return self.cache.contains(PROVIDER, registrable_domain(domain))
+
+    def stats(self):
+        """Hit/miss statistics for WHOIS lookups"""
+        return self.cache.stats().get(PROVIDER, {})
+
+
+_shared_whois_cache = None
+
+
+def get_whois_cache() -> WHOISCache:
+    """Process-wide WHOIS cache on top of the shared response cache"""
+    global _shared_whois_cache
+    if _shared_whois_cache is None:
+        _shared_whois_cache = WHOISCache()
+    return _shared_whois_cache